@@ -0,0 +1,134 @@
+# coding: utf-8
+"""
+Measures how many TLS connections are opened (i.e. how many handshakes are made) when sending requests from several
+threads, depending on the connection pool settings. A local HTTPS server, using a self-signed certificate made with
+``openssl``, stands in for boardgamegeek.com.
+
+Usage::
+
+    python benchmarks/bench_connections.py [requests] [threads]
+"""
+from __future__ import print_function
+
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:  # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from boardgamegeek.transport import configure_session, DEFAULT_POOL_MAXSIZE
+from boardgamegeek.utils import run_concurrently
+
+REPLY = b'<?xml version="1.0" encoding="utf-8"?><items><item type="boardgame" id="1" /></items>'
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(REPLY)))
+        self.end_headers()
+        self.wfile.write(REPLY)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, certfile, keyfile):
+        HTTPServer.__init__(self, ("localhost", 0), Handler)
+        self.lock = threading.Lock()
+        self.connections = 0
+
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        self.socket = context.wrap_socket(self.socket, server_side=True)
+
+
+def make_certificate(directory):
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    subprocess.check_call(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                           "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost",
+                           "-keyout", keyfile, "-out", certfile],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return certfile, keyfile
+
+
+def run(server, certfile, count, threads, configure):
+    url = "https://localhost:{}/xmlapi2".format(server.server_address[1])
+
+    session = requests.Session()
+    session.verify = certfile
+    # otherwise REQUESTS_CA_BUNDLE, if set, takes precedence over session.verify
+    session.trust_env = False
+    configure(session, url)
+
+    server.connections = 0
+    start = time.time()
+    run_concurrently(lambda i: session.get(url + "/thing", params={"id": i}).content, range(count), workers=threads)
+    elapsed = time.time() - start
+    session.close()
+
+    return server.connections, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    cases = [("requests' defaults (10 connections, non blocking)",
+              lambda session, url: None),
+             ("no keep-alive",
+              lambda session, url: session.headers.update({"Connection": "close"})),
+             ("pool_maxsize={}, non blocking".format(DEFAULT_POOL_MAXSIZE),
+              lambda session, url: configure_session(session, url, rpm=10 ** 7, pool_block=False)),
+             ("pool_maxsize={}, blocking (default)".format(DEFAULT_POOL_MAXSIZE),
+              lambda session, url: configure_session(session, url, rpm=10 ** 7)),
+             ("pool_maxsize={}, blocking".format(threads),
+              lambda session, url: configure_session(session, url, rpm=10 ** 7, pool_maxsize=threads))]
+
+    directory = tempfile.mkdtemp()
+    try:
+        certfile, keyfile = make_certificate(directory)
+        server = Server(certfile, keyfile)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        print("{} requests from {} threads".format(count, threads))
+        print("{:<50} {:>12} {:>10}".format("settings", "handshakes", "req/s"))
+        for name, configure in cases:
+            connections, elapsed = run(server, certfile, count, threads, configure)
+            print("{:<50} {:>12} {:>10.0f}".format(name, connections, count / elapsed))
+
+        server.shutdown()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# coding: utf-8
+"""
+Measures the time needed to create games out of the /thing responses in ``test/xml``, parsing all the fields or only
+a few of them (see the ``fields`` argument of :py:func:`boardgamegeek.loaders.create_game_from_xml`).
+
+Usage::
+
+    python benchmarks/bench_game_fields.py [repeat]
+"""
+from __future__ import print_function
+
+import glob
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from boardgamegeek.loaders import create_game_from_xml
+
+
+SELECTIONS = [("all fields", None),
+              ("year", ["year"]),
+              ("year, players, time", ["year", "min_players", "max_players", "playing_time"])]
+
+
+def load_items():
+    items = []
+    for path in glob.glob(os.path.join(ROOT, "test", "xml", "thing?*")):
+        with open(path, "rb") as f:
+            root = ET.fromstring(f.read())
+        items.extend(root.findall("item"))
+    return items
+
+
+def measure(items, fields, repeat):
+    start = time.time()
+    for _ in range(repeat):
+        for item in items:
+            create_game_from_xml(item, game_id=item.attrib["id"], fields=fields)
+    return (time.time() - start) * 1e6 / (repeat * len(items))
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    items = load_items()
+
+    print("{} items".format(len(items)))
+    print("{:<22} {:>12} {:>10}".format("fields", "usec/game", "speed-up"))
+    reference = None
+    for name, fields in SELECTIONS:
+        usec = measure(items, fields, repeat)
+        reference = reference or usec
+        print("{:<22} {:>12.1f} {:>9.1f}x".format(name, usec, reference / usec))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# coding: utf-8
+"""
+Measures the time needed for importing the package (or parts of it) in a fresh interpreter, using
+``python -X importtime``, and whether ``requests`` gets imported along.
+
+Usage::
+
+    python benchmarks/bench_import.py [runs]
+
+The bytecode should be up to date (``python -m compileall boardgamegeek``), otherwise the compilation time is measured
+too.
+"""
+from __future__ import print_function
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+CASES = [("boardgamegeek", "import boardgamegeek"),
+         ("objects only", "from boardgamegeek.objects.games import BoardGame"),
+         ("BGGClient", "from boardgamegeek import BGGClient"),
+         ("BGGClient()", "from boardgamegeek import BGGClient; BGGClient()")]
+
+
+def measure(statement):
+    """
+    :return: (import time of the modules imported by ``statement``, in microseconds, whether requests was imported)
+    """
+    check = statement + "; import sys; sys.stdout.write(str('requests' in sys.modules))"
+    proc = subprocess.Popen([sys.executable, "-X", "importtime", "-c", check], cwd=ROOT,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    out, err = proc.communicate()
+
+    total = 0
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # only count the top level imports, their cumulative time includes the nested ones
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+
+    return total, out.strip() == "True"
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    # the interpreter's own startup imports (site, encodings, ...) are measured as a baseline
+    baseline = sorted(measure("pass")[0] for _ in range(runs))[runs // 2]
+
+    print("{:<16} {:>12} {:>10}".format("import", "msec", "requests"))
+    for name, statement in CASES:
+        results = sorted(measure(statement) for _ in range(runs))
+        total, imports_requests = results[runs // 2]
+        print("{:<16} {:>12.1f} {:>10}".format(name, (total - baseline) / 1000.0, "yes" if imports_requests else "no"))
+
+
+if __name__ == "__main__":
+    main()
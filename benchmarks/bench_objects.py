@@ -0,0 +1,92 @@
+# coding: utf-8
+"""
+Measures the per-object memory footprint and construction time of the objects which are created in large numbers
+(play sessions, collection items, hot items, ...).
+
+Usage::
+
+    python benchmarks/bench_objects.py [count]
+"""
+from __future__ import print_function
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from boardgamegeek.objects.games import CollectionBoardGame, BoardGameComment
+from boardgamegeek.objects.hotitems import HotItem
+from boardgamegeek.objects.plays import PlaySession
+from boardgamegeek.objects.things import Thing
+
+
+def play_data(i):
+    return {"id": i,
+            "date": "2014-01-02",
+            "quantity": 1,
+            "duration": 60,
+            "incomplete": 0,
+            "nowinstats": 0,
+            "user_id": 10,
+            "game_id": 31260,
+            "game_name": "Agricola",
+            "comment": None,
+            "players": [{"username": "player{}".format(p), "user_id": p, "name": "Player {}".format(p),
+                         "startposition": None, "new": "0", "win": "0", "rating": "0", "score": "10",
+                         "color": None, "location": None} for p in range(3)]}
+
+
+def collection_item_data(i):
+    return {"id": i,
+            "name": "Game {}".format(i),
+            "image": None,
+            "thumbnail": None,
+            "yearpublished": 2007,
+            "numplays": 3,
+            "comment": "",
+            "minplayers": 1,
+            "maxplayers": 5,
+            "minplaytime": 30,
+            "maxplaytime": 150,
+            "playingtime": 150,
+            "own": "1",
+            "stats": {"usersrated": 100, "average": 7.5, "bayesaverage": 7.0, "stddev": 1.5, "median": 0.0,
+                      "ranks": [{"type": "subtype", "id": "1", "name": "boardgame", "friendlyname": "Board Game Rank",
+                                 "value": "10", "bayesaverage": 7.0}]}}
+
+
+CASES = [("Thing", Thing, lambda i: {"id": i, "name": "thing"}),
+         ("HotItem", HotItem, lambda i: {"id": i, "name": "hot", "rank": i, "thumbnail": "//example.com/t.jpg"}),
+         ("BoardGameComment", BoardGameComment, lambda i: {"username": "u", "rating": "n/a", "comment": "c"}),
+         ("PlaySession", PlaySession, play_data),
+         ("CollectionBoardGame", CollectionBoardGame, collection_item_data)]
+
+
+def measure(cls, make_data, count):
+    data = [make_data(i) for i in range(count)]
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.time()
+    objects = [cls(d) for d in data]
+    elapsed = time.time() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del objects
+    return size / float(count), elapsed * 1e6 / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print("{:<20} {:>14} {:>14}".format("class", "bytes/object", "usec/object"))
+    for name, cls, make_data in CASES:
+        size, usec = measure(cls, make_data, count)
+        print("{:<20} {:>14.1f} {:>14.2f}".format(name, size, usec))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# coding: utf-8
+"""
+Measures, on recorded API responses, how much compression saves on the wire, and the time needed for parsing a
+response as a whole (decoded text) or while it's received (chunks of bytes fed to the parser).
+
+Usage::
+
+    python benchmarks/bench_transfer.py [repeat]
+"""
+from __future__ import print_function
+
+import gzip
+import io
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from boardgamegeek.transport import READ_CHUNK_SIZE
+from boardgamegeek.utils import parse_xml
+
+XML_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test", "xml")
+
+RESPONSES = [("thing?versions=1&videos=1",
+              "thing?comments=0&historical=0&id=31260&marketplace=0&page=1&pagesize=100&ratingcomments=0&stats=1&versions=1&videos=1"),
+             ("thing, 7 games",
+              "thing?historical=0&id=31260,197633,11542,23272,72125,824,8148&marketplace=0&stats=1&versions=0&videos=0"),
+             ("collection?stats=1",
+              "collection?stats=1&subtype=boardgame&username=fagentu007&version=1"),
+             ("plays",
+              "plays?id=283&subtype=boardgame")]
+
+
+def gzip_compress(data):
+    out = io.BytesIO()
+    with gzip.GzipFile(fileobj=out, mode="wb") as f:
+        f.write(data)
+    return out.getvalue()
+
+
+def parse_text(data):
+    return parse_xml(data.decode("utf-8"))
+
+
+def parse_streamed(data):
+    # decompress and parse chunk by chunk, the way the responses are read
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    parser = ET.XMLParser()
+    for start in range(0, len(data), READ_CHUNK_SIZE):
+        parser.feed(decompressor.decompress(data[start:start + READ_CHUNK_SIZE]))
+    parser.feed(decompressor.flush())
+    return parser.close()
+
+
+def timed(func, data, repeat):
+    start = time.time()
+    for _ in range(repeat):
+        func(data)
+    return (time.time() - start) * 1000.0 / repeat
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    print("{:<26} {:>10} {:>10} {:>7} {:>12} {:>14}".format("response", "bytes", "gzip", "ratio", "text (ms)",
+                                                             "gzip+stream (ms)"))
+    total, total_compressed = 0, 0
+    for name, filename in RESPONSES:
+        with open(os.path.join(XML_PATH, filename), "rb") as f:
+            data = f.read()
+        compressed = gzip_compress(data)
+        total += len(data)
+        total_compressed += len(compressed)
+
+        print("{:<26} {:>10} {:>10} {:>7.1f} {:>12.2f} {:>14.2f}".format(name, len(data), len(compressed),
+                                                                         len(data) / float(len(compressed)),
+                                                                         timed(parse_text, data, repeat),
+                                                                         timed(parse_streamed, compressed, repeat)))
+
+    print("{:<26} {:>10} {:>10} {:>7.1f}".format("total", total, total_compressed, total / float(total_compressed)))
+
+
+if __name__ == "__main__":
+    main()
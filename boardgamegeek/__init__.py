@@ -6,18 +6,48 @@
 
 .. moduleauthor:: Cosmin Luță <q4break@gmail.com>
 """
+import sys
 
-from .api import BGGClient, BGGChoose, BGGRestrictDomainTo, BGGRestrictPlaysTo, BGGRestrictSearchResultsTo, BGGRestrictCollectionTo
-from .legacy_api import BGGClientLegacy
 from .exceptions import BGGError, BGGApiRetryError, BGGApiError, BGGApiTimeoutError, BGGValueError, BGGItemNotFoundError
-from .cache import CacheBackendNone, CacheBackendMemory, CacheBackendSqlite
 from .version import __version__
 
+# the clients (and ``requests``, which they use) are slow to import: the names below are only imported from their
+# modules on first access, so that using e.g. only the objects doesn't pay for them
+_LAZY_NAMES = {"BGGClient": ".api",
+               "BGGChoose": ".api",
+               "BGGRestrictDomainTo": ".api",
+               "BGGRestrictPlaysTo": ".api",
+               "BGGRestrictSearchResultsTo": ".api",
+               "BGGRestrictCollectionTo": ".api",
+               "BGGClientLegacy": ".legacy_api",
+               "CacheBackendNone": ".cache",
+               "CacheBackendMemory": ".cache",
+               "CacheBackendSqlite": ".cache",
+               "BGGCollectionStatus": ".objects.games"}
+
 __all__ = ["BGGClient", "BGGChoose", "BGGRestrictSearchResultsTo", "BGGRestrictPlaysTo", "BGGRestrictDomainTo",
-           "BGGRestrictCollectionTo", "BGGError", "BGGValueError", "BGGApiRetryError", "BGGApiError",
+           "BGGRestrictCollectionTo", "BGGCollectionStatus", "BGGError", "BGGValueError", "BGGApiRetryError", "BGGApiError",
            "BGGApiTimeoutError", "BGGItemNotFoundError", "CacheBackendNone", "CacheBackendSqlite", "CacheBackendMemory"]
 __all__.extend(["BGGClientLegacy"])
 
-__import__('pkg_resources').declare_namespace(__name__)
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name not in _LAZY_NAMES:
+            raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_NAMES[name], __name__), name)
+        # next accesses don't go through __getattr__
+        globals()[name] = value
+        return value
 
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY_NAMES))
+else:
+    # no module __getattr__ (PEP 562), import everything
+    from .api import BGGClient, BGGChoose, BGGRestrictDomainTo, BGGRestrictPlaysTo, BGGRestrictSearchResultsTo, BGGRestrictCollectionTo
+    from .legacy_api import BGGClientLegacy
+    from .cache import CacheBackendNone, CacheBackendMemory, CacheBackendSqlite
+    from .objects.games import BGGCollectionStatus
 
+__path__ = __import__('pkgutil').extend_path(__path__, __name__)
@@ -23,15 +23,20 @@ from .objects.user import User
 from .objects.search import SearchResult
 
 from .exceptions import BGGApiError, BGGError, BGGItemNotFoundError, BGGValueError
-from .utils import xml_subelement_attr, request_and_parse_xml
-from .utils import RateLimitingAdapter, DEFAULT_REQUESTS_PER_MINUTE
-from .cache import CacheBackendMemory, CacheBackendNone
+from .utils import xml_subelement_attr, DEFAULT_REQUESTS_PER_MINUTE
+from .transport import configure_session, request_and_parse_xml, TransferStats
+from .transport import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, DEFAULT_POOL_BLOCK
+from .utils import run_concurrently, DEFAULT_CONCURRENT_REQUESTS
+from .index import normalize_name
+from .cache import CacheBackendMemory, CacheBackendNone, DEFAULT_CACHE, DEFAULT_CACHE_TTL
 
 from .loaders import create_guild_from_xml, add_guild_members_from_xml
 from .loaders import create_plays_from_xml, add_plays_from_xml
 from .loaders import create_hot_items_from_xml, add_hot_items_from_xml
 from .loaders import create_collection_from_xml, add_collection_items_from_xml
-from .loaders import create_game_from_xml, add_game_comments_from_xml
+from .loaders import create_game_from_xml, add_game_comments_from_xml, check_game_fields
+from .loaders import parse_game_comments_xml, load_game_comments_from_xml
+from .objects.games import BoardGameComment, BoardGameCommentsCursor
 
 
 log = logging.getLogger("boardgamegeek.api")
@@ -41,6 +46,17 @@ HOT_ITEM_CHOICES = ["boardgame", "rpg", "videogame", "boardgameperson", "rpgpers
 
 COLLECTION_SUBTYPES = ["boardgame", "boardgameexpansion", "boardgameaccessory", "rpgitem", "rpgissue", "videogame"]
 
+# subtypes whose items are also returned (and tagged as such) when requesting another subtype, unless excluded
+COLLECTION_INCLUDED_SUBTYPES = {"boardgameexpansion": "boardgame"}
+
+PLAYS_SUBTYPES = ["boardgame", "boardgameexpansion", "boardgameaccessory", "rpgitem", "videogame"]
+
+# maximum number of ids the /thing API accepts in a single request
+THING_IDS_PER_REQUEST = 20
+
+# number of comments requested per page
+COMMENTS_PAGE_SIZE = 100
+
 
 class BGGChoose(object):
     """
@@ -92,17 +108,74 @@ def call_progress_cb(progress_cb, current, total):
         progress_cb(current, total)
 
 
+class _GameCommentsIterator(object):
+    """
+    Iterator over the comments of a game, see :py:meth:`BGGClient.iter_game_comments`
+    """
+    def __init__(self, client, game_id, rating_only, cursor):
+        self.cursor = cursor
+        self.total = None
+        self._comments = self._iter_comments(client, game_id, rating_only)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._comments)
+
+    next = __next__
+
+    def _read_page(self, xml_root, skip):
+        comments, self.total = load_game_comments_from_xml(xml_root)
+        count = self.cursor.count
+        for comment in comments[skip:]:
+            # the cursor must be up to date when the comment is handed over
+            count += 1
+            self.cursor = BoardGameCommentsCursor(count // COMMENTS_PAGE_SIZE + 1, count)
+            yield BoardGameComment(comment)
+
+    def _iter_comments(self, client, game_id, rating_only):
+        comments, rating_comments = not rating_only, rating_only
+        page = self.cursor.page
+
+        # the first page gives the number of pages to fetch
+        xml_root = client._comment_page(game_id, comments, rating_comments, page)
+        for comment in self._read_page(xml_root, self.cursor.count - (page - 1) * COMMENTS_PAGE_SIZE):
+            yield comment
+
+        if self.cursor.count < page * COMMENTS_PAGE_SIZE:
+            # that was the last page
+            return
+
+        for _, xml_root in client._iter_comment_pages(game_id, comments, rating_comments, self.total, page + 1):
+            start = self.cursor.count
+            for comment in self._read_page(xml_root, 0):
+                yield comment
+            if self.cursor.count == start:
+                break
+
+
 class BGGCommon(object):
     """
     Base class for the BoardGameGeek websites APIs. All site-specific clients are derived from this.
 
     :param str api_endpoint: URL of the API
-    :param :py:class:`boardgamegeek.cache.CacheBackend` cache: object to be used for caching BGG API results
+    :param :py:class:`boardgamegeek.cache.CacheBackend` cache: object to be used for caching BGG API results,
+                                                               ``DEFAULT_CACHE`` creates an in-memory cache for this
+                                                               client, ``None`` disables caching
     :param float timeout: timeout for a request, in seconds
     :param int retries: how many retries to perform in special cases
     :param float retry_delay: delay between retries, in seconds
+    :param :py:class:`boardgamegeek.index.NameIndex` name_index: if not ``None``, the fetched games are added to
+                                                                  this index, which can answer exact searches (see
+                                                                  ``exact_from_index`` in :py:meth:`search`)
+    :param int pool_connections: number of hosts for which to keep a connection pool
+    :param int pool_maxsize: number of connections kept open to the API's host
+    :param bool pool_block: wait for a free connection when all of them are in use, instead of opening extra ones
     """
-    def __init__(self, api_endpoint, cache, timeout, retries, retry_delay, requests_per_minute):
+    def __init__(self, api_endpoint, cache, timeout, retries, retry_delay, requests_per_minute, name_index=None,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_block=DEFAULT_POOL_BLOCK):
         self._search_api_url = api_endpoint + "/search"
         self._thing_api_url = api_endpoint + "/thing"
         self._guild_api_url = api_endpoint + "/guild"
@@ -117,14 +190,45 @@ class BGGCommon(object):
         except:
             raise BGGValueError
 
-        if cache is None:
+        if cache is DEFAULT_CACHE:
+            cache = CacheBackendMemory(ttl=DEFAULT_CACHE_TTL)
+        elif cache is None:
             cache = CacheBackendNone()
         self.requests_session = cache.cache
 
-        # add the rate limiting adapter
-        self.requests_session.mount(api_endpoint, RateLimitingAdapter(rpm=requests_per_minute))
+        # add the rate limiting adapter, with persistent connections
+        configure_session(self.requests_session, api_endpoint,
+                          rpm=requests_per_minute,
+                          pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          pool_block=pool_block)
+
+        self._transfer_stats = TransferStats()
+        self._name_index = name_index
+
+    @property
+    def transfer_stats(self):
+        """
+        :return: the data received from the API by this client, per endpoint
+        :rtype: :py:class:`boardgamegeek.transport.TransferStats`
+        """
+        return self._transfer_stats
 
-    def _get_game_id(self, name, game_type, choose):
+    @property
+    def name_index(self):
+        """
+        :return: the index used for answering exact searches locally
+        :rtype: :py:class:`boardgamegeek.index.NameIndex`
+        :return: ``None`` if n/a
+        """
+        return self._name_index
+
+    def _index_game(self, game, fields):
+        # only index the games having all the data the index needs
+        if self._name_index is not None and "alternative_names" in fields and "year" in fields:
+            self._name_index.add_game(game)
+
+    def _get_game_id(self, name, game_type, choose, exact_from_index=False):
         """
         Returns the BGG ID of a game, searching by name
 
@@ -133,6 +237,7 @@ class BGGCommon(object):
                                                   BGGItemType.BOARD_GAME_EXPANSION)
         :param str choose: method of selecting the game by name, when having multiple results. Valid values are:
                            `BGGChoose.FIRST`, `BGGChoose.RECENT`, `BGGChoose.BEST_RANK`
+        :param bool exact_from_index: search the client's name index first, see :py:meth:`search`
         :return: game's id
         :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of invalid parameter(s)
         :raises: :py:exc:`boardgamegeek.exceptions.BGGItemNotFoundError` if the game hasn't been found
@@ -145,21 +250,119 @@ class BGGCommon(object):
             raise BGGValueError("invalid value for parameter 'choose': {}".format(choose))
 
         log.debug("getting game id for '{}'".format(name))
-        res = self.search(name, search_type=[game_type], exact=True)
+        res = self.search(name, search_type=[game_type], exact=True, exact_from_index=exact_from_index)
 
         if not res:
             raise BGGItemNotFoundError("can't find '{}'".format(name))
 
+        ranks = self._get_ranks([r.id for r in res], exact_from_index) if choose == BGGChoose.BEST_RANK else None
+        return self._choose_game_id(res, choose, ranks)
+
+    @staticmethod
+    def _choose_game_id(results, choose, ranks=None):
         if choose == BGGChoose.FIRST:
-            return res[0].id
+            return results[0].id
         elif choose == BGGChoose.RECENT:
             # choose the result with the biggest year
-            return max(res, key=lambda x: x.year if x.year is not None else -300000).id
+            return max(results, key=lambda x: x.year if x.year is not None else -300000).id
         else:
-            # getting the best rank requires fetching the data of all games returned
-            game_data = [self.game(game_id=r.id) for r in res]
-            # ...and selecting the one with the best ranking
-            return min(game_data, key=lambda x: x.boardgame_rank if x.boardgame_rank is not None else 10000000000).id
+            # select the one with the best ranking
+            return min(results, key=lambda x: ranks.get(x.id) if ranks.get(x.id) is not None else 10000000000).id
+
+    def _get_ranks(self, game_ids, from_index=False):
+        """
+        Returns the BGG ranks of games, fetched together. With ``from_index``, the ranks of the games known by the
+        name index are taken from it (they may be stale).
+
+        :param list game_ids: the games' ids
+        :param bool from_index: use the ranks known by the name index
+        :return: the rank of each game (``None`` if not ranked)
+        :rtype: dict
+        """
+        ranks = {}
+        to_fetch = []
+        for game_id in game_ids:
+            if from_index and self._name_index is not None and game_id in self._name_index:
+                ranks[game_id] = self._name_index.rank(game_id)
+            elif game_id not in to_fetch:
+                to_fetch.append(game_id)
+
+        if to_fetch:
+            # only the statistics are needed
+            for game in self.game_list(to_fetch, fields=[]):
+                ranks[game.id] = game.bgg_rank
+
+        return ranks
+
+    def get_game_ids(self, names, choose=BGGChoose.FIRST, workers=DEFAULT_CONCURRENT_REQUESTS, exact_from_index=False,
+                     failures=None):
+        """
+        Returns the BGG IDs of several games, searching by name.
+
+        Variants of the same name (see :py:func:`boardgamegeek.index.normalize_name`) are searched only once, and the
+        names are searched concurrently. With ``BGGChoose.BEST_RANK``, the candidates of all the names are fetched
+        together.
+
+        :param list names: the names of the games to search for
+        :param boardgamegeek.BGGChoose choose: method of selecting the game by name, when dealing with multiple results
+        :param int workers: maximum number of searches to run at the same time
+        :param bool exact_from_index: resolve the names known by the client's name index without using the BGG API,
+                                      see :py:meth:`search`
+        :param dict failures: if not ``None``, filled with the error raised by the search of each name which couldn't
+                              be searched
+        :return: the id of the game found for each name, ``None`` if not found or if its search failed
+        :rtype: dict
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of invalid parameter(s)
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if fetching the ranks should be retried after a
+                 short delay
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the ranks couldn't be fetched
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout fetching the ranks
+        """
+        if choose not in [BGGChoose.FIRST, BGGChoose.RECENT, BGGChoose.BEST_RANK]:
+            raise BGGValueError("invalid value for parameter 'choose': {}".format(choose))
+
+        # one search for each distinct name
+        searched = {}
+        normalized_names = []
+        for name in names:
+            if not name:
+                raise BGGValueError("invalid name: {}".format(name))
+            normalized = normalize_name(name)
+            if normalized not in searched:
+                searched[normalized] = name
+                normalized_names.append(normalized)
+
+        # a failed search doesn't prevent the other names from being resolved
+        errors = {}
+
+        def search(n):
+            try:
+                return self.search(searched[n],
+                                   search_type=[BGGRestrictSearchResultsTo.BOARD_GAME],
+                                   exact=True,
+                                   exact_from_index=exact_from_index)
+            except BGGError as e:
+                log.warning("searching for '{}' failed: {}".format(searched[n], e))
+                errors[n] = e
+                return []
+
+        results = run_concurrently(search, normalized_names, workers=workers)
+        results = dict(zip(normalized_names, results))
+
+        if failures is not None:
+            for name in names:
+                if normalize_name(name) in errors:
+                    failures[name] = errors[normalize_name(name)]
+
+        ranks = None
+        if choose == BGGChoose.BEST_RANK:
+            ranks = self._get_ranks([r.id for n in normalized_names for r in results[n]], exact_from_index)
+
+        game_ids = {}
+        for n in normalized_names:
+            game_ids[n] = self._choose_game_id(results[n], choose, ranks) if results[n] else None
+
+        return {name: game_ids[normalize_name(name)] for name in names}
 
     def guild(self, guild_id, progress=None, members=True):
         """
@@ -188,7 +391,8 @@ class BGGCommon(object):
                                                  "members": int(members)},
                                          timeout=self._timeout,
                                          retries=self._retries,
-                                         retry_delay=self._retry_delay)
+                                         retry_delay=self._retry_delay,
+                                         stats=self._transfer_stats)
 
         guild = create_guild_from_xml(xml_root)
 
@@ -214,7 +418,8 @@ class BGGCommon(object):
                                              params={"id": guild_id, "members": 1, "page": page},
                                              timeout=self._timeout,
                                              retries=self._retries,
-                                             retry_delay=self._retry_delay)
+                                             retry_delay=self._retry_delay,
+                                             stats=self._transfer_stats)
 
             added_member = add_guild_members_from_xml(guild, xml_root)
 
@@ -268,7 +473,8 @@ class BGGCommon(object):
                                      params=params,
                                      timeout=self._timeout,
                                      retries=self._retries,
-                                     retry_delay=self._retry_delay)
+                                     retry_delay=self._retry_delay,
+                                     stats=self._transfer_stats)
 
         # when the user is not found, the API returns an response, but with most fields empty. id is empty too
         try:
@@ -289,7 +495,7 @@ class BGGCommon(object):
                                                 quiet=True)
 
         # TODO: move add_top_item add_hot_item to sepparated files
-        user = User(data)
+        user = User._from_owned(data)
 
         # add top items
         if top:
@@ -347,7 +553,8 @@ class BGGCommon(object):
             root = request_and_parse_xml(self.requests_session,
                                          self._user_api_url,
                                          params=params,
-                                         timeout=self._timeout)
+                                         timeout=self._timeout,
+                                         stats=self._transfer_stats)
 
             for buddy in root.findall(".//buddy"):
                 user.add_buddy({"name": buddy.attrib["name"],
@@ -372,7 +579,8 @@ class BGGCommon(object):
 
         return user
 
-    def plays(self, name=None, game_id=None, progress=None, min_date=None, max_date=None, subtype=BGGRestrictPlaysTo.BOARD_GAME):
+    def plays(self, name=None, game_id=None, progress=None, min_date=None, max_date=None, subtype=BGGRestrictPlaysTo.BOARD_GAME,
+              columnar=False):
         """
         Retrieves the plays for an user (if using ``name``) or for a game (if using ``game_id``)
 
@@ -383,8 +591,10 @@ class BGGCommon(object):
         :param datetime.date min_date: return only plays of the specified date or later
         :param datetime.date max_date: return only plays of the specified date or earlier
         :param str subtype: limit plays results to the specified subtype.
+        :param bool columnar: if ``True``, store the plays in a :py:class:`boardgamegeek.plays.PlaysTable` instead of
+                              creating an object for each play session. Recommended for large play histories.
         :return: object containing all the plays
-        :rtype: :py:class:`boardgamegeek.plays.Plays`
+        :rtype: :py:class:`boardgamegeek.plays.Plays` or :py:class:`boardgamegeek.plays.PlaysTable`
         :return: ``None`` if the user/game couldn't be found
         :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of invalid parameter(s)
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after a short delay
@@ -398,7 +608,7 @@ class BGGCommon(object):
         if name and game_id:
             raise BGGValueError("can't retrieve by user and by game at the same time")
 
-        if subtype not in ["boardgame", "boardgameexpansion", "boardgameaccessory", "rpgitem", "videogame"]:
+        if subtype not in PLAYS_SUBTYPES:
             raise BGGValueError("invalid subtype")
 
         params = {"subtype": subtype}
@@ -429,9 +639,10 @@ class BGGCommon(object):
                                          params=params,
                                          timeout=self._timeout,
                                          retries=self._retries,
-                                         retry_delay=self._retry_delay)
+                                         retry_delay=self._retry_delay,
+                                         stats=self._transfer_stats)
 
-        plays = create_plays_from_xml(xml_root, game_id)
+        plays = create_plays_from_xml(xml_root, game_id, columnar=columnar)
         added_plays = add_plays_from_xml(plays, xml_root)
 
         try:
@@ -455,7 +666,8 @@ class BGGCommon(object):
                                              params=params,
                                              timeout=self._timeout,
                                              retries=self._retries,
-                                             retry_delay=self._retry_delay)
+                                             retry_delay=self._retry_delay,
+                                             stats=self._transfer_stats)
 
             added_plays = add_plays_from_xml(plays, xml_root)
 
@@ -492,18 +704,46 @@ class BGGCommon(object):
                                          params=params,
                                          timeout=self._timeout,
                                          retries=self._retries,
-                                         retry_delay=self._retry_delay)
+                                         retry_delay=self._retry_delay,
+                                         stats=self._transfer_stats)
 
         hot_items = create_hot_items_from_xml(xml_root)
         add_hot_items_from_xml(hot_items, xml_root)
 
         return hot_items
 
+    def hot_items_all(self, types=None, workers=DEFAULT_CONCURRENT_REQUESTS):
+        """
+        Return the lists of "Hot Items" of several types, fetched concurrently
+
+        :param list types: hot item types, see :py:meth:`hot_items`. ``None`` (default) for all of them.
+        :param int workers: number of lists to fetch at once
+        :return: dictionary of the ``HotItems`` objects, by type
+        :rtype: dict
+
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of invalid parameter(s)
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after
+                  a short delay
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
+        """
+        if types is None:
+            types = HOT_ITEM_CHOICES
+
+        unique_types = []
+        for item_type in types:
+            if item_type not in HOT_ITEM_CHOICES:
+                raise BGGValueError("invalid type specified")
+            if item_type not in unique_types:
+                unique_types.append(item_type)
+
+        return dict(zip(unique_types, run_concurrently(self.hot_items, unique_types, workers=workers)))
+
     def collection(self, user_name, subtype=BGGRestrictCollectionTo.BOARD_GAME, exclude_subtype=None, ids=None, versions=None,
                    version=None, own=None, rated=None, played=None, commented=None, trade=None, want=None, wishlist=None,
                    wishlist_prio=None, preordered=None, want_to_play=None, want_to_buy=None, prev_owned=None,
                    has_parts=None, want_parts=None, min_rating=None, rating=None, min_bgg_rating=None, bgg_rating=None,
-                   min_plays=None, max_plays=None, collection_id=None, modified_since=None):
+                   min_plays=None, max_plays=None, collection_id=None, modified_since=None, subtypes=None):
         """
         Returns an user's game collection
 
@@ -535,10 +775,15 @@ class BGGCommon(object):
         :param double bgg_rating: return items rated on BGG with a maximum of ``bgg_rating``
         :param int collection_id: restrict results to the collection specified by this id
         :param str modified_since: restrict results to those whose status (own, want, etc.) has been changed/added since ``modified_since``. Format: ``YY-MM-DD`` or ``YY-MM-DD HH:MM:SS``
+        :param list subtypes: if not ``None`` (default), return the items of each of these subtypes, instead of
+                              ``subtype``. Each subtype is fetched with its own request, the requests are made
+                              concurrently. As with ``subtype``, the board games include the expansions, unless these
+                              are requested too.
 
 
         :return: ``Collection`` object
         :rtype: :py:class:`boardgamegeek.collection.Collection`
+        :return: dictionary of the ``Collection`` objects, by subtype, if ``subtypes`` is specified
         :return: ``None`` if user not found
 
         :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of invalid parameter(s)
@@ -555,6 +800,19 @@ class BGGCommon(object):
         if subtype not in COLLECTION_SUBTYPES:
             raise BGGValueError("invalid 'subtype'")
 
+        if subtypes is None:
+            unique_subtypes = [subtype]
+        else:
+            unique_subtypes = []
+            for item_subtype in subtypes:
+                if item_subtype not in COLLECTION_SUBTYPES:
+                    raise BGGValueError("invalid 'subtypes'")
+                if item_subtype not in unique_subtypes:
+                    unique_subtypes.append(item_subtype)
+
+            if not unique_subtypes:
+                raise BGGValueError("invalid 'subtypes'")
+
         params={"username": user_name,
                 "subtype": subtype,
                 "stats": 1}
@@ -563,7 +821,7 @@ class BGGCommon(object):
             if exclude_subtype not in COLLECTION_SUBTYPES:
                 raise BGGValueError("invalid 'exclude_subtype'")
 
-            if subtype == exclude_subtype:
+            if exclude_subtype in unique_subtypes:
                 raise BGGValueError("incompatible 'subtype' and 'exclude_subtype'")
 
             params["excludesubtype"] = exclude_subtype
@@ -632,25 +890,70 @@ class BGGCommon(object):
         if modified_since is not None:
             params["modifiedsince"] = modified_since
 
+        if subtypes is not None:
+            return self._collection_by_subtype(user_name, unique_subtypes, params)
+
         xml_root = request_and_parse_xml(self.requests_session,
                                          self._collection_api_url,
                                          params=params,
                                          timeout=self._timeout,
                                          retries=self._retries,
-                                         retry_delay=self._retry_delay)
+                                         retry_delay=self._retry_delay,
+                                         stats=self._transfer_stats)
 
         collection = create_collection_from_xml(xml_root, user_name)
         add_collection_items_from_xml(collection, xml_root, subtype)
 
         return collection
 
-    def search(self, query, search_type=None, exact=False):
+    def _collection_by_subtype(self, user_name, subtypes, params):
+        # BGG tags the items as being of the requested subtype, so there's one request per subtype
+        def fetch(subtype):
+            request_params = dict(params, subtype=subtype)
+            for included, parent in COLLECTION_INCLUDED_SUBTYPES.items():
+                if parent == subtype and included in subtypes and "excludesubtype" not in params:
+                    # these items are fetched on their own
+                    request_params["excludesubtype"] = included
+
+            return request_and_parse_xml(self.requests_session,
+                                         self._collection_api_url,
+                                         params=request_params,
+                                         timeout=self._timeout,
+                                         retries=self._retries,
+                                         retry_delay=self._retry_delay,
+                                         stats=self._transfer_stats)
+
+        roots = dict(zip(subtypes, run_concurrently(fetch, subtypes)))
+
+        collections = {}
+        for subtype in subtypes:
+            xml_root = roots[subtype]
+            collections[subtype] = create_collection_from_xml(xml_root, user_name)
+
+            # when they couldn't be excluded, drop the items which are also in the collection of their own subtype
+            included = [c for c, parent in COLLECTION_INCLUDED_SUBTYPES.items() if parent == subtype and c in subtypes]
+            if included and "excludesubtype" in params:
+                ids = set(item.attrib.get("objectid") for c in included for item in roots[c].findall("item"))
+                for item in xml_root.findall("item"):
+                    if item.attrib.get("objectid") in ids:
+                        xml_root.remove(item)
+
+            add_collection_items_from_xml(collections[subtype], xml_root)
+
+        return collections
+
+    def search(self, query, search_type=None, exact=False, exact_from_index=False):
         """
         Search for a game
 
         :param str query: the string to search for
         :param list search_type: list of :py:class:`boardgamegeek.api.BGGRestrictItemTypeTo`, indicating what to include in the search results.
         :param bool exact: if True, try to match the name exactly
+        :param bool exact_from_index: if True, and the client has a name index which knows the name, the results of an
+                                      exact search come from it, without using the BGG API. They can differ from
+                                      BGG's: the index only knows the games fetched so far (so some candidates may be
+                                      missing, and choosing among them may give another game) and it matches the
+                                      normalized names (see :py:func:`boardgamegeek.index.normalize_name`).
         :return: list of ``SearchResult``
         :rtype: list of :py:class:`boardgamegeek.search.SearchResult`
 
@@ -675,6 +978,11 @@ class BGGCommon(object):
         params["type"] = ",".join(search_type)
 
         if exact:
+            if exact_from_index and self._name_index is not None:
+                results = self._name_index.lookup(query, game_types=search_type)
+                if results:
+                    return results
+
             params["exact"] = 1
 
         root = request_and_parse_xml(self.requests_session,
@@ -682,7 +990,8 @@ class BGGCommon(object):
                                      params=params,
                                      timeout=self._timeout,
                                      retries=self._retries,
-                                     retry_delay=self._retry_delay)
+                                     retry_delay=self._retry_delay,
+                                     stats=self._transfer_stats)
 
         results = []
         for item in root.findall("item"):
@@ -704,15 +1013,23 @@ class BGGClient(BGGCommon):
     """
         Python client for www.boardgamegeek.com's XML API 2.
 
-        Caching for the requests can be used by specifying an URI for the ``cache`` parameter. By default, an in-memory
-        cache is used, with sqlite being the other currently supported option.
+        Caching for the requests can be used by specifying an URI for the ``cache`` parameter. By default, each client
+        uses its own in-memory cache, with sqlite being the other currently supported option.
 
-        :param :py:class:`boardgamegeek.cache.CacheBackend` cache: An object to be used for caching the requests
+        :param :py:class:`boardgamegeek.cache.CacheBackend` cache: An object to be used for caching the requests, or
+                                                                   ``None`` for no caching
         :param float timeout: Timeout for network operations, in seconds
         :param int retries: Number of retries to perform in case the API returns HTTP 202 (retry) or in case of timeouts
         :param float retry_delay: Time to sleep, in seconds, between retries when the API returns HTTP 202 (retry)
         :param disable_ssl: ignored, left for backwards compatibility
         :param requests_per_minute: how many requests per minute to allow to go out to BGG (throttle prevention)
+        :param :py:class:`boardgamegeek.index.NameIndex` name_index: if not ``None``, index updated with the fetched
+                                                                      games, which can answer exact searches locally
+                                                                      (see :py:meth:`search`)
+        :param int pool_connections: number of hosts for which to keep a connection pool
+        :param int pool_maxsize: number of connections kept open to BGG, should be at least the number of concurrent
+                                 requests
+        :param bool pool_block: wait for a free connection when all of them are in use, instead of opening extra ones
 
         Example usage::
 
@@ -724,21 +1041,28 @@ class BGGClient(BGGCommon):
             >>> bgg_sqlite_cache = BGGClient(cache=CacheBackendSqlite(path="/path/to/cache.db", ttl=3600))
 
     """
-    def __init__(self, cache=CacheBackendMemory(ttl=3600), timeout=15, retries=3, retry_delay=5, disable_ssl=False, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE):
+    def __init__(self, cache=DEFAULT_CACHE, timeout=15, retries=3, retry_delay=5, disable_ssl=False, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 name_index=None, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_block=DEFAULT_POOL_BLOCK):
 
         super(BGGClient, self).__init__(api_endpoint="https://www.boardgamegeek.com/xmlapi2",
                                         cache=cache,
                                         timeout=timeout,
                                         retries=retries,
                                         retry_delay=retry_delay,
-                                        requests_per_minute=requests_per_minute)
+                                        requests_per_minute=requests_per_minute,
+                                        name_index=name_index,
+                                        pool_connections=pool_connections,
+                                        pool_maxsize=pool_maxsize,
+                                        pool_block=pool_block)
 
-    def get_game_id(self, name, choose=BGGChoose.FIRST):
+    def get_game_id(self, name, choose=BGGChoose.FIRST, exact_from_index=False):
         """
         Returns the BGG ID of a game, searching by name
 
         :param str name: The name of the game to search for
         :param boardgamegeek.BGGChoose choose: method of selecting the game by name, when dealing with multiple results.
+        :param bool exact_from_index: search the client's name index first, see :py:meth:`search`
         :return: the game's id
         :rtype: integer
         :return: ``None`` if game wasn't found
@@ -747,21 +1071,27 @@ class BGGClient(BGGCommon):
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
         """
-        return self._get_game_id(name, game_type=BGGRestrictSearchResultsTo.BOARD_GAME, choose=choose)
+        return self._get_game_id(name, game_type=BGGRestrictSearchResultsTo.BOARD_GAME, choose=choose,
+                                 exact_from_index=exact_from_index)
 
     def game_list(self, game_id_list, versions=False,
-                  videos=False, historical=False, marketplace=False):
+                  videos=False, historical=False, marketplace=False, fields=None):
         """
-        Get list of games by from a list of ids.
+        Get list of games by from a list of ids. The games are fetched with as few requests as possible (the BGG API
+        accepts up to :py:data:`THING_IDS_PER_REQUEST` ids per request).
 
         :param list game_id_list:  List of game ids
         :param bool versions: include versions information
         :param bool videos: include videos
         :param bool historical: include historical data
         :param bool marketplace: include marketplace data
+        :param list fields: names of the fields to parse (see :py:data:`boardgamegeek.loaders.game.GAME_FIELDS`), the
+                            others are left empty. The id, name and statistics are always available. ``None`` parses
+                            everything.
         :return: list of ``BoardGame`` objects
         :rtype: list`
 
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of an invalid field
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekAPIRetryError`
             if this request should be retried after a short delay
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekAPIError`
@@ -773,37 +1103,46 @@ class BGGClient(BGGCommon):
         if not game_id_list:
             raise BGGError("List of Game Ids must be specified")
 
+        fields = check_game_fields(fields)
+
         log.debug("retrieving games {}".format(game_id_list))
 
-        params = {"id": ",".join([str(game_id) for game_id in game_id_list]),
-                  "versions": int(versions),
-                  "videos": int(videos),
-                  "historical": int(historical),
-                  "marketplace": int(marketplace),
-                  "stats": 1}
+        game_list = []
+        for start in range(0, len(game_id_list), THING_IDS_PER_REQUEST):
+            chunk = game_id_list[start:start + THING_IDS_PER_REQUEST]
 
-        xml_root = request_and_parse_xml(self.requests_session,
-                                         self._thing_api_url,
-                                         params=params,
-                                         timeout=self._timeout,
-                                         retries=self._retries,
-                                         retry_delay=self._retry_delay)
+            params = {"id": ",".join([str(game_id) for game_id in chunk]),
+                      "versions": int(versions),
+                      "videos": int(videos),
+                      "historical": int(historical),
+                      "marketplace": int(marketplace),
+                      "stats": 1}
 
-        xml_root = xml_root.findall("item")
-        if xml_root is None:
-            msg = "invalid data for game ids: {}".format(game_id_list,)
-            raise BGGApiError(msg)
-
-        game_list = []
-        for i, game_root in enumerate(xml_root):
-            game = create_game_from_xml(game_root,
-                                        game_id=game_id_list[i])
-            game_list.append(game)
+            xml_root = request_and_parse_xml(self.requests_session,
+                                             self._thing_api_url,
+                                             params=params,
+                                             timeout=self._timeout,
+                                             retries=self._retries,
+                                             retry_delay=self._retry_delay,
+                                             stats=self._transfer_stats)
+
+            for game_root in xml_root.findall("item"):
+                # the items aren't necessarily returned in the order of the requested ids
+                try:
+                    game_id = int(game_root.attrib["id"])
+                except (KeyError, ValueError):
+                    raise BGGApiError("invalid data for game ids: {}".format(chunk))
+
+                game = create_game_from_xml(game_root,
+                                            game_id=game_id,
+                                            fields=fields)
+                self._index_game(game, fields)
+                game_list.append(game)
 
         return game_list
 
     def game(self, name=None, game_id=None, choose=BGGChoose.FIRST, versions=False, videos=False, historical=False,
-             marketplace=False, comments=False, rating_comments=False, progress=None):
+             marketplace=False, comments=False, rating_comments=False, progress=None, fields=None):
         """
         Get information about a game.
 
@@ -818,10 +1157,14 @@ class BGGClient(BGGCommon):
         :param bool comments: include comments
         :param bool rating_comments: include comments with rating (ignored in favor of ``comments``, if that is true)
         :param callable progress: callable for reporting progress if fetching comments
+        :param list fields: names of the fields to parse (see :py:data:`boardgamegeek.loaders.game.GAME_FIELDS`), the
+                            others are left empty. The id, name and statistics are always available. ``None`` parses
+                            everything.
         :return: ``BoardGame`` object
         :rtype: :py:class:`boardgamegeek.games.BoardGame`
 
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekError` in case of invalid name or game_id
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of an invalid field
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekAPIRetryError` if this request should be retried after a
                  short delay
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekAPIError` if the response couldn't be parsed
@@ -831,6 +1174,8 @@ class BGGClient(BGGCommon):
         if not name and game_id is None:
             raise BGGError("game name or id not specified")
 
+        fields = check_game_fields(fields)
+
         if game_id is None:
             game_id = self.get_game_id(name, choose=choose)
             if game_id is None:
@@ -845,7 +1190,7 @@ class BGGClient(BGGCommon):
                   "marketplace": int(marketplace),
                   "comments": int(comments),
                   "ratingcomments": int(rating_comments),
-                  "pagesize": 100,
+                  "pagesize": COMMENTS_PAGE_SIZE,
                   "page": 1,
                   "stats": 1}
 
@@ -854,7 +1199,8 @@ class BGGClient(BGGCommon):
                                          params=params,
                                          timeout=self._timeout,
                                          retries=self._retries,
-                                         retry_delay=self._retry_delay)
+                                         retry_delay=self._retry_delay,
+                                         stats=self._transfer_stats)
 
         xml_root = xml_root.find("item")
         if xml_root is None:
@@ -862,7 +1208,9 @@ class BGGClient(BGGCommon):
             raise BGGApiError(msg)
 
         game = create_game_from_xml(xml_root,
-                                    game_id=game_id)
+                                    game_id=game_id,
+                                    fields=fields)
+        self._index_game(game, fields)
 
         if not (comments or rating_comments):
             return game
@@ -874,27 +1222,11 @@ class BGGClient(BGGCommon):
         except:
             return game
 
-        page = 1
-        while added_items and len(game.comments) < total:
-            page += 1
-
-            params["page"] = page
-            xml_root = request_and_parse_xml(self.requests_session,
-                                             self._thing_api_url,
-                                             params={"id": game_id,
-                                                     "pagesize": 100,
-                                                     "comments": int(comments),
-                                                     "ratingcomments": int(rating_comments),
-                                                     "page": page},
-                                             timeout=self._timeout,
-                                             retries=self._retries,
-                                             retry_delay=self._retry_delay)
-
-            xml_root = xml_root.find("item")
-            if xml_root is None:
-                msg = "invalid data for game id: {}{}".format(game_id, "" if name is None else " ({})".format(name))
-                raise BGGApiError(msg)
+        if not added_items:
+            return game
 
+        # the number of pages is known now, fetch the next ones concurrently
+        for _, xml_root in self._iter_comment_pages(game_id, comments, rating_comments, total, first_page=2):
             added_items, total = add_game_comments_from_xml(game, xml_root)
 
             try:
@@ -902,8 +1234,82 @@ class BGGClient(BGGCommon):
             except:
                 break
 
+            if not added_items:
+                break
+
         return game
 
+    def _iter_comment_pages(self, game_id, comments, rating_comments, total, first_page,
+                            workers=DEFAULT_CONCURRENT_REQUESTS):
+        """
+        Fetches the pages of comments of a game, ``workers`` pages at a time, up to the last one according to
+        ``total``. Only the comments are parsed (see :py:func:`boardgamegeek.loaders.parse_game_comments_xml`).
+
+        :return: generator of (page number, ``<item>`` element containing the ``<comments>``), in the pages' order
+        """
+        last_page = (total + COMMENTS_PAGE_SIZE - 1) // COMMENTS_PAGE_SIZE
+
+        def fetch(page):
+            return self._comment_page(game_id, comments, rating_comments, page)
+
+        for start in range(first_page, last_page + 1, workers):
+            pages = list(range(start, min(start + workers, last_page + 1)))
+            for page, xml_root in zip(pages, run_concurrently(fetch, pages, workers=workers)):
+                yield page, xml_root
+
+    def _comment_page(self, game_id, comments, rating_comments, page):
+        """
+        Fetches a page of comments of a game
+
+        :return: an ``<item>`` element containing the ``<comments>``
+        """
+        return request_and_parse_xml(self.requests_session,
+                                     self._thing_api_url,
+                                     params={"id": game_id,
+                                             "pagesize": COMMENTS_PAGE_SIZE,
+                                             "comments": int(comments),
+                                             "ratingcomments": int(rating_comments),
+                                             "page": page},
+                                     timeout=self._timeout,
+                                     retries=self._retries,
+                                     retry_delay=self._retry_delay,
+                                     stats=self._transfer_stats,
+                                     parse=parse_game_comments_xml)
+
+    def iter_game_comments(self, game_id, rating_only=False, resume=None):
+        """
+        Iterate over the comments of a game, one page at a time, without keeping them in memory.
+
+        The returned iterator has a ``cursor`` attribute (a :py:class:`boardgamegeek.objects.games.BoardGameCommentsCursor`)
+        designating the position after the last comment yielded, and a ``total`` attribute (the number of comments, as
+        reported by the last page fetched). If the iteration fails, it can be restarted from this position by passing
+        the cursor as ``resume``.
+
+        :param integer game_id: id of the game
+        :param bool rating_only: only iterate over the ratings, instead of the comments
+        :param resume: cursor from which to resume a previous iteration
+        :type resume: :py:class:`boardgamegeek.objects.games.BoardGameCommentsCursor`
+        :return: iterator of the comments
+        :rtype: iterator of :py:class:`boardgamegeek.objects.games.BoardGameComment`
+
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of invalid parameter(s)
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after a short
+                 delay
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
+        """
+        try:
+            game_id = int(game_id)
+        except:
+            raise BGGValueError("invalid game id")
+
+        if resume is None:
+            resume = BoardGameCommentsCursor(1, 0)
+        elif resume.page < 1 or resume.count < (resume.page - 1) * COMMENTS_PAGE_SIZE:
+            raise BGGValueError("invalid cursor")
+
+        return _GameCommentsIterator(self, game_id, rating_only, resume)
+
     def games(self, name):
         """
         Return a list containing all games with the given name
@@ -914,7 +1320,11 @@ class BGGClient(BGGCommon):
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekAPIError` if the response couldn't be parsed
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekTimeoutError` if there was a timeout
         """
-        return [self.game(game_id=s.id)
-                for s in self.search(name,
-                                     search_type=[BGGRestrictSearchResultsTo.BOARD_GAME, BGGRestrictSearchResultsTo.BOARD_GAME_EXPANSION],
-                                     exact=True)]
+        results = self.search(name,
+                              search_type=[BGGRestrictSearchResultsTo.BOARD_GAME, BGGRestrictSearchResultsTo.BOARD_GAME_EXPANSION],
+                              exact=True)
+        if not results:
+            return []
+
+        # all the games are fetched together
+        return self.game_list([s.id for s in results])
@@ -1,15 +1,27 @@
-import requests
-import requests_cache
-
+# requests and requests_cache are slow to import, they're only imported when a cache is created
 from .exceptions import BGGValueError
 
+# time to live of the cache of the clients created without an explicit ``cache``, in seconds
+DEFAULT_CACHE_TTL = 3600
+
 
 class CacheBackend(object):
     pass
 
 
+class _DefaultCache(object):
+    """ Placeholder for the default cache, which is created when the client is """
+    def __repr__(self):
+        return "DEFAULT_CACHE"
+
+# default value of the clients' ``cache`` parameter: each client gets its own in-memory cache, whose time to live is
+# :py:data:`DEFAULT_CACHE_TTL`
+DEFAULT_CACHE = _DefaultCache()
+
+
 class CacheBackendNone(CacheBackend):
     def __init__(self):
+        import requests
         self.cache = requests.Session()
 
 
@@ -20,6 +32,7 @@ class CacheBackendMemory(CacheBackend):
             int(ttl)
         except ValueError:
             raise BGGValueError
+        import requests_cache
         self.cache = requests_cache.core.CachedSession(backend="memory", expire_after=ttl, allowable_codes=(200,))
 
 
@@ -30,6 +43,7 @@ class CacheBackendSqlite(CacheBackend):
         except ValueError:
             raise BGGValueError
 
+        import requests_cache
         self.cache = requests_cache.core.CachedSession(cache_name=path,
                                                        backend="sqlite",
                                                        expire_after=ttl,
@@ -0,0 +1,629 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.index` - Indexes over locally stored games
+==============================================================
+
+.. module:: boardgamegeek.index
+   :platform: Unix, Windows
+   :synopsis: indexes for querying locally stored games without using the BGG API
+
+"""
+from __future__ import unicode_literals
+
+import difflib
+import json
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+
+from .exceptions import BGGError, BGGValueError
+from .objects.games import BoardGame
+from .objects.search import SearchResult
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_name(name):
+    """
+    Normalizes a name for looking it up in a :py:class:`NameIndex`: case, accents, punctuation and extra spaces are
+    ignored, e.g. "Puerto Rico: Deluxe" and "puerto rico  deluxe" are the same.
+
+    :param str name: the name
+    :return: the normalized name
+    :rtype: str
+    """
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    return " ".join(_WORD_RE.findall(name.lower()))
+
+
+class LinkIndex(object):
+    """
+    Index of games by the ids of the items they're linked to (families, categories, mechanics, designers, etc.), so
+    that e.g. finding all the games having the mechanic 2041 is a lookup.
+
+    :param games: games to add to the index
+    :type games: iterable of :py:class:`boardgamegeek.games.BoardGame`
+    """
+    def __init__(self, games=None):
+        # for each link field, the ids of the games for each linked item
+        self._games = {field: {} for field in BoardGame.LINK_FIELDS}
+        # for each link field, the name of each linked item
+        self._names = {field: {} for field in BoardGame.LINK_FIELDS}
+        # the links of each game, for updating the index when the game is added again
+        self._game_links = {}
+
+        for game in games or []:
+            self.add_game(game)
+
+    def __len__(self):
+        return len(self._game_links)
+
+    def __contains__(self, game_id):
+        return game_id in self._game_links
+
+    @staticmethod
+    def _check_field(field):
+        if field not in BoardGame.LINK_FIELDS:
+            raise BGGValueError("invalid link field: {}".format(field))
+
+    def add_game(self, game):
+        """
+        Adds a game to the index, replacing the previously indexed links if it's already there
+
+        :param game: the game
+        :type game: :py:class:`boardgamegeek.games.BoardGame`
+        """
+        self.remove_game(game.id)
+
+        links = []
+        for field in BoardGame.LINK_FIELDS:
+            games = self._games[field]
+            names = self._names[field]
+            for link in game.links(field):
+                games.setdefault(link.id, set()).add(game.id)
+                names[link.id] = link.name
+                links.append((field, link.id))
+
+        self._game_links[game.id] = links
+
+    def remove_game(self, game_id):
+        """
+        Removes a game from the index; does nothing if it's not indexed
+
+        :param int game_id: the game's id
+        """
+        for field, link_id in self._game_links.pop(game_id, []):
+            games = self._games[field][link_id]
+            games.discard(game_id)
+            if not games:
+                del self._games[field][link_id]
+
+    def games(self, field, link_id):
+        """
+        Returns the ids of the games linked to an item
+
+        :param str field: one of :py:attr:`boardgamegeek.games.BoardGame.LINK_FIELDS`, e.g. ``"mechanics"``
+        :param int link_id: the linked item's id
+        :return: the games' ids
+        :rtype: frozenset of integers
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if ``field`` is invalid
+        """
+        self._check_field(field)
+        return frozenset(self._games[field].get(link_id, ()))
+
+    def link_ids(self, field):
+        """
+        Returns the ids of the items linked to the indexed games
+
+        :param str field: one of :py:attr:`boardgamegeek.games.BoardGame.LINK_FIELDS`, e.g. ``"mechanics"``
+        :return: the ids
+        :rtype: list of integers, sorted
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if ``field`` is invalid
+        """
+        self._check_field(field)
+        return sorted(self._games[field])
+
+    def name(self, field, link_id):
+        """
+        Returns the name of a linked item
+
+        :param str field: one of :py:attr:`boardgamegeek.games.BoardGame.LINK_FIELDS`, e.g. ``"mechanics"``
+        :param int link_id: the linked item's id
+        :return: the name, ``None`` if the item isn't known
+        :rtype: str
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if ``field`` is invalid
+        """
+        self._check_field(field)
+        return self._names[field].get(link_id)
+
+
+class GameCatalog(object):
+    """
+    Collection of games which can be queried without looping over all of them: the games are indexed by the items
+    they're linked to (see :py:class:`LinkIndex`) and by their numeric properties (see :py:attr:`RANGE_FIELDS`).
+
+    Queries return sets of game ids, which can be combined using the set operators, e.g.
+    ``catalog.with_link("mechanics", 2041) & catalog.in_range("year", 2000, 2010)``.
+
+    :param games: games to add to the catalog, e.g. the result of :py:meth:`boardgamegeek.api.BGGClient.game_list`
+    :type games: iterable of :py:class:`boardgamegeek.games.BoardGame`
+    """
+    #: numeric properties of the games which can be queried by range
+    RANGE_FIELDS = ("min_players", "max_players", "playing_time", "year", "bgg_rank")
+
+    def __init__(self, games=None):
+        self._games = {}
+        self._links = LinkIndex()
+        # for each range field, the values sorted and the ids of the corresponding games, built when first needed
+        self._ranges = {}
+        # for each number of players, the ids of the games best (or recommended) at it, built when first needed
+        self._best_at = None
+        self._recommended_at = None
+
+        for game in games or []:
+            self.add_game(game)
+
+    def __len__(self):
+        return len(self._games)
+
+    def __contains__(self, game_id):
+        return game_id in self._games
+
+    def __iter__(self):
+        for game in self._games.values():
+            yield game
+
+    def __getitem__(self, game_id):
+        return self._games[game_id]
+
+    def add_game(self, game):
+        """
+        Adds a game to the catalog, replacing the one with the same id
+
+        :param game: the game
+        :type game: :py:class:`boardgamegeek.games.BoardGame`
+        """
+        old = self._games.get(game.id)
+        if old is not None:
+            self._update_indexes(old, remove=True)
+
+        self._games[game.id] = game
+        self._links.add_game(game)
+        self._update_indexes(game)
+
+    def _update_indexes(self, game, remove=False):
+        # the indexes which were already built are updated in place, rather than built again when next needed
+        for field, (values, ids, by_id) in self._ranges.items():
+            value = by_id.pop(game.id, None) if remove else getattr(game, field)
+            if value is None:
+                continue
+            # the games are sorted by value, then by id
+            position = bisect_left(ids, game.id, bisect_left(values, value), bisect_right(values, value))
+            if remove:
+                del values[position]
+                del ids[position]
+            else:
+                values.insert(position, value)
+                ids.insert(position, game.id)
+                by_id[game.id] = value
+
+        for index, attribute in ((self._best_at, "best_player_counts"),
+                                 (self._recommended_at, "recommended_player_counts")):
+            if index is None:
+                continue
+            for count in getattr(game, attribute):
+                if remove:
+                    index[count].discard(game.id)
+                else:
+                    index.setdefault(count, set()).add(game.id)
+
+    def add_games(self, games):
+        """
+        Adds games to the catalog
+
+        :param games: the games
+        :type games: iterable of :py:class:`boardgamegeek.games.BoardGame`
+        """
+        for game in games:
+            self.add_game(game)
+
+    def games(self, game_ids):
+        """
+        Returns the games having the given ids, e.g. the result of a query
+
+        :param game_ids: the ids
+        :return: the games, sorted by id
+        :rtype: list of :py:class:`boardgamegeek.games.BoardGame`
+        """
+        return [self._games[game_id] for game_id in sorted(game_ids)]
+
+    def all(self):
+        """
+        :return: the ids of all the games
+        :rtype: frozenset of integers
+        """
+        return frozenset(self._games)
+
+    def with_link(self, field, link_id):
+        """
+        Returns the ids of the games linked to an item, e.g. having a mechanic
+
+        :param str field: one of :py:attr:`boardgamegeek.games.BoardGame.LINK_FIELDS`, e.g. ``"mechanics"``
+        :param int link_id: the linked item's id
+        :return: the games' ids
+        :rtype: frozenset of integers
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if ``field`` is invalid
+        """
+        return self._links.games(field, link_id)
+
+    def _range_index(self, field):
+        if field not in self.RANGE_FIELDS:
+            raise BGGValueError("invalid range field: {}".format(field))
+
+        if field not in self._ranges:
+            by_id = {}
+            for game in self._games.values():
+                value = getattr(game, field)
+                if value is not None:
+                    by_id[game.id] = value
+            pairs = sorted((value, game_id) for game_id, value in by_id.items())
+            self._ranges[field] = ([value for value, _ in pairs], [game_id for _, game_id in pairs], by_id)
+
+        return self._ranges[field]
+
+    def _range_slice(self, field, minimum, maximum):
+        # position, in the range index, of the games having values between minimum and maximum
+        values = self._range_index(field)[0]
+        start = 0 if minimum is None else bisect_left(values, minimum)
+        end = len(values) if maximum is None else bisect_right(values, maximum)
+        return start, max(start, end)
+
+    def in_range(self, field, minimum=None, maximum=None):
+        """
+        Returns the ids of the games having a numeric property in a range. The games for which the property is n/a
+        never match.
+
+        :param str field: one of :py:attr:`RANGE_FIELDS`, e.g. ``"year"``
+        :param minimum: lower bound (inclusive), ``None`` for no bound
+        :param maximum: upper bound (inclusive), ``None`` for no bound
+        :return: the games' ids
+        :rtype: frozenset of integers
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if ``field`` is invalid
+        """
+        start, end = self._range_slice(field, minimum, maximum)
+        return frozenset(self._range_index(field)[1][start:end])
+
+    def supporting_players(self, count):
+        """
+        Returns the ids of the games which can be played by a number of players
+
+        :param int count: number of players
+        :return: the games' ids
+        :rtype: frozenset of integers
+        """
+        return self.select(players=count)
+
+    def _player_counts_index(self, attribute):
+        index = {}
+        for game in self._games.values():
+            for count in getattr(game, attribute):
+                index.setdefault(count, set()).add(game.id)
+        return index
+
+    def best_at(self, count):
+        """
+        Returns the ids of the games which are best with a number of players, according to the votes of the BGG users
+        (see :py:attr:`boardgamegeek.games.BoardGame.best_player_counts`)
+
+        :param int count: number of players
+        :return: the games' ids
+        :rtype: frozenset of integers
+        """
+        if self._best_at is None:
+            self._best_at = self._player_counts_index("best_player_counts")
+        return frozenset(self._best_at.get(count, ()))
+
+    def recommended_at(self, count):
+        """
+        Returns the ids of the games which are recommended with a number of players, according to the votes of the BGG
+        users (see :py:attr:`boardgamegeek.games.BoardGame.recommended_player_counts`)
+
+        :param int count: number of players
+        :return: the games' ids
+        :rtype: frozenset of integers
+        """
+        if self._recommended_at is None:
+            self._recommended_at = self._player_counts_index("recommended_player_counts")
+        return frozenset(self._recommended_at.get(count, ()))
+
+    def select(self, players=None, best_at=None, recommended_at=None, **criteria):
+        """
+        Returns the ids of the games matching all the criteria, e.g.
+        ``catalog.select(mechanics=[2041, 2040], year=(2000, None), players=4)``
+
+        :param int players: number of players the games must support, ``None`` for any
+        :param int best_at: number of players the games must be best with (see :py:meth:`best_at`), ``None`` for any
+        :param int recommended_at: number of players the games must be recommended with (see
+                                   :py:meth:`recommended_at`), ``None`` for any
+        :param criteria: for link fields (see :py:attr:`boardgamegeek.games.BoardGame.LINK_FIELDS`), the id of an item
+                         or a list of ids, all of which the games must be linked to; for range fields (see
+                         :py:attr:`RANGE_FIELDS`), a ``(minimum, maximum)`` tuple, as for :py:meth:`in_range`
+        :return: the games' ids
+        :rtype: frozenset of integers
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if a criterion is invalid
+        """
+        links = []      # for each linked item, the ids of the games linked to it
+        ranges = []     # (field, minimum, maximum)
+
+        for field, value in criteria.items():
+            if field in self.RANGE_FIELDS:
+                try:
+                    minimum, maximum = value
+                except (TypeError, ValueError):
+                    raise BGGValueError("invalid range for {}: {}".format(field, value))
+                ranges.append((field, minimum, maximum))
+            elif field in BoardGame.LINK_FIELDS:
+                for link_id in value if isinstance(value, (list, tuple, set, frozenset)) else [value]:
+                    links.append(self._links.games(field, link_id))
+            else:
+                raise BGGValueError("invalid criterion: {}".format(field))
+
+        if players is not None:
+            ranges.append(("min_players", None, players))
+            ranges.append(("max_players", players, None))
+
+        if best_at is not None:
+            links.append(self.best_at(best_at))
+
+        if recommended_at is not None:
+            links.append(self.recommended_at(recommended_at))
+
+        # start with the smallest sets, so that the intermediate results stay small
+        result = None
+        if links:
+            links.sort(key=len)
+            result = set(links[0]).intersection(*links[1:])
+
+        # then with the narrowest ranges
+        slices = [self._range_slice(field, minimum, maximum) + (field, minimum, maximum)
+                  for field, minimum, maximum in ranges]
+        slices.sort(key=lambda s: s[1] - s[0])
+
+        for start, end, field, minimum, maximum in slices:
+            if result is None:
+                result = set(self._range_index(field)[1][start:end])
+            elif len(result) < end - start:
+                # fewer candidates than games in the range: check the candidates' values
+                by_id = self._range_index(field)[2]
+                result = {game_id for game_id in result
+                          if game_id in by_id and
+                          (minimum is None or by_id[game_id] >= minimum) and
+                          (maximum is None or by_id[game_id] <= maximum)}
+            else:
+                result.intersection_update(self._range_index(field)[1][start:end])
+
+            if not result:
+                break
+
+        return self.all() if result is None else frozenset(result)
+
+
+class NameIndex(object):
+    """
+    Index of the names (primary and alternate) of games, for finding a game's id without searching with the BGG API.
+    Names are normalized (see :py:func:`normalize_name`) and can be looked up exactly, by prefix, by words or
+    approximately.
+
+    The index only knows the games which were added to it, it can be saved to a file with :py:meth:`save` and loaded
+    back with :py:meth:`load`.
+
+    Results are returned as :py:class:`boardgamegeek.search.SearchResult`, the best ranked games first.
+    """
+    #: version of the file format used by :py:meth:`save`
+    FILE_VERSION = 1
+
+    def __init__(self):
+        self._games = {}        # game id -> {"name", "alternative_names", "year", "type", "rank"}
+        self._names = {}        # normalized name -> ids of the games having it
+        self._words = {}        # word -> ids of the games having it in one of their names
+        self._sorted_names = None
+
+    def __len__(self):
+        return len(self._games)
+
+    def __contains__(self, game_id):
+        return game_id in self._games
+
+    def add(self, game_id, name, alternative_names=(), year=None, game_type="boardgame", rank=None):
+        """
+        Adds a game to the index, replacing it if it's already there
+
+        :param int game_id: the game's id
+        :param str name: the game's primary name
+        :param list alternative_names: the game's other names
+        :param int year: the year the game was published
+        :param str game_type: the game's type (e.g. ``"boardgame"``, ``"boardgameexpansion"``)
+        :param int rank: the game's BGG rank, ``None`` if it's not ranked
+        """
+        self.remove(game_id)
+
+        self._games[game_id] = {"name": name,
+                                "alternative_names": list(alternative_names or []),
+                                "year": year,
+                                "type": game_type,
+                                "rank": rank}
+
+        for n in [name] + list(alternative_names or []):
+            if not n:
+                continue
+            normalized = normalize_name(n)
+            self._names.setdefault(normalized, set()).add(game_id)
+            for word in normalized.split():
+                self._words.setdefault(word, set()).add(game_id)
+
+        self._sorted_names = None
+
+    def add_game(self, game):
+        """
+        Adds a game to the index, replacing it if it's already there
+
+        :param game: the game
+        :type game: :py:class:`boardgamegeek.games.BoardGame`
+        """
+        if game.expansion:
+            game_type = "boardgameexpansion"
+        elif game.accessory:
+            game_type = "boardgameaccessory"
+        else:
+            game_type = "boardgame"
+
+        self.add(game.id, game.name, game.alternative_names, year=game.year, game_type=game_type, rank=game.bgg_rank)
+
+    def remove(self, game_id):
+        """
+        Removes a game from the index; does nothing if it's not indexed
+
+        :param int game_id: the game's id
+        """
+        entry = self._games.pop(game_id, None)
+        if entry is None:
+            return
+
+        for n in [entry["name"]] + entry["alternative_names"]:
+            if not n:
+                continue
+            normalized = normalize_name(n)
+            for index, key in [(self._names, normalized)] + [(self._words, word) for word in normalized.split()]:
+                ids = index.get(key)
+                if ids is not None:
+                    ids.discard(game_id)
+                    if not ids:
+                        del index[key]
+
+        self._sorted_names = None
+
+    def rank(self, game_id):
+        """
+        :param int game_id: the game's id
+        :return: the game's BGG rank, ``None`` if it's not ranked
+        :rtype: integer
+        :raises: :py:exc:`KeyError` if the game isn't indexed
+        """
+        return self._games[game_id]["rank"]
+
+    def _results(self, game_ids, game_types, limit=None):
+        results = []
+        for game_id in game_ids:
+            entry = self._games[game_id]
+            if game_types is not None and entry["type"] not in game_types:
+                continue
+            results.append(SearchResult({"id": game_id,
+                                         "name": entry["name"],
+                                         "yearpublished": entry["year"],
+                                         "type": entry["type"]}))
+
+        results.sort(key=lambda r: (self._games[r.id]["rank"] is None, self._games[r.id]["rank"], r.id))
+        return results[:limit] if limit is not None else results
+
+    def lookup(self, name, game_types=None):
+        """
+        Returns the games having a name (primary or alternate)
+
+        :param str name: the name
+        :param list game_types: if not ``None``, only return the games having one of these types
+        :return: the games
+        :rtype: list of :py:class:`boardgamegeek.search.SearchResult`
+        """
+        return self._results(self._names.get(normalize_name(name), ()), game_types)
+
+    def prefix(self, prefix, game_types=None, limit=None):
+        """
+        Returns the games having a name starting with ``prefix``
+
+        :param str prefix: the beginning of the name
+        :param list game_types: if not ``None``, only return the games having one of these types
+        :param int limit: maximum number of results
+        :return: the games
+        :rtype: list of :py:class:`boardgamegeek.search.SearchResult`
+        """
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self._names)
+
+        prefix = normalize_name(prefix)
+        game_ids = set()
+        for i in range(bisect_left(self._sorted_names, prefix), len(self._sorted_names)):
+            if not self._sorted_names[i].startswith(prefix):
+                break
+            game_ids.update(self._names[self._sorted_names[i]])
+
+        return self._results(game_ids, game_types, limit)
+
+    def words(self, query, game_types=None, limit=None):
+        """
+        Returns the games having names which contain all the words of ``query``, in any order
+
+        :param str query: the words
+        :param list game_types: if not ``None``, only return the games having one of these types
+        :param int limit: maximum number of results
+        :return: the games
+        :rtype: list of :py:class:`boardgamegeek.search.SearchResult`
+        """
+        sets = sorted((self._words.get(word, set()) for word in normalize_name(query).split()), key=len)
+        game_ids = set(sets[0]).intersection(*sets[1:]) if sets else set()
+        return self._results(game_ids, game_types, limit)
+
+    def fuzzy(self, name, game_types=None, limit=10, cutoff=0.8):
+        """
+        Returns the games having names similar to ``name``, e.g. misspelled
+
+        :param str name: the name
+        :param list game_types: if not ``None``, only return the games having one of these types
+        :param int limit: maximum number of names to match
+        :param float cutoff: minimum similarity of the names, between 0 and 1
+        :return: the games, the ones with the most similar names first
+        :rtype: list of :py:class:`boardgamegeek.search.SearchResult`
+        """
+        results = []
+        seen = set()
+        for match in difflib.get_close_matches(normalize_name(name), list(self._names), n=limit, cutoff=cutoff):
+            for result in self._results(self._names[match] - seen, game_types):
+                seen.add(result.id)
+                results.append(result)
+        return results
+
+    def save(self, path):
+        """
+        Saves the index to a file
+
+        :param str path: the file's path
+        """
+        data = {"version": self.FILE_VERSION,
+                "games": [dict(entry, id=game_id) for game_id, entry in self._games.items()]}
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads an index saved with :py:meth:`save`
+
+        :param str path: the file's path
+        :return: the index
+        :rtype: :py:class:`NameIndex`
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGError` if the file is invalid
+        """
+        with open(path) as f:
+            try:
+                data = json.load(f)
+            except ValueError:
+                raise BGGError("invalid name index file: {}".format(path))
+
+        if data.get("version") != cls.FILE_VERSION:
+            raise BGGError("unsupported name index file version: {}".format(data.get("version")))
+
+        index = cls()
+        for entry in data["games"]:
+            index.add(entry["id"], entry["name"], entry["alternative_names"], year=entry["year"],
+                      game_type=entry["type"], rank=entry["rank"])
+        return index
@@ -3,8 +3,9 @@ import logging
 # import xml.etree.ElementTree as ET
 
 from .api import BGGCommon
-from .api import CacheBackendMemory
+from .api import DEFAULT_CACHE
 from .api import DEFAULT_REQUESTS_PER_MINUTE
+from .api import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, DEFAULT_POOL_BLOCK
 from .api import BGGValueError
 from .api import request_and_parse_xml
 from .loaders import create_geeklist_from_xml, add_geeklist_items_from_xml
@@ -14,14 +15,19 @@ log = logging.getLogger("boardgamegeek.legacy_api")
 API_ENDPOINT='http://www.boardgamegeek.com/xmlapi'
 
 class BGGClientLegacy(BGGCommon):
-    def __init__(self, cache=CacheBackendMemory(ttl=3600), timeout=15, retries=3, retry_delay=5, disable_ssl=False, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE):
+    def __init__(self, cache=DEFAULT_CACHE, timeout=15, retries=3, retry_delay=5, disable_ssl=False, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_block=DEFAULT_POOL_BLOCK):
 
         super(BGGClientLegacy, self).__init__(api_endpoint=API_ENDPOINT,
                                               cache=cache,
                                               timeout=timeout,
                                               retries=retries,
                                               retry_delay=retry_delay,
-                                              requests_per_minute=requests_per_minute)
+                                              requests_per_minute=requests_per_minute,
+                                              pool_connections=pool_connections,
+                                              pool_maxsize=pool_maxsize,
+                                              pool_block=pool_block)
         self._search_api_url = None
         self._thing_api_url = None
         self._guild_api_url = None
@@ -46,7 +52,8 @@ class BGGClientLegacy(BGGCommon):
                                          params=params,
                                          timeout=self._timeout,
                                          retries=self._retries,
-                                         retry_delay=self._retry_delay)
+                                         retry_delay=self._retry_delay,
+                                         stats=self._transfer_stats)
         # ET.dump(xml_root)
 
         list = create_geeklist_from_xml(xml_root, listid)
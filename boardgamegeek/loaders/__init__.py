@@ -2,7 +2,8 @@ from .collection import create_collection_from_xml, add_collection_items_from_xm
 from .guild import create_guild_from_xml, add_guild_members_from_xml
 from .hotitems import create_hot_items_from_xml, add_hot_items_from_xml
 from .plays import create_plays_from_xml, add_plays_from_xml
-from .game import create_game_from_xml, add_game_comments_from_xml
+from .game import create_game_from_xml, add_game_comments_from_xml, check_game_fields, GAME_FIELDS
+from .game import parse_game_comments_xml, load_game_comments_from_xml
 from .geeklist import create_geeklist_from_xml, add_geeklist_items_from_xml
 
 __all__ = [create_collection_from_xml, create_guild_from_xml, create_hot_items_from_xml, create_plays_from_xml,
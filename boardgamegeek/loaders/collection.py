@@ -1,7 +1,8 @@
 from ..objects.collection import Collection
+from ..objects.games import decode_collection_status
 from ..exceptions import BGGApiError, BGGItemNotFoundError
 from ..utils import get_board_game_version_from_element
-from ..utils import xml_subelement_text, xml_subelement_attr
+from ..utils import xml_subelement_text, xml_subelement_attr, intern_string
 
 
 def create_collection_from_xml(xml_root, user_name):
@@ -13,14 +14,21 @@ def create_collection_from_xml(xml_root, user_name):
         # TODO: this is probably the invalid user error, but need to find out if there are any other error cases
         raise BGGItemNotFoundError(msg)
 
-    return Collection({"owner": user_name})
+    return Collection._from_owned({"owner": user_name})
 
 
-def add_collection_items_from_xml(collection, xml_root, subtype):
+def add_collection_items_from_xml(collection, xml_root, subtype=None):
 
     added_items = False
 
-    for item in xml_root.findall("item[@subtype='{}']".format(subtype)):
+    # BGG tags the items with the requested subtype (e.g. the expansions returned along with the board games are
+    # tagged as board games), ``None`` keeps all of them
+    if subtype is None:
+        items = xml_root.findall("item")
+    else:
+        items = xml_root.findall("item[@subtype='{}']".format(subtype))
+
+    for item in items:
 
         # initial data for this collection item
         data = {"name": xml_subelement_text(item, "name"),
@@ -40,18 +48,23 @@ def add_collection_items_from_xml(collection, xml_root, subtype):
         if stats is None:
             raise BGGApiError("missing 'stats'")
 
-        stat_data = {"usersrated": xml_subelement_attr(stats, "usersrated", convert=int, quiet=True),
-                     "average": xml_subelement_attr(stats, "average", convert=float, quiet=True),
-                     "bayesaverage": xml_subelement_attr(stats, "bayesaverage", convert=float, quiet=True),
-                     "stddev": xml_subelement_attr(stats, "stddev", convert=float, quiet=True),
-                     "median": xml_subelement_attr(stats, "median", convert=float, quiet=True),
+        # the statistics are children of the element holding the user's rating
+        rating = stats.find("rating")
+        if rating is None:
+            rating = stats
+
+        stat_data = {"usersrated": xml_subelement_attr(rating, "usersrated", convert=int, quiet=True),
+                     "average": xml_subelement_attr(rating, "average", convert=float, quiet=True),
+                     "bayesaverage": xml_subelement_attr(rating, "bayesaverage", convert=float, quiet=True),
+                     "stddev": xml_subelement_attr(rating, "stddev", convert=float, quiet=True),
+                     "median": xml_subelement_attr(rating, "median", convert=float, quiet=True),
                      "ranks": []}
 
-        for rank in stats.findall("ranks/rank"):
-            stat_data["ranks"].append({"type": rank.attrib.get("type"),
+        for rank in rating.findall("ranks/rank"):
+            stat_data["ranks"].append({"type": intern_string(rank.attrib.get("type")),
                                        "id": rank.attrib["id"],
-                                       "name": rank.attrib["name"],
-                                       "friendlyname": rank.attrib["friendlyname"],
+                                       "name": intern_string(rank.attrib["name"]),
+                                       "friendlyname": intern_string(rank.attrib["friendlyname"]),
                                        "value": rank.attrib.get("value"),
                                        "bayesaverage": float(rank.attrib.get("bayesaverage", 0.0))})
 
@@ -66,16 +79,18 @@ def add_collection_items_from_xml(collection, xml_root, subtype):
         # status of the item in the collection
         status = item.find("status")
         if status is not None:
-            data.update({stat: status.attrib.get(stat) for stat in ["lastmodified",
-                                                                    "own",
-                                                                    "preordered",
-                                                                    "prevowned",
-                                                                    "want",
-                                                                    "wanttobuy",
-                                                                    "wanttoplay",
-                                                                    "fortrade",
-                                                                    "wishlist",
-                                                                    "wishlistpriority"]})
+            data["lastmodified"] = status.attrib.get("lastmodified")
+            # the status values are "0"/"1" (and a 1-5 priority), share them between the items
+            data.update({stat: intern_string(status.attrib.get(stat)) for stat in ["own",
+                                                                                   "preordered",
+                                                                                   "prevowned",
+                                                                                   "want",
+                                                                                   "wanttobuy",
+                                                                                   "wanttoplay",
+                                                                                   "fortrade",
+                                                                                   "wishlist",
+                                                                                   "wishlistpriority"]})
+            data["status_flags"] = decode_collection_status(status.attrib)
 
         # get the version, if any
         version = item.find("version")
@@ -1,13 +1,65 @@
+import io
 import logging
+import xml.etree.ElementTree as ET
 
-from ..objects.games import BoardGame
-from ..exceptions import BGGApiError
-from ..utils import xml_subelement_attr_list, xml_subelement_text, xml_subelement_attr, get_board_game_version_from_element, html_unescape
+from ..objects.games import BoardGame, LINK_TYPES
+from ..exceptions import BGGApiError, BGGValueError
+from ..utils import xml_subelement_attr_list, xml_subelement_text, xml_subelement_attr, get_board_game_version_from_element
+from ..utils import intern_string
 
 log = logging.getLogger("boardgamegeek.loaders.game")
 
+# the game's property and the XML element it's read from, for numeric values
+NUMERIC_FIELDS = (("year", "yearpublished"),
+                  ("min_players", "minplayers"),
+                  ("max_players", "maxplayers"),
+                  ("playing_time", "playingtime"),
+                  ("min_playing_time", "minplaytime"),
+                  ("max_playing_time", "maxplaytime"),
+                  ("min_age", "minage"))
 
-def create_game_from_xml(xml_root, game_id):
+#: Fields which can be selected for parsing with the ``fields`` argument of :py:func:`create_game_from_xml`, named
+#: after the properties of :py:class:`boardgamegeek.games.BoardGame`. The id, the name, the type and the statistics
+#: (rank, ratings, weight) are always parsed.
+GAME_FIELDS = frozenset(["alternative_names", "thumbnail", "image", "description", "expansions", "expands",
+                         "videos", "versions", "player_suggestions"] +
+                        list(BoardGame.LINK_FIELDS) +
+                        [field for field, _ in NUMERIC_FIELDS])
+
+
+def check_game_fields(fields):
+    """
+    Validates a selection of fields to parse
+
+    :param fields: names of the fields, from :py:data:`GAME_FIELDS`, or ``None`` for all of them
+    :return: the selected fields
+    :rtype: frozenset
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if a field is unknown
+    """
+    if fields is None:
+        return GAME_FIELDS
+
+    fields = frozenset(fields)
+    unknown = fields - GAME_FIELDS
+    if unknown:
+        raise BGGValueError("invalid fields: {}".format(", ".join(sorted(unknown))))
+    return fields
+
+
+def create_game_from_xml(xml_root, game_id, fields=None):
+    """
+    Creates a :py:class:`boardgamegeek.games.BoardGame` out of an ``<item>`` returned by the /thing API
+
+    :param xml_root: the ``<item>`` element
+    :param game_id: the game's id
+    :param fields: names of the fields to parse (see :py:data:`GAME_FIELDS`), the others are skipped. ``None``
+                   parses everything.
+    :return: the game
+    :rtype: :py:class:`boardgamegeek.games.BoardGame`
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if a field is unknown
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the XML is invalid
+    """
+    fields = check_game_fields(fields)
 
     game_type = xml_root.attrib["type"]
     if game_type not in ["boardgame", "boardgameexpansion", "boardgameaccessory"]:
@@ -16,52 +68,76 @@ def create_game_from_xml(xml_root, game_id):
 
     data = {"id": game_id,
             "name": xml_subelement_attr(xml_root, "name[@type='primary']"),
-            "alternative_names": xml_subelement_attr_list(xml_root, "name[@type='alternate']"),
-            "thumbnail": xml_subelement_text(xml_root, "thumbnail"),
-            "image": xml_subelement_text(xml_root, "image"),
             "expansion": game_type == "boardgameexpansion",       # is this game an expansion?
-            "accessory": game_type == "boardgameaccessory",       # is this game an accessory?
-            "families": xml_subelement_attr_list(xml_root, "link[@type='boardgamefamily']"),
-            "categories": xml_subelement_attr_list(xml_root, "link[@type='boardgamecategory']"),
-            "implementations": xml_subelement_attr_list(xml_root, "link[@type='boardgameimplementation']"),
-            "mechanics": xml_subelement_attr_list(xml_root, "link[@type='boardgamemechanic']"),
-            "designers": xml_subelement_attr_list(xml_root, "link[@type='boardgamedesigner']"),
-            "artists": xml_subelement_attr_list(xml_root, "link[@type='boardgameartist']"),
-            "publishers": xml_subelement_attr_list(xml_root, "link[@type='boardgamepublisher']"),
-            "description": xml_subelement_text(xml_root, "description", convert=html_unescape, quiet=True)}
-
-    expands = []        # list of items this game expands
-    expansions = []     # list of expansions this game has
-    for e in xml_root.findall("link[@type='boardgameexpansion']"):
-        try:
-            item = {"id": e.attrib["id"], "name": e.attrib["value"]}
-        except KeyError:
-            raise BGGApiError("malformed XML element ('link type=boardgameexpansion')")
-
-        if e.attrib.get("inbound", "false").lower()[0] == 't':
-            # this is an item expanded by game_id
-            expands.append(item)
-        else:
-            expansions.append(item)
-
-    data["expansions"] = expansions
-    data["expands"] = expands
+            "accessory": game_type == "boardgameaccessory"}       # is this game an accessory?
+
+    if "alternative_names" in fields:
+        data["alternative_names"] = xml_subelement_attr_list(xml_root, "name[@type='alternate']")
+    if "thumbnail" in fields:
+        data["thumbnail"] = xml_subelement_text(xml_root, "thumbnail")
+    if "image" in fields:
+        data["image"] = xml_subelement_text(xml_root, "image")
+    if "description" in fields:
+        # unescaped on first access (see BoardGame.description)
+        data["description_escaped"] = xml_subelement_text(xml_root, "description", quiet=True)
+
+    # all the links are read in a single pass: the names of the linked items go in data[field] and their ids, in the
+    # same order, in data[field + "_ids"]
+    link_fields = {}
+    for field, link_type in LINK_TYPES:
+        if field in fields:
+            link_fields[link_type] = (data.setdefault(field, []), data.setdefault(field + "_ids", []))
+
+    with_expansions = "expansions" in fields or "expands" in fields
+    if with_expansions:
+        expands = data["expands"] = []          # list of items this game expands
+        expansions = data["expansions"] = []    # list of expansions this game has
+
+    if link_fields or with_expansions:
+        for e in xml_root.findall("link"):
+            link_type = e.attrib.get("type")
+
+            if link_type == "boardgameexpansion":
+                if not with_expansions:
+                    continue
+                try:
+                    item = {"id": e.attrib["id"], "name": e.attrib["value"]}
+                except KeyError:
+                    raise BGGApiError("malformed XML element ('link type=boardgameexpansion')")
+
+                if e.attrib.get("inbound", "false").lower()[0] == 't':
+                    # this is an item expanded by game_id
+                    expands.append(item)
+                else:
+                    expansions.append(item)
+                continue
+
+            if link_type not in link_fields:
+                continue
+
+            names, ids = link_fields[link_type]
+            try:
+                ids.append(int(e.attrib["id"]))
+            except (KeyError, ValueError):
+                raise BGGApiError("malformed XML element ('link type={}')".format(link_type))
+            names.append(intern_string(e.attrib.get("value")))
 
     # These XML elements have a numberic value, attempt to convert them to integers
-    for i in ["yearpublished", "minplayers", "maxplayers", "playingtime", "minplaytime", "maxplaytime", "minage"]:
-        data[i] = xml_subelement_attr(xml_root, i, convert=int, quiet=True)
+    for field, element in NUMERIC_FIELDS:
+        if field in fields:
+            data[element] = xml_subelement_attr(xml_root, element, convert=int, quiet=True)
 
     # Look for the videos
     # TODO: The BGG API doesn't take the page=NNN parameter into account for videos; when it does, paginate them too
-    videos = xml_root.find("videos")
+    videos = xml_root.find("videos") if "videos" in fields else None
     if videos is not None:
         vid_list = []
         for vid in videos.findall("video"):
             try:
                 vd = {"id": vid.attrib["id"],
                       "name": vid.attrib["title"],
-                      "category": vid.attrib.get("category"),
-                      "language": vid.attrib.get("language"),
+                      "category": intern_string(vid.attrib.get("category")),
+                      "language": intern_string(vid.attrib.get("language")),
                       "link": vid.attrib["link"],
                       "uploader": vid.attrib.get("username"),
                       "uploader_id": vid.attrib.get("userid"),
@@ -74,7 +150,7 @@ def create_game_from_xml(xml_root, game_id):
         data["videos"] = vid_list
 
     # look for the versions
-    versions = xml_root.find("versions")
+    versions = xml_root.find("versions") if "versions" in fields else None
     if versions is not None:
         ver_list = []
 
@@ -113,14 +189,16 @@ def create_game_from_xml(xml_root, game_id):
             except:
                 rank_value = None
             sd["ranks"].append({"id": rank.attrib["id"],
-                                "name": rank.attrib["name"],
-                                "friendlyname": rank.attrib.get("friendlyname"),
+                                "name": intern_string(rank.attrib["name"]),
+                                "friendlyname": intern_string(rank.attrib.get("friendlyname")),
                                 "value": rank_value})
 
         data["stats"] = sd
         data["suggested_players"] = {}
 
-        suggested_players_poll = xml_root.find("poll[@name='suggested_numplayers']")
+        suggested_players_poll = None
+        if "player_suggestions" in fields:
+            suggested_players_poll = xml_root.find("poll[@name='suggested_numplayers']")
         if suggested_players_poll is not None:
             dsp = data["suggested_players"]
             dsp.update({"total_votes": int(suggested_players_poll.attrib.get("totalvotes", 0)),
@@ -148,22 +226,71 @@ def create_game_from_xml(xml_root, game_id):
     return BoardGame(data)
 
 
-def add_game_comments_from_xml(game, xml_root):
+def parse_game_comments_xml(xml):
+    """
+    Parses a /thing response, keeping only its ``<comments>``: the game's data (which is repeated on every page of
+    comments) is dropped while parsing
+
+    :param xml: the /thing response, text or UTF-8 encoded
+    :return: an ``<item>`` element containing only the ``<comments>``, see :py:func:`add_game_comments_from_xml`
+    :rtype: :py:class:`xml.etree.ElementTree.Element`
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response isn't a game (e.g. an error message)
+    :raises: :py:exc:`xml.etree.ElementTree.ParseError` if the response isn't valid XML (e.g. it was truncated)
+    """
+    if not isinstance(xml, bytes):
+        xml = xml.encode("utf-8")
+
+    item = ET.Element("item")
+    found_item = False
+    in_comments = 0
+
+    for event, elem in ET.iterparse(io.BytesIO(xml), events=("start", "end")):
+        if event == "start":
+            if not found_item:
+                if elem.tag == "item":
+                    found_item = True
+                elif elem.tag != "items":
+                    raise BGGApiError("unexpected response: <{}>".format(elem.tag))
+            elif elem.tag == "comments":
+                in_comments += 1
+            continue
+
+        if elem.tag == "comments":
+            in_comments -= 1
+            if not in_comments:
+                item.append(elem)
+        elif not in_comments and elem.tag not in ("item", "items"):
+            # not needed, free it right away
+            elem.clear()
+
+    if not found_item:
+        raise BGGApiError("missing item in response")
+
+    return item
 
-    added_items = False
-    total_comments = 0
 
+def load_game_comments_from_xml(xml_root):
+    """
+    Loads the comments of a page
+
+    :param xml_root: the ``<item>`` containing the ``<comments>``
+    :return: (list of comments data, total number of comments)
+    :rtype: tuple
+    """
     comments = xml_root.find("comments")
-    if comments is not None:
-        total_comments = int(comments.attrib["totalitems"])
-
-        for comm in xml_root.findall("comments/comment"):
-            comment = {
-                "username": comm.attrib["username"],
-                "rating": comm.attrib.get("rating", "n/a").lower(),
-                "comment": comm.attrib.get("value", "n/a")
-            }
-            added_items = True
-            game.add_comment(comment)
-
-    return added_items, total_comments
+    if comments is None:
+        return [], 0
+
+    return [{"username": comm.attrib["username"],
+             "rating": comm.attrib.get("rating", "n/a").lower(),
+             "comment": comm.attrib.get("value", "n/a")} for comm in comments.findall("comment")], \
+        int(comments.attrib["totalitems"])
+
+
+def add_game_comments_from_xml(game, xml_root):
+
+    comments, total_comments = load_game_comments_from_xml(xml_root)
+    for comment in comments:
+        game.add_comment(comment)
+
+    return bool(comments), total_comments
@@ -3,7 +3,7 @@ from ..utils import xml_subelement_attr
 
 
 def create_hot_items_from_xml(xml_root):
-    return HotItems({})
+    return HotItems._from_owned({})
 
 
 def add_hot_items_from_xml(hot_items, xml_root):
@@ -16,7 +16,7 @@ def add_hot_items_from_xml(hot_items, xml_root):
                   "yearpublished": xml_subelement_attr(item, "yearpublished", convert=int, quiet=True),
                   "thumbnail": xml_subelement_attr(item, "thumbnail")}
 
-        hot_items.add_hot_item(kwargs)
+        hot_items._add_hot_item(kwargs)
         added_items = True
 
     return added_items
@@ -1,6 +1,6 @@
 import logging
 
-from ..objects.plays import UserPlays, GamePlays
+from ..objects.plays import UserPlays, GamePlays, PlaysTable
 from ..exceptions import BGGItemNotFoundError
 from ..utils import xml_subelement_text, xml_subelement_attr
 
@@ -8,7 +8,7 @@ from ..utils import xml_subelement_text, xml_subelement_attr
 log = logging.getLogger("boardgamegeek.loaders.plays")
 
 
-def create_plays_from_xml(xml_root, game_id=None):
+def create_plays_from_xml(xml_root, game_id=None, columnar=False):
 
     count = 0
     try:
@@ -24,11 +24,18 @@ def create_plays_from_xml(xml_root, game_id=None):
 
     if game_id is None:
         # User's plays
-        return UserPlays({"username": xml_root.attrib["username"],
-                          "user_id": int(xml_root.attrib["userid"]),
-                          "plays_count": count})
+        data = {"username": xml_root.attrib["username"],
+                "user_id": int(xml_root.attrib["userid"]),
+                "plays_count": count}
+        plays_class = UserPlays
     else:
-        return GamePlays({"game_id": game_id, "plays_count": count})
+        data = {"game_id": game_id, "plays_count": count}
+        plays_class = GamePlays
+
+    if columnar:
+        plays_class = PlaysTable
+
+    return plays_class._from_owned(data)
 
 
 def add_plays_from_xml(plays, xml_root):
@@ -66,7 +73,7 @@ def add_plays_from_xml(plays, xml_root):
                 "comment": xml_subelement_text(play, "comments"),
                 "players": player_list}
 
-        plays.add_play(data)
+        plays._add_play(data)
         added_items = True
 
     return added_items
@@ -12,6 +12,8 @@
 """
 from __future__ import unicode_literals
 
+from array import array
+from bisect import bisect_right
 from copy import copy
 
 from ..exceptions import BGGError
@@ -27,10 +29,12 @@ class Collection(DictObject):
     :raises: :py:class:`boardgamegeek.exceptions.BoardGameGeekError` in case of invalid data
     """
     def __init__(self, data):
-        kw = copy(data)
+        self._setup(copy(data))
 
+    def _setup(self, kw):
         self._items = []
         self.__game_ids = set()
+        self._columns = None
 
         for game in kw.get("items", []):
             self.add_game(game)
@@ -60,6 +64,7 @@ class Collection(DictObject):
             if game["id"] not in self.__game_ids:
                 self.__game_ids.add(game["id"])
                 self._items.append(CollectionBoardGame(game))
+                self._columns = None
         except KeyError:
             raise BGGError("invalid game data")
 
@@ -98,3 +103,203 @@ class Collection(DictObject):
     def __iter__(self):
         for item in self._items:
             yield item
+
+    def filter_by_status(self, include=0, exclude=0):
+        """
+        Returns the items having all the ``include`` status flags set and none of the ``exclude`` ones. For example,
+        the owned games which aren't for trade:
+
+        ``collection.filter_by_status(include=BGGCollectionStatus.OWN, exclude=BGGCollectionStatus.FOR_TRADE)``
+
+        :param int include: combination of :py:class:`boardgamegeek.games.BGGCollectionStatus` flags which must be set
+        :param int exclude: combination of :py:class:`boardgamegeek.games.BGGCollectionStatus` flags which must not
+                            be set
+        :returns: the matching items
+        :rtype: list of :py:class:`boardgamegeek.games.CollectionBoardGame`
+        """
+        return [item for item in self._items if item.status & include == include and not item.status & exclude]
+
+    def count_by_status(self, include=0, exclude=0):
+        """
+        Returns the number of items having all the ``include`` status flags set and none of the ``exclude`` ones.
+        See :py:meth:`filter_by_status`.
+
+        :rtype: integer
+        """
+        return sum(1 for item in self._items if item.status & include == include and not item.status & exclude)
+
+    def to_columns(self):
+        """
+        Returns a columnar view of the collection, with the status flags and the statistics of all the items decoded
+        into typed arrays. The view is computed once and reused until the collection changes.
+
+        :returns: the columnar view of the collection
+        :rtype: :py:class:`boardgamegeek.collection.CollectionColumns`
+        """
+        if self._columns is None:
+            self._columns = CollectionColumns(self._items)
+        return self._columns
+
+
+class CollectionColumns(object):
+    """
+    Columnar view of the items of one or more collections.
+
+    Every column is an :py:class:`array.array` with one entry per item, accessible by name (e.g. ``columns["owned"]``).
+    The arrays support the buffer protocol, so they can be used without copying by libraries such as NumPy. Missing
+    numeric values are stored as 0, except for the ratings, which use NaN.
+
+    :param items: the items to include
+    :type items: list of :py:class:`boardgamegeek.games.CollectionBoardGame`
+    """
+
+    #: status flag columns (1 if set, 0 otherwise) and the item properties they are decoded from
+    FLAG_COLUMNS = (("owned", "owned"),
+                    ("preordered", "preordered"),
+                    ("prev_owned", "prev_owned"),
+                    ("want", "want"),
+                    ("want_to_buy", "want_to_buy"),
+                    ("want_to_play", "want_to_play"),
+                    ("for_trade", "for_trade"),
+                    ("wishlist", "wishlist"))
+
+    #: integer columns and the item properties they are decoded from
+    INT_COLUMNS = (("ids", "id"),
+                   ("statuses", "status"),
+                   ("years", "year"),
+                   ("numplays", "numplays"),
+                   ("min_players", "min_players"),
+                   ("max_players", "max_players"),
+                   ("playing_times", "playing_time"),
+                   ("min_playing_times", "min_playing_time"),
+                   ("max_playing_times", "max_playing_time"),
+                   ("bgg_ranks", "bgg_rank"),
+                   ("users_rated", "users_rated"))
+
+    #: floating point columns and the item properties they are decoded from
+    FLOAT_COLUMNS = (("ratings", "rating"),
+                     ("rating_averages", "rating_average"),
+                     ("rating_bayes_averages", "rating_bayes_average"))
+
+    def __init__(self, items=()):
+        self._columns = {}
+
+        for name, _ in self.FLAG_COLUMNS:
+            self._columns[name] = array("b")
+        for name, _ in self.INT_COLUMNS:
+            self._columns[name] = array("l")
+        for name, _ in self.FLOAT_COLUMNS:
+            self._columns[name] = array("d")
+
+        for item in items:
+            self._add_item(item)
+
+    def _add_item(self, item):
+        for name, prop in self.FLAG_COLUMNS:
+            self._columns[name].append(1 if getattr(item, prop) else 0)
+
+        for name, prop in self.INT_COLUMNS:
+            value = getattr(item, prop)
+            self._columns[name].append(value if value is not None else 0)
+
+        for name, prop in self.FLOAT_COLUMNS:
+            value = getattr(item, prop)
+            self._columns[name].append(value if value is not None else float("nan"))
+
+    @classmethod
+    def concatenate(cls, columns_list):
+        """
+        Combines the columnar views of several collections (e.g. of different users) into one.
+
+        :param columns_list: the views to combine
+        :type columns_list: list of :py:class:`boardgamegeek.collection.CollectionColumns`
+        :returns: a view containing the items of all the views
+        :rtype: :py:class:`boardgamegeek.collection.CollectionColumns`
+        """
+        result = cls()
+        for columns in columns_list:
+            for name, column in result._columns.items():
+                column.extend(columns[name])
+        return result
+
+    @property
+    def names(self):
+        """
+        :returns: the names of the columns
+        :rtype: list of str
+        """
+        return sorted(self._columns)
+
+    def __getitem__(self, name):
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise BGGError("invalid column: {}".format(name))
+
+    def __len__(self):
+        return len(self._columns["ids"])
+
+    def count(self, flag):
+        """
+        :param str flag: name of a status flag column (e.g. ``"owned"``)
+        :returns: number of items having the status flag set
+        :rtype: integer
+        """
+        if flag not in dict(self.FLAG_COLUMNS):
+            raise BGGError("invalid status flag: {}".format(flag))
+        return sum(self._columns[flag])
+
+    def rating_histogram(self, column="ratings"):
+        """
+        Histogram of the ratings, in buckets of 1 point (the first bucket counts ratings between 1 and 2, the last
+        one the ratings of 10). Items without a rating aren't counted.
+
+        :param str column: which ratings to use (``"ratings"``, ``"rating_averages"`` or ``"rating_bayes_averages"``)
+        :returns: number of ratings in each of the 10 buckets
+        :rtype: list of integers
+        """
+        if column not in dict(self.FLOAT_COLUMNS):
+            raise BGGError("invalid rating column: {}".format(column))
+
+        histogram = [0] * 10
+        for rating in self._columns[column]:
+            if rating == rating:    # not NaN
+                histogram[min(max(int(rating), 1), 10) - 1] += 1
+        return histogram
+
+    def playing_time_distribution(self, bounds=(30, 60, 90, 120, 180, 240)):
+        """
+        Distribution of the playing times. Items without a playing time aren't counted.
+
+        :param bounds: sorted upper (exclusive) bounds of the buckets
+        :type bounds: list of integers
+        :returns: number of items in each bucket: below ``bounds[0]``, between ``bounds[0]`` and ``bounds[1]``, ...
+                  and from ``bounds[-1]`` on
+        :rtype: list of integers
+        """
+        distribution = [0] * (len(bounds) + 1)
+        for playing_time in self._columns["playing_times"]:
+            if playing_time > 0:
+                distribution[bisect_right(bounds, playing_time)] += 1
+        return distribution
+
+    def rank_percentiles(self, percentiles=(25, 50, 75)):
+        """
+        Percentiles of the BGG ranks of the (ranked) items, using the nearest-rank method
+
+        :param percentiles: the percentiles to compute, between 0 and 100
+        :type percentiles: list of numbers
+        :returns: the rank at each percentile
+        :rtype: list of integers
+        :return: ``None`` for each percentile if no item is ranked
+        """
+        ranks = sorted(rank for rank in self._columns["bgg_ranks"] if rank > 0)
+        result = []
+        for p in percentiles:
+            if not ranks:
+                result.append(None)
+            else:
+                # nearest-rank: the smallest value such that p% of the values are less or equal to it
+                position = max(int(-(-p * len(ranks) // 100)), 1)
+                result.append(ranks[min(position, len(ranks)) - 1])
+        return result
@@ -13,14 +13,108 @@
 from __future__ import unicode_literals
 
 import datetime
+from array import array
+from collections import namedtuple
 from copy import copy
 
 from .things import Thing
-from ..exceptions import BGGError
-from ..utils import fix_url, DictObject, fix_unsigned_negative
+from ..exceptions import BGGError, BGGValueError
+from ..utils import fix_url, DictObject, fix_unsigned_negative, lazy_unescape
+
+
+class BGGCollectionStatus(object):
+    """
+    Flags describing the status of an item in an user's collection. They can be combined, e.g. ``OWN | FOR_TRADE``.
+    """
+    OWN = 1 << 0
+    PREORDERED = 1 << 1
+    PREV_OWNED = 1 << 2
+    WANT = 1 << 3
+    WANT_TO_BUY = 1 << 4
+    WANT_TO_PLAY = 1 << 5
+    FOR_TRADE = 1 << 6
+    WISHLIST = 1 << 7
+
+
+# the fields of a game holding links to other BGG items, and the type of the <link> elements they're read from
+LINK_TYPES = (("families", "boardgamefamily"),
+              ("categories", "boardgamecategory"),
+              ("implementations", "boardgameimplementation"),
+              ("mechanics", "boardgamemechanic"),
+              ("designers", "boardgamedesigner"),
+              ("artists", "boardgameartist"),
+              ("publishers", "boardgamepublisher"))
+
+# name of each status field, as returned by the BGG API, and the corresponding flag
+COLLECTION_STATUS_FIELDS = (("own", BGGCollectionStatus.OWN),
+                            ("preordered", BGGCollectionStatus.PREORDERED),
+                            ("prevowned", BGGCollectionStatus.PREV_OWNED),
+                            ("want", BGGCollectionStatus.WANT),
+                            ("wanttobuy", BGGCollectionStatus.WANT_TO_BUY),
+                            ("wanttoplay", BGGCollectionStatus.WANT_TO_PLAY),
+                            ("fortrade", BGGCollectionStatus.FOR_TRADE),
+                            ("wishlist", BGGCollectionStatus.WISHLIST))
+
+
+def decode_collection_status(data):
+    """
+    Decodes the status fields of a collection item (``"own"``, ``"fortrade"``, etc., having values like ``"0"`` or
+    ``"1"``) into a bitmask
+
+    :param dict data: dictionary containing the status fields
+    :return: combination of :py:class:`boardgamegeek.games.BGGCollectionStatus` flags
+    :rtype: integer
+    """
+    flags = 0
+    for field, flag in COLLECTION_STATUS_FIELDS:
+        try:
+            if int(data.get(field, 0)):
+                flags |= flag
+        except (TypeError, ValueError):
+            pass
+    return flags
+
+
+def _unique_objects(items, cls, error):
+    """
+    Creates objects of type ``cls`` out of the ``items`` dicts, ignoring duplicate ids
+
+    :param list items: items' data
+    :param cls: type of the objects to create
+    :param str error: message of the exception raised if an item has no id
+    :return: the objects and the set of their ids
+    :rtype: tuple
+    :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekError` if an item has no id
+    """
+    objects = []
+    ids = set()
+    for item in items:
+        try:
+            if item["id"] not in ids:
+                ids.add(item["id"])
+                objects.append(cls(item))
+        except KeyError:
+            raise BGGError(error)
+    return objects, ids
+
+
+class BoardGameLink(namedtuple("BoardGameLink", ["id", "name"])):
+    """
+    Link of a game to another BGG item (a family, a category, a mechanic, a designer, etc.): the item's id and name
+    """
+    __slots__ = ()
+
+
+class BoardGameCommentsCursor(namedtuple("BoardGameCommentsCursor", ["page", "count"])):
+    """
+    Position in the comments of a game: ``count`` comments were read, the next one is on page ``page``
+    """
+    __slots__ = ()
 
 
 class BoardGameRank(Thing):
+    __slots__ = ()
+
     @property
     def type(self):
         return self._data.get("type")
@@ -38,12 +132,29 @@ class BoardGameRank(Thing):
         return self._data.get("bayesaverage")
 
 
+def numeric_player_count(player_count):
+    """
+    Converts a player count from the suggested number of players poll to an int. A count ending with a ``+``
+    (e.g. ``"5+"``) means more players, so one is added to it.
+
+    :param str player_count: the player count
+    :rtype: integer
+    :raises: :py:exc:`ValueError` if the player count is invalid
+    """
+    if player_count.endswith("+"):
+        return int(player_count[:-1]) + 1
+    return int(player_count)
+
+
 class PlayerSuggestion(DictObject):
     """
     Player Suggestion
     """
+    __slots__ = ("_numeric_player_count",)
+
     def __init__(self, data):
         super(PlayerSuggestion, self).__init__(data)
+        self._numeric_player_count = None
 
     @property
     def numeric_player_count(self):
@@ -52,26 +163,28 @@ class PlayerSuggestion(DictObject):
         If player count contains a + symbol
         then add one to the player count
         """
-        if "+" in self.player_count:
-            return int(self.player_count[:-1]) + 1
-        else:
-            return int(self.player_count)
+        if self._numeric_player_count is None:
+            self._numeric_player_count = numeric_player_count(self.player_count)
+        return self._numeric_player_count
 
 
 class BoardGameStats(DictObject):
     """
     Statistics about a board game
     """
+    __slots__ = ("_ranks", "_bgg_rank")
+
     def __init__(self, data):
-        self._ranks = []
+        self._ranks = None                  # created on first access
+        self._bgg_rank = None
 
         for rank in data.get("ranks", []):
             if rank.get("name") == "boardgame":
                 try:
                     self._bgg_rank = int(rank["value"])
-                except (KeyError, TypeError):
+                except (KeyError, TypeError, ValueError):
+                    # e.g. "Not Ranked"
                     self._bgg_rank = None
-            self._ranks.append(BoardGameRank(rank))
 
         super(BoardGameStats, self).__init__(data)
 
@@ -81,6 +194,8 @@ class BoardGameStats(DictObject):
 
     @property
     def ranks(self):
+        if self._ranks is None:
+            self._ranks = [BoardGameRank(rank) for rank in self._data.get("ranks", [])]
         return self._ranks
 
     @property
@@ -193,6 +308,7 @@ class BoardGameStats(DictObject):
 
 
 class BoardGameComment(DictObject):
+    __slots__ = ()
 
     @property
     def commenter(self):
@@ -416,6 +532,7 @@ class BoardGameVersion(Thing):
 
 
 class BaseGame(Thing):
+    __slots__ = ("_thumbnail", "_image", "_stats", "_versions", "_year_published")
 
     def __init__(self, data):
 
@@ -426,24 +543,23 @@ class BaseGame(Thing):
 
         self._stats = BoardGameStats(data["stats"])
 
-        self._versions = []
-        self._versions_set = set()
+        # the versions are only created when first accessed
+        self._versions = None
 
         try:
             self._year_published = fix_unsigned_negative(data["yearpublished"])
         except:
             self._year_published = None
 
-        for version in data.get("versions", []):
-            try:
-                if version["id"] not in self._versions_set:
-                    self._versions.append(BoardGameVersion(version))
-                    self._versions_set.add(version["id"])
-            except KeyError:
-                raise BGGError("invalid version data")
-
         super(BaseGame, self).__init__(data)
 
+    def _get_versions(self):
+        if self._versions is None:
+            self._versions, _ = _unique_objects(self._data.get("versions", []),
+                                                BoardGameVersion,
+                                                "invalid version data")
+        return self._versions
+
     @property
     def thumbnail(self):
         """
@@ -593,10 +709,15 @@ class CollectionBoardGame(BaseGame):
     A boardgame retrieved from the collection information, which has less information than the one retrieved
     via the /thing api and which also contains some user-specific information.
     """
+    __slots__ = ("_status",)
 
     def __init__(self, data):
         super(CollectionBoardGame, self).__init__(data)
 
+        # the loaders decode the status once, while parsing; decode it here for other callers
+        status = data.get("status_flags")
+        self._status = status if status is not None else decode_collection_status(data)
+
     def __repr__(self):
         return "CollectionBoardGame (id: {})".format(self.id)
 
@@ -616,7 +737,7 @@ class CollectionBoardGame(BaseGame):
         log.info("wishlist priority : {}".format(self.wishlist_priority))
         log.info("for trade         : {}".format(self.for_trade))
         log.info("comment           : {}".format(self.comment))
-        for v in self._versions:
+        for v in self._get_versions():
             v._format(log)
 
     @property
@@ -634,8 +755,9 @@ class CollectionBoardGame(BaseGame):
 
     @property
     def version(self):
-        if len(self._versions):
-            return self._versions[0]
+        versions = self._get_versions()
+        if len(versions):
+            return versions[0]
         else:
             return None
 
@@ -652,13 +774,21 @@ class CollectionBoardGame(BaseGame):
         """
         return self._data.get("rating")
 
+    @property
+    def status(self):
+        """
+        :return: status of the game in the collection
+        :rtype: integer, a combination of :py:class:`boardgamegeek.games.BGGCollectionStatus` flags
+        """
+        return self._status
+
     @property
     def owned(self):
         """
         :return: game owned
         :rtype: bool
         """
-        return bool(int(self._data.get("own", 0)))
+        return bool(self._status & BGGCollectionStatus.OWN)
 
     @property
     def preordered(self):
@@ -666,7 +796,7 @@ class CollectionBoardGame(BaseGame):
         :return: game preordered
         :rtype: bool
         """
-        return bool(int(self._data.get("preordered", 0)))
+        return bool(self._status & BGGCollectionStatus.PREORDERED)
 
     @property
     def prev_owned(self):
@@ -674,7 +804,7 @@ class CollectionBoardGame(BaseGame):
         :return: game previously owned
         :rtype: bool
         """
-        return bool(int(self._data.get("prevowned", 0)))
+        return bool(self._status & BGGCollectionStatus.PREV_OWNED)
 
     @property
     def want(self):
@@ -682,7 +812,7 @@ class CollectionBoardGame(BaseGame):
         :return: game wanted
         :rtype: bool
         """
-        return bool(int(self._data.get("want", 0)))
+        return bool(self._status & BGGCollectionStatus.WANT)
 
     @property
     def want_to_buy(self):
@@ -690,7 +820,7 @@ class CollectionBoardGame(BaseGame):
         :return: want to buy
         :rtype: bool
         """
-        return bool(int(self._data.get("wanttobuy", 0)))
+        return bool(self._status & BGGCollectionStatus.WANT_TO_BUY)
 
     @property
     def want_to_play(self):
@@ -698,7 +828,7 @@ class CollectionBoardGame(BaseGame):
         :return: want to play
         :rtype: bool
         """
-        return bool(int(self._data.get("wanttoplay", 0)))
+        return bool(self._status & BGGCollectionStatus.WANT_TO_PLAY)
 
     @property
     def for_trade(self):
@@ -706,7 +836,7 @@ class CollectionBoardGame(BaseGame):
         :return: game for trading
         :rtype: bool
         """
-        return bool(int(self._data.get("fortrade", 0)))
+        return bool(self._status & BGGCollectionStatus.FOR_TRADE)
 
     @property
     def wishlist(self):
@@ -714,7 +844,7 @@ class CollectionBoardGame(BaseGame):
         :return: game on wishlist
         :rtype: bool
         """
-        return bool(int(self._data.get("wishlist", 0)))
+        return bool(self._status & BGGCollectionStatus.WISHLIST)
 
     @property
     def wishlist_priority(self):
@@ -734,53 +864,43 @@ class BoardGame(BaseGame):
     """
     Object containing information about a board game
     """
+    #: fields holding the links to other BGG items, see :py:meth:`links`
+    LINK_FIELDS = tuple(field for field, _ in LINK_TYPES)
+
     def __init__(self, data):
 
-        self._expansions = []                      # list of Thing for the expansions
-        self._expansions_set = set()               # set for making sure things are unique
-        for exp in data.get("expansions", []):
-            try:
-                if exp["id"] not in self._expansions_set:
-                    self._expansions_set.add(exp["id"])
-                    self._expansions.append(Thing(exp))
-            except KeyError:
-                raise BGGError("invalid expansion data")
-
-        self._expands = []                         # list of Thing which this item expands
-        self._expands_set = set()                  # set for keeping things unique
-        for exp in data.get("expands", []):        # for all the items this game expands, create a Thing
-            try:
-                if exp["id"] not in self._expands_set:
-                    self._expands_set.add(exp["id"])
-                    self._expands.append(Thing(exp))
-            except KeyError:
-                raise BGGError("invalid expanded game data")
-
-        self._videos = []
-        self._videos_ids = set()
-        for video in data.get("videos", []):
-            try:
-                if video["id"] not in self._videos_ids:
-                    self._videos.append(BoardGameVideo(video))
-                    self._videos_ids.add(video["id"])
-            except KeyError:
-                raise BGGError("invalid video data")
+        # the expansions, expanded games, videos and player suggestions are only created when first accessed, most
+        # callers never look at them
+        self._expansions = None                    # list of Thing for the expansions
+        self._expansions_set = None                # set for making sure things are unique
+        self._expands = None                       # list of Thing which this item expands
+        self._expands_set = None                   # set for keeping things unique
+        self._videos = None
+        self._player_suggestion = None
+        self._player_count_votes = None             # votes of the suggested number of players poll
+        self._best_player_counts = None
+        self._recommended_player_counts = None
 
         self._comments = []
         for comment in data.get("comments", []):
             self.add_comment(comment)
 
-        self._player_suggestion = []
-        if "suggested_players" in data and "results" in data["suggested_players"]:
-            for count, result in data["suggested_players"]["results"].items():
-                suggestion_data = {"player_count": count,
-                                   "best": result["best_rating"],
-                                   "recommended": result["recommended_rating"],
-                                   "not_recommended": result["not_recommended_rating"]}
-                self._player_suggestion.append(PlayerSuggestion(suggestion_data))
-
         super(BoardGame, self).__init__(data)
 
+    def _get_expansions(self):
+        if self._expansions is None:
+            self._expansions, self._expansions_set = _unique_objects(self._data.get("expansions", []),
+                                                                     Thing,
+                                                                     "invalid expansion data")
+        return self._expansions
+
+    def _get_expands(self):
+        if self._expands is None:
+            self._expands, self._expands_set = _unique_objects(self._data.get("expands", []),
+                                                               Thing,
+                                                               "invalid expanded game data")
+        return self._expands
+
     def __repr__(self):
         return "BoardGame (id: {})".format(self.id)
 
@@ -794,11 +914,12 @@ class BoardGame(BaseGame):
         :param dict data: expanded game's data
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekError` if data is invalid
         """
+        expands = self._get_expands()
         try:
             if data["id"] not in self._expands_set:
                 self._data["expands"].append(data)
                 self._expands_set.add(data["id"])
-                self._expands.append(Thing(data))
+                expands.append(Thing(data))
         except KeyError:
             raise BGGError("invalid expanded game data")
 
@@ -809,11 +930,12 @@ class BoardGame(BaseGame):
         :param dict data: expansion data
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekError` if data is invalid
         """
+        expansions = self._get_expansions()
         try:
             if data["id"] not in self._expansions_set:
                 self._data["expansions"].append(data)
                 self._expansions_set.add(data["id"])
-                self._expansions.append(Thing(data))
+                expansions.append(Thing(data))
         except KeyError:
             raise BGGError("invalid expansion data")
 
@@ -928,7 +1050,16 @@ class BoardGame(BaseGame):
         :return: description
         :rtype: str
         """
-        return self._data.get("description", "")
+        return lazy_unescape(self._data, "description", default="")
+
+    @property
+    def description_escaped(self):
+        """
+        :return: description, HTML-escaped, as returned by the BGG API
+        :rtype: str
+        :return: ``None`` if n/a
+        """
+        return self._data.get("description_escaped")
 
     @property
     def families(self):
@@ -964,7 +1095,7 @@ class BoardGame(BaseGame):
         :return: expansions
         :rtype: list of :py:class:`boardgamegeek.things.Thing`
         """
-        return self._expansions
+        return self._get_expansions()
 
     @property
     def expands(self):
@@ -972,7 +1103,7 @@ class BoardGame(BaseGame):
         :return: games this item expands
         :rtype: list of :py:class:`boardgamegeek.things.Thing`
         """
-        return self._expands
+        return self._get_expands()
 
     @property
     def implementations(self):
@@ -1006,6 +1137,31 @@ class BoardGame(BaseGame):
         """
         return self._data.get("publishers", [])
 
+    def links(self, field):
+        """
+        Returns the links of this game to other BGG items, with their ids
+
+        :param str field: one of :py:attr:`LINK_FIELDS`, e.g. ``"mechanics"``
+        :return: the links; empty if their ids are unknown
+        :rtype: list of :py:class:`boardgamegeek.games.BoardGameLink`
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if ``field`` is invalid
+        """
+        return [BoardGameLink(link_id, name) for link_id, name in zip(self.link_ids(field),
+                                                                      self._data.get(field, []))]
+
+    def link_ids(self, field):
+        """
+        Returns the ids of the BGG items this game is linked to
+
+        :param str field: one of :py:attr:`LINK_FIELDS`, e.g. ``"mechanics"``
+        :return: the ids, in the same order as the names (e.g. :py:attr:`mechanics`); empty if unknown
+        :rtype: list of integers
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if ``field`` is invalid
+        """
+        if field not in self.LINK_FIELDS:
+            raise BGGValueError("invalid link field: {}".format(field))
+        return self._data.get(field + "_ids", [])
+
     @property
     def expansion(self):
         """
@@ -1100,6 +1256,8 @@ class BoardGame(BaseGame):
         :return: videos of this game
         :rtype: list of :py:class:`boardgamegeek.game.BoardGameVideo`
         """
+        if self._videos is None:
+            self._videos, _ = _unique_objects(self._data.get("videos", []), BoardGameVideo, "invalid video data")
         return self._videos
 
     @property
@@ -1108,7 +1266,7 @@ class BoardGame(BaseGame):
         :return: versions of this game
         :rtype: list of :py:class:`boardgamegeek.game.BoardGameVersion`
         """
-        return self._versions
+        return self._get_versions()
 
     @property
     def player_suggestions(self):
@@ -1116,4 +1274,68 @@ class BoardGame(BaseGame):
         :return player suggestion list with votes
         :rtype: list of dicts
         """
+        if self._player_suggestion is None:
+            self._player_suggestion = []
+            for count, result in self._data.get("suggested_players", {}).get("results", {}).items():
+                suggestion_data = {"player_count": count,
+                                   "best": result["best_rating"],
+                                   "recommended": result["recommended_rating"],
+                                   "not_recommended": result["not_recommended_rating"]}
+                self._player_suggestion.append(PlayerSuggestion(suggestion_data))
         return self._player_suggestion
+
+    def _get_player_count_votes(self):
+        # the poll's votes, as arrays of "best", "recommended" and "not recommended" votes indexed by player count
+        if self._player_count_votes is None:
+            votes = {}
+            for count, result in self._data.get("suggested_players", {}).get("results", {}).items():
+                try:
+                    votes[numeric_player_count(count)] = result
+                except ValueError:
+                    continue
+
+            size = max(votes) + 1 if votes else 0
+            self._player_count_votes = tuple(array("l", [votes[n][kind] if n in votes else 0 for n in range(size)])
+                                             for kind in ["best_rating",
+                                                          "recommended_rating",
+                                                          "not_recommended_rating"])
+        return self._player_count_votes
+
+    def player_count_votes(self, count):
+        """
+        Returns the votes of the suggested number of players poll for a number of players
+
+        :param int count: the number of players
+        :return: the number of "best", "recommended" and "not recommended" votes
+        :rtype: tuple of integers
+        """
+        best, recommended, not_recommended = self._get_player_count_votes()
+        if 0 <= count < len(best):
+            return best[count], recommended[count], not_recommended[count]
+        return 0, 0, 0
+
+    @property
+    def best_player_counts(self):
+        """
+        :return: the numbers of players for which most voters said the game is best
+        :rtype: frozenset of integers
+        """
+        if self._best_player_counts is None:
+            best, recommended, not_recommended = self._get_player_count_votes()
+            self._best_player_counts = frozenset(n for n in range(len(best))
+                                                 if best[n] and best[n] >= recommended[n] and
+                                                 best[n] >= not_recommended[n])
+        return self._best_player_counts
+
+    @property
+    def recommended_player_counts(self):
+        """
+        :return: the numbers of players for which the game is recommended by most voters ("best" and "recommended"
+                 votes outnumbering the "not recommended" ones)
+        :rtype: frozenset of integers
+        """
+        if self._recommended_player_counts is None:
+            best, recommended, not_recommended = self._get_player_count_votes()
+            self._recommended_player_counts = frozenset(n for n in range(len(best))
+                                                        if best[n] + recommended[n] > not_recommended[n])
+        return self._recommended_player_counts
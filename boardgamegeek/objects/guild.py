@@ -15,6 +15,7 @@ from __future__ import unicode_literals
 from copy import copy
 
 from .things import Thing
+from ..utils import lazy_unescape
 
 
 class Guild(Thing):
@@ -153,7 +154,16 @@ class Guild(Thing):
         :rtype: str
         :return: ``None`` if n/a
         """
-        return self._data.get("description")
+        return lazy_unescape(self._data, "description")
+
+    @property
+    def description_escaped(self):
+        """
+        :return: description, HTML-escaped, as returned by the BGG API
+        :rtype: str
+        :return: ``None`` if n/a
+        """
+        return self._data.get("description_escaped")
 
     @property
     def manager(self):
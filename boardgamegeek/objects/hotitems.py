@@ -25,15 +25,19 @@ class HotItem(Thing):
     ``boardgameperson``) or even a company (``boardgamecompany``, ``videogamecompany``), depending on the type of hot
     list retrieved.
     """
+    __slots__ = ()
 
     def __init__(self, data):
-        if "rank" not in data:
+        self._setup(copy(data))
+
+    def _setup(self, kw):
+        if "rank" not in kw:
             raise BGGError("missing rank of HotItem")
 
-        if "thumbnail" in data:
-            data["thumbnail"] = fix_url(data["thumbnail"])
+        if "thumbnail" in kw:
+            kw["thumbnail"] = fix_url(kw["thumbnail"])
 
-        super(HotItem, self).__init__(data)
+        super(HotItem, self).__init__(kw)
 
     def __repr__(self):
         return "HotItem (id: {})".format(self.id)
@@ -77,9 +81,11 @@ class HotItems(DictObject):
     A collection of :py:class:`boardgamegeek.hotitems.HotItem`
     """
     def __init__(self, data):
-        kw = copy(data)
-        if "items" not in kw:
-            kw["items"] = []
+        self._setup(copy(data))
+
+    def _setup(self, kw):
+        # don't append to the caller's list when adding items
+        kw["items"] = list(kw.get("items", []))
 
         self._items = []
         for data in kw["items"]:
@@ -93,8 +99,13 @@ class HotItems(DictObject):
 
         :param data: dictionary containing the data
         """
+        self._add_hot_item(copy(data))
+
+    def _add_hot_item(self, data):
+        # takes ownership of data, see DictObject._from_owned
+        item = HotItem._from_owned(data)
         self._data["items"].append(data)
-        self._items.append(HotItem(data))
+        self._items.append(item)
 
     @property
     def items(self):
@@ -108,8 +119,8 @@ class HotItems(DictObject):
         return len(self._items)
 
     def __iter__(self):
-        for item in self._data["items"]:
-            yield HotItem(item)
+        for item in self._items:
+            yield item
 
     def __getitem__(self, item):
         return self._items.__getitem__(item)
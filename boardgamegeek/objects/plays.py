@@ -11,11 +11,14 @@
 
 """
 from __future__ import unicode_literals
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from copy import copy
 import datetime
 
 from boardgamegeek.exceptions import BGGError
-from boardgamegeek.utils import DictObject
+from boardgamegeek.utils import DictObject, parse_date
 
 
 class PlaysessionPlayer(DictObject):
@@ -25,6 +28,7 @@ class PlaysessionPlayer(DictObject):
     :param dict data: a dictionary containing the collection data
     :raises: :py:class:`boardgamegeek.exceptions.BoardGameGeekError` in case of invalid data
     """
+    __slots__ = ()
 
     def __init__(self, data):
         self._data = data
@@ -118,17 +122,19 @@ class PlaySession(DictObject):
     :param dict data: a dictionary containing the collection data
     :raises: :py:class:`boardgamegeek.exceptions.BoardGameGeekError` in case of invalid data
     """
+    __slots__ = ("_players",)
 
     def __init__(self, data):
-        if "id" not in data:
-            raise BGGError("missing id of PlaySession")
+        self._setup(copy(data))
 
-        kw = copy(data)
+    def _setup(self, kw):
+        if "id" not in kw:
+            raise BGGError("missing id of PlaySession")
 
         if "date" in kw:
             if type(kw["date"]) != datetime.datetime:
                 try:
-                    kw["date"] = datetime.datetime.strptime(kw["date"], "%Y-%m-%d")
+                    kw["date"] = parse_date(kw["date"])
                 except:
                     kw["date"] = None
 
@@ -268,7 +274,9 @@ class Plays(DictObject):
     """
 
     def __init__(self, data):
-        kw = copy(data)
+        self._setup(copy(data))
+
+    def _setup(self, kw):
         self._plays = []
 
         for p in kw.get("plays", []):
@@ -309,10 +317,19 @@ class UserPlays(Plays):
             log.info("")
 
     def add_play(self, data):
-        kw = copy(data)
+        """
+        Add a play session to the list
+
+        :param dict data: play session data
+        :raises: :py:class:`boardgamegeek.exceptions.BoardGameGeekError` in case of invalid data
+        """
+        self._add_play(copy(data))
+
+    def _add_play(self, data):
+        # takes ownership of data, see DictObject._from_owned
         # User plays don't have the ID set in the XML
-        kw["user_id"] = self.user_id
-        self._plays.append(PlaySession(kw))
+        data["user_id"] = self.user_id
+        self._plays.append(PlaySession._from_owned(data))
 
     @property
     def user(self):
@@ -343,8 +360,18 @@ class GamePlays(Plays):
             log.info("")
 
     def add_play(self, data):
+        """
+        Add a play session to the list
+
+        :param dict data: play session data
+        :raises: :py:class:`boardgamegeek.exceptions.BoardGameGeekError` in case of invalid data
+        """
         self._plays.append(PlaySession(data))
 
+    def _add_play(self, data):
+        # takes ownership of data, see DictObject._from_owned
+        self._plays.append(PlaySession._from_owned(data))
+
     @property
     def game_id(self):
         """
@@ -353,3 +380,348 @@ class GamePlays(Plays):
         :return: ``None`` if this list is that of an user
         """
         return self._data.get("game_id")
+
+
+def _to_int(value, default=0):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class PlaysTable(DictObject):
+    """
+    Columnar storage for the play sessions of an user or of a game.
+
+    Instead of creating a :py:class:`boardgamegeek.plays.PlaySession` for every play, each field is stored in a typed
+    :py:class:`array.array`, and the players of all the play sessions are stored in a single, flattened, table. This
+    keeps large play histories small in memory and makes aggregating them cheap. The arrays support the buffer
+    protocol, so they can be used without copying by libraries such as NumPy
+    (e.g. ``numpy.frombuffer(table.game_ids, dtype=table.game_ids.typecode)``).
+
+    Only the fields listed by the properties are kept; play dates are stored as proleptic Gregorian ordinals
+    (see :py:meth:`datetime.date.toordinal`), 0 meaning n/a.
+
+    :param dict data: a dictionary containing the plays data
+    :raises: :py:class:`boardgamegeek.exceptions.BoardGameGeekError` in case of invalid data
+    """
+    __slots__ = ("_ids", "_dates", "_game_ids", "_quantities", "_durations", "_incomplete", "_user_ids",
+                 "_game_names", "_comments",
+                 "_player_plays", "_player_user_ids", "_player_wins", "_player_usernames", "_player_names",
+                 "_player_scores")
+
+    def __init__(self, data):
+        self._setup(copy(data))
+
+    def _setup(self, kw):
+        self._ids = array("l")
+        self._dates = array("l")
+        self._game_ids = array("l")
+        self._quantities = array("l")
+        self._durations = array("l")
+        self._incomplete = array("b")
+        self._user_ids = array("l")
+        self._game_names = {}               # game id -> game name, the same for all plays of a game
+        self._comments = {}                 # row -> comment, only for the plays having one
+
+        self._player_plays = array("l")     # row of the play session each player belongs to
+        self._player_user_ids = array("l")
+        self._player_wins = array("b")
+        self._player_usernames = []
+        self._player_names = []
+        self._player_scores = []
+
+        plays = kw.pop("plays", [])
+
+        super(PlaysTable, self).__init__(kw)
+
+        for p in plays:
+            self.add_play(p)
+
+    def add_play(self, data):
+        """
+        Add a play session to the table. ``data`` is not kept, so it's not copied either.
+
+        :param dict data: play session data
+        :raises: :py:class:`boardgamegeek.exceptions.BoardGameGeekError` in case of invalid data
+        """
+        if "id" not in data:
+            raise BGGError("missing id of play session")
+
+        date = data.get("date")
+        if hasattr(date, "toordinal"):
+            date = date.toordinal()
+        else:
+            try:
+                date = parse_date(date).toordinal()
+            except:
+                date = 0
+
+        row = len(self._ids)
+        game_id = _to_int(data.get("game_id"), -1)
+
+        self._ids.append(int(data["id"]))
+        self._dates.append(date)
+        self._game_ids.append(game_id)
+        self._quantities.append(_to_int(data.get("quantity")))
+        self._durations.append(_to_int(data.get("duration")))
+        self._incomplete.append(1 if data.get("incomplete") else 0)
+        # User plays don't have the ID set in the XML
+        self._user_ids.append(_to_int(self._data.get("user_id", data.get("user_id")), -1))
+
+        if game_id not in self._game_names:
+            self._game_names[game_id] = data.get("game_name")
+
+        if data.get("comment"):
+            self._comments[row] = data["comment"]
+
+        for player in data.get("players", []):
+            self._player_plays.append(row)
+            self._player_user_ids.append(_to_int(player.get("user_id"), -1))
+            self._player_wins.append(1 if _to_int(player.get("win")) else 0)
+            self._player_usernames.append(player.get("username"))
+            self._player_names.append(player.get("name"))
+            self._player_scores.append(player.get("score"))
+
+    # the table doesn't keep the data it's given, so there's nothing to take ownership of
+    _add_play = add_play
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, item):
+        """
+        Returns the play session(s) at the given position(s), as :py:class:`boardgamegeek.plays.PlaySession` objects
+        containing the fields stored by the table
+        """
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+
+        if item < 0:
+            item += len(self)
+
+        date = self._dates[item]
+        data = {"id": self._ids[item],
+                "date": datetime.datetime.fromordinal(date) if date else None,
+                "quantity": self._quantities[item],
+                "duration": self._durations[item],
+                "incomplete": self._incomplete[item],
+                "user_id": self._user_ids[item],
+                "game_id": self._game_ids[item],
+                "game_name": self._game_names.get(self._game_ids[item]),
+                "comment": self._comments.get(item),
+                "players": [{"username": self._player_usernames[i],
+                             "user_id": self._player_user_ids[i],
+                             "name": self._player_names[i],
+                             "win": str(self._player_wins[i]),
+                             "score": self._player_scores[i]}
+                            for i in self._player_rows(item)]}
+
+        return PlaySession._from_owned(data)
+
+    def _player_rows(self, row):
+        # player rows are appended in play order, so the players of a play session are contiguous
+        return range(bisect_left(self._player_plays, row), bisect_right(self._player_plays, row))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def plays_count(self):
+        """
+        :return: plays count, as reported by the server
+        :rtype: integer
+        """
+        return self._data.get("plays_count", 0)
+
+    @property
+    def user(self):
+        """
+        :return: name of the user owning these plays
+        :rtype: str
+        :return: ``None`` if these are the plays of a game
+        """
+        return self._data.get("username")
+
+    @property
+    def user_id(self):
+        """
+        :return: id of the user owning these plays
+        :rtype: integer
+        :return: ``None`` if these are the plays of a game
+        """
+        return self._data.get("user_id")
+
+    @property
+    def game_id(self):
+        """
+        :return: id of the game these plays belong to
+        :rtype: integer
+        :return: ``None`` if these are the plays of an user
+        """
+        return self._data.get("game_id")
+
+    @property
+    def ids(self):
+        """
+        :return: play session ids
+        :rtype: array of integers
+        """
+        return self._ids
+
+    @property
+    def dates(self):
+        """
+        :return: play session dates, as ordinals (0 if n/a)
+        :rtype: array of integers
+        """
+        return self._dates
+
+    @property
+    def game_ids(self):
+        """
+        :return: ids of the played games
+        :rtype: array of integers
+        """
+        return self._game_ids
+
+    @property
+    def quantities(self):
+        """
+        :return: number of recorded plays of each play session
+        :rtype: array of integers
+        """
+        return self._quantities
+
+    @property
+    def durations(self):
+        """
+        :return: duration of each play session
+        :rtype: array of integers
+        """
+        return self._durations
+
+    @property
+    def incomplete(self):
+        """
+        :return: 1 for the incomplete play sessions, 0 otherwise
+        :rtype: array of integers
+        """
+        return self._incomplete
+
+    @property
+    def user_ids(self):
+        """
+        :return: ids of the users who recorded the play sessions
+        :rtype: array of integers
+        """
+        return self._user_ids
+
+    @property
+    def player_plays(self):
+        """
+        :return: for each player, the position of its play session in the table
+        :rtype: array of integers
+        """
+        return self._player_plays
+
+    @property
+    def player_user_ids(self):
+        """
+        :return: for each player, its user id (0 or -1 if n/a)
+        :rtype: array of integers
+        """
+        return self._player_user_ids
+
+    @property
+    def player_wins(self):
+        """
+        :return: for each player, 1 if it won the play session, 0 otherwise
+        :rtype: array of integers
+        """
+        return self._player_wins
+
+    @property
+    def player_usernames(self):
+        """
+        :return: for each player, its user name
+        :rtype: list of str
+        """
+        return self._player_usernames
+
+    @property
+    def player_names(self):
+        """
+        :return: for each player, its name
+        :rtype: list of str
+        """
+        return self._player_names
+
+    @property
+    def player_scores(self):
+        """
+        :return: for each player, its score, as reported by the server
+        :rtype: list of str
+        """
+        return self._player_scores
+
+    def game_name(self, game_id):
+        """
+        :param integer game_id: id of a game in the table
+        :return: name of the game
+        :rtype: str
+        :return: ``None`` if n/a
+        """
+        return self._game_names.get(game_id)
+
+    def _sum_by_game(self, values):
+        totals = defaultdict(int)
+        for game_id, value in zip(self._game_ids, values):
+            totals[game_id] += value
+        return dict(totals)
+
+    def plays_per_game(self):
+        """
+        :return: number of plays (taking the quantity of each play session into account) of each game
+        :rtype: dict of game id -> integer
+        """
+        return self._sum_by_game(self._quantities)
+
+    def duration_per_game(self):
+        """
+        :return: total duration of the play sessions of each game
+        :rtype: dict of game id -> integer
+        """
+        return self._sum_by_game(self._durations)
+
+    def total_duration(self):
+        """
+        :return: total duration of all the play sessions
+        :rtype: integer
+        """
+        return sum(self._durations)
+
+    def win_rates(self, key="name"):
+        """
+        Computes the win rate of every player
+
+        :param str key: how to identify players: ``"name"``, ``"username"`` or ``"user_id"``
+        :return: fraction of the play sessions won by each player
+        :rtype: dict of player -> float
+        :raises: :py:class:`boardgamegeek.exceptions.BoardGameGeekError` in case of invalid ``key``
+        """
+        try:
+            players = {"name": self._player_names,
+                       "username": self._player_usernames,
+                       "user_id": self._player_user_ids}[key]
+        except KeyError:
+            raise BGGError("invalid player key: {}".format(key))
+
+        played = defaultdict(int)
+        won = defaultdict(int)
+        for player, win in zip(players, self._player_wins):
+            played[player] += 1
+            won[player] += win
+
+        return {player: won[player] / float(count) for player, count in played.items()}
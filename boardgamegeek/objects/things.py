@@ -20,6 +20,8 @@ class Thing(DictObject):
     """
     A thing, an object with a name and an id. Base class for various objects in the library.
     """
+    __slots__ = ("_id", "_name")
+
     def __init__(self, data):
         for i in ["id", "name"]:
             if i not in data:
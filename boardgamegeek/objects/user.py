@@ -22,7 +22,9 @@ class User(Thing):
     Information about an user.
     """
     def __init__(self, data):
-        kw = copy(data)
+        self._setup(copy(data))
+
+    def _setup(self, kw):
         if "buddies" not in kw:
             kw["buddies"] = []
 
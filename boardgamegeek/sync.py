@@ -0,0 +1,511 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.sync` - Keeping local copies of BGG data up to date
+=======================================================================
+
+.. module:: boardgamegeek.sync
+   :platform: Unix, Windows
+   :synopsis: keeping local copies of BGG data up to date
+
+"""
+from __future__ import unicode_literals
+
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+
+try:
+    from urllib.parse import quote
+except ImportError:  # Python 2
+    from urllib import quote
+
+from .api import HOT_ITEM_CHOICES, COLLECTION_SUBTYPES, PLAYS_SUBTYPES, BGGRestrictCollectionTo, BGGRestrictPlaysTo
+from .cache import DEFAULT_CACHE_TTL
+from .exceptions import BGGError, BGGValueError, BGGItemNotFoundError
+from .objects.collection import Collection
+from .objects.plays import UserPlays, GamePlays
+
+log = logging.getLogger("boardgamegeek.sync")
+
+# how often the synchronized collections are fetched entirely, for finding the removed items (in seconds)
+DEFAULT_FULL_SYNC_INTERVAL = 7 * 24 * 3600
+
+# plays are often logged some days after they happened: the synchronization of plays fetches again the plays of the
+# last days before the latest play already fetched
+DEFAULT_PLAYS_OVERLAP_DAYS = 7
+
+
+def _store_path(directory, kind, name):
+    # user names can contain characters which aren't allowed in file names
+    return os.path.join(directory, "{}-{}.json".format(kind, quote(name.lower(), safe="")))
+
+
+def _load_store(path, kind, version):
+    """
+    :return: the data saved with :py:func:`_save_store`, ``None`` if there's no such file
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGError` if the file is invalid
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except IOError:
+        if os.path.exists(path):
+            raise
+        return None
+    except ValueError:
+        raise BGGError("invalid {} file: {}".format(kind, path))
+
+    if data.get("version") != version:
+        raise BGGError("unsupported {} file version: {}".format(kind, data.get("version")))
+
+    return data
+
+
+def _save_store(path, data):
+    # write to a temporary file first, an interrupted sync mustn't leave a truncated file behind
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(data, f)
+
+    if hasattr(os, "replace"):
+        os.replace(temp_path, path)
+    else:  # Python 2
+        if os.path.exists(path):
+            os.remove(path)
+        os.rename(temp_path, path)
+
+
+class HotItemsRefresher(object):
+    """
+    Keeps the hot items of several types in memory, refreshed periodically from a background thread.
+
+    The hot items are fetched through the client, so its cache applies: refreshing more often than the cache's time to
+    live returns the cached lists.
+
+    :param client: client used for fetching the hot items
+    :type client: :py:class:`boardgamegeek.api.BGGClient`
+    :param list types: hot item types to keep, ``None`` (default) for all of them
+    :param float interval: delay between two refreshes, in seconds
+
+    Example usage::
+
+        >>> with HotItemsRefresher(BGGClient()) as refresher:
+        ...     refresher.hot_items("boardgame")
+    """
+    def __init__(self, client, types=None, interval=DEFAULT_CACHE_TTL):
+        if types is None:
+            types = HOT_ITEM_CHOICES
+
+        for item_type in types:
+            if item_type not in HOT_ITEM_CHOICES:
+                raise BGGValueError("invalid type specified")
+
+        try:
+            interval = float(interval)
+        except (TypeError, ValueError):
+            raise BGGValueError("invalid refresh interval")
+        if interval <= 0:
+            raise BGGValueError("invalid refresh interval")
+
+        self._client = client
+        self._types = list(types)
+        self._interval = interval
+
+        self._lock = threading.Lock()
+        self._hot_items = {}
+        self._last_refresh = None
+        self._last_error = None
+
+        # each thread has its own event, so that a thread which is still finishing a refresh after being stopped
+        # doesn't get restarted along with a new one
+        self._stopping = None
+        self._thread = None
+
+    @property
+    def last_refresh(self):
+        """
+        :return: time (as returned by :py:func:`time.time`) of the last successful refresh
+        :rtype: float
+        :return: ``None`` if the hot items weren't fetched yet
+        """
+        return self._last_refresh
+
+    @property
+    def last_error(self):
+        """
+        :return: the error which made the last background refresh fail
+        :rtype: :py:exc:`boardgamegeek.exceptions.BGGError`, or another exception in case of an unexpected error
+        :return: ``None`` if the last refresh succeeded
+        """
+        return self._last_error
+
+    @property
+    def running(self):
+        """
+        :return: ``True`` if the background refresh is running
+        :rtype: bool
+        """
+        return self._thread is not None and self._thread.is_alive() and not self._stopping.is_set()
+
+    def refresh(self):
+        """
+        Fetches all the hot items now
+
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGError` if they couldn't be fetched, the previous ones are kept
+        """
+        hot_items = self._client.hot_items_all(self._types)
+        with self._lock:
+            self._hot_items = hot_items
+            self._last_refresh = time.time()
+
+    def hot_items(self, item_type):
+        """
+        Returns the hot items of a type, fetching them if they weren't yet
+
+        :param str item_type: one of the types kept by this object
+        :return: the hot items
+        :rtype: :py:class:`boardgamegeek.objects.hotitems.HotItems`
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if this type isn't kept
+        """
+        if item_type not in self._types:
+            raise BGGValueError("hot items of type {} are not kept".format(item_type))
+
+        with self._lock:
+            hot_items = self._hot_items.get(item_type)
+
+        if hot_items is None:
+            self.refresh()
+            with self._lock:
+                hot_items = self._hot_items[item_type]
+
+        return hot_items
+
+    def all(self):
+        """
+        :return: the hot items fetched by the last refresh, by type
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(self._hot_items)
+
+    def start(self):
+        """
+        Starts refreshing the hot items in the background, right away and then every ``interval`` seconds
+        """
+        if self.running:
+            return
+
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stopping,), name="HotItemsRefresher")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stops the background refresh
+
+        :param float timeout: how long to wait for the current refresh to finish, in seconds (``None`` for as long as
+                              needed). If it's not finished by then, the thread stops once it is.
+        """
+        if self._thread is None:
+            return
+
+        self._stopping.set()
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._thread = None
+
+    def _run(self, stopping):
+        while not stopping.is_set():
+            try:
+                self.refresh()
+                self._last_error = None
+            except BGGError as e:
+                log.warning("refreshing the hot items failed: {}".format(e))
+                self._last_error = e
+            except Exception as e:
+                # keep refreshing, the next attempt may work
+                log.exception("unexpected error while refreshing the hot items")
+                self._last_error = e
+
+            stopping.wait(self._interval)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+class CollectionSyncResult(namedtuple("CollectionSyncResult", ["collection", "updated_ids", "removed_ids", "full"])):
+    """
+    Result of synchronizing a collection: the up to date collection, the ids of the items which were added or modified
+    and of those which were removed (only detected by a full synchronization), and whether it was a full one
+    """
+    __slots__ = ()
+
+
+class CollectionSync(object):
+    """
+    Keeps local copies of users' collections up to date, fetching only the items modified since the last
+    synchronization (using the ``modified_since`` parameter of :py:meth:`boardgamegeek.api.BGGClient.collection`).
+
+    The items removed from a collection can't be detected this way, so the collection is fetched entirely every
+    ``full_sync_interval`` seconds.
+
+    The collections are stored in ``directory``, one JSON file per user. The time from which the modified items are
+    fetched is the latest modification time of the items already fetched, as reported by BGG, so that the local clock
+    doesn't matter.
+
+    :param client: client used for fetching the collections
+    :type client: :py:class:`boardgamegeek.api.BGGClient`
+    :param str directory: directory where the collections are stored
+    :param str subtype: type of the items to synchronize, one of :py:class:`boardgamegeek.api.BGGRestrictCollectionTo`
+    :param float full_sync_interval: delay between two full synchronizations of a collection, in seconds
+
+    Example usage::
+
+        >>> sync = CollectionSync(BGGClient(), "/var/lib/bgg/collections")
+        >>> sync.sync("fagentu007").collection
+    """
+    FILE_VERSION = 1
+
+    def __init__(self, client, directory, subtype=BGGRestrictCollectionTo.BOARD_GAME,
+                 full_sync_interval=DEFAULT_FULL_SYNC_INTERVAL):
+        if subtype not in COLLECTION_SUBTYPES:
+            raise BGGValueError("invalid 'subtype'")
+
+        self._client = client
+        self._directory = directory
+        self._subtype = subtype
+        self._full_sync_interval = full_sync_interval
+
+    def _path(self, user_name):
+        return _store_path(self._directory, "collection-{}".format(self._subtype), user_name)
+
+    def _load_state(self, user_name):
+        return _load_store(self._path(user_name), "collection", self.FILE_VERSION)
+
+    def load(self, user_name):
+        """
+        Returns the local copy of a collection, without contacting BGG
+
+        :param str user_name: the collection's owner
+        :return: the collection
+        :rtype: :py:class:`boardgamegeek.objects.collection.Collection`
+        :return: ``None`` if the collection was never synchronized
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGError` if the stored file is invalid
+        """
+        state = self._load_state(user_name)
+        if state is None:
+            return None
+        return Collection({"owner": state["owner"], "items": state["items"]})
+
+    def sync(self, user_name, full=False):
+        """
+        Brings the local copy of a collection up to date
+
+        :param str user_name: the collection's owner
+        :param bool full: fetch the whole collection, even if the last full synchronization is recent
+        :return: the synchronized collection, and what changed
+        :rtype: :py:class:`CollectionSyncResult`
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGItemNotFoundError` if the user wasn't found
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGError` if the collection couldn't be fetched, or the stored file
+                 is invalid
+        """
+        state = self._load_state(user_name)
+        now = time.time()
+
+        full = full or state is None or state["last_modified"] is None or \
+            now - state["last_full_sync"] >= self._full_sync_interval
+
+        if full:
+            fetched = self._client.collection(user_name, subtype=self._subtype)
+            items = {}
+        else:
+            fetched = self._client.collection(user_name, subtype=self._subtype,
+                                              modified_since=state["last_modified"])
+            items = {item["id"]: item for item in state["items"]}
+
+        updated_ids = []
+        last_modified = None if full else state["last_modified"]
+        for item in fetched:
+            data = item.data()
+            items[data["id"]] = data
+            updated_ids.append(data["id"])
+
+            modified = data.get("lastmodified")
+            if modified is not None and (last_modified is None or modified > last_modified):
+                last_modified = modified
+
+        removed_ids = []
+        if full and state is not None:
+            removed_ids = [item["id"] for item in state["items"] if item["id"] not in items]
+
+        _save_store(self._path(user_name),
+                    {"version": self.FILE_VERSION,
+                     "owner": user_name,
+                     "last_modified": last_modified,
+                     "last_full_sync": now if full else state["last_full_sync"],
+                     "items": list(items.values())})
+
+        return CollectionSyncResult(Collection({"owner": user_name, "items": list(items.values())}),
+                                    updated_ids, removed_ids, full)
+
+
+class PlaysSyncResult(namedtuple("PlaysSyncResult", ["plays", "new_ids"])):
+    """
+    Result of synchronizing plays: all the plays, and the ids of those which weren't already stored
+    """
+    __slots__ = ()
+
+
+class PlaysSync(object):
+    """
+    Keeps local copies of the plays of users or games up to date, fetching only the plays since the latest one
+    already stored (using the ``min_date`` parameter of :py:meth:`boardgamegeek.api.BGGClient.plays`).
+
+    Since plays are often logged after the day they happened, the plays of the ``overlap_days`` days before the latest
+    one are fetched again, the plays already stored are recognized by their id. Plays which were modified or deleted
+    on BGG after being stored aren't updated.
+
+    The plays are stored in ``directory``, one JSON file per user or game.
+
+    :param client: client used for fetching the plays
+    :type client: :py:class:`boardgamegeek.api.BGGClient`
+    :param str directory: directory where the plays are stored
+    :param str subtype: type of the played items, one of :py:class:`boardgamegeek.api.BGGRestrictPlaysTo`
+    :param int overlap_days: number of days before the latest stored play to fetch again
+
+    Example usage::
+
+        >>> sync = PlaysSync(BGGClient(), "/var/lib/bgg/plays")
+        >>> sync.sync(name="fagentu007").new_ids
+    """
+    FILE_VERSION = 1
+
+    def __init__(self, client, directory, subtype=BGGRestrictPlaysTo.BOARD_GAME,
+                 overlap_days=DEFAULT_PLAYS_OVERLAP_DAYS):
+        if subtype not in PLAYS_SUBTYPES:
+            raise BGGValueError("invalid 'subtype'")
+
+        try:
+            overlap_days = int(overlap_days)
+        except (TypeError, ValueError):
+            raise BGGValueError("invalid 'overlap_days'")
+        if overlap_days < 0:
+            raise BGGValueError("invalid 'overlap_days'")
+
+        self._client = client
+        self._directory = directory
+        self._subtype = subtype
+        self._overlap = datetime.timedelta(days=overlap_days)
+
+    def _path(self, name, game_id):
+        if name:
+            return _store_path(self._directory, "plays-{}-user".format(self._subtype), name)
+        return _store_path(self._directory, "plays-{}-game".format(self._subtype), "{}".format(game_id))
+
+    @staticmethod
+    def _check_target(name, game_id):
+        if not name and not game_id:
+            raise BGGValueError("no user name or game id specified")
+
+        if name and game_id:
+            raise BGGValueError("can't synchronize plays by user and by game at the same time")
+
+    @staticmethod
+    def _create_plays(state):
+        data = {"plays_count": len(state["plays"]),
+                "plays": state["plays"]}
+        if state["username"] is not None:
+            data.update({"username": state["username"], "user_id": state["user_id"]})
+            return UserPlays(data)
+        data["game_id"] = state["game_id"]
+        return GamePlays(data)
+
+    def load(self, name=None, game_id=None):
+        """
+        Returns the local copy of the plays of an user or a game, without contacting BGG
+
+        :param str name: user name
+        :param int game_id: game id
+        :return: the plays
+        :rtype: :py:class:`boardgamegeek.objects.plays.Plays`
+        :return: ``None`` if these plays were never synchronized
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGError` if the stored file is invalid
+        """
+        self._check_target(name, game_id)
+
+        state = _load_store(self._path(name, game_id), "plays", self.FILE_VERSION)
+        if state is None:
+            return None
+        return self._create_plays(state)
+
+    def sync(self, name=None, game_id=None):
+        """
+        Fetches the new plays of an user or a game and adds them to the local copy
+
+        :param str name: user name
+        :param int game_id: game id
+        :return: the synchronized plays, and the ids of the new ones
+        :rtype: :py:class:`PlaysSyncResult`
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGItemNotFoundError` if the user or the game wasn't found (or
+                 has no plays) on the first synchronization
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGError` if the plays couldn't be fetched, or the stored file is
+                 invalid
+        """
+        self._check_target(name, game_id)
+
+        path = self._path(name, game_id)
+        state = _load_store(path, "plays", self.FILE_VERSION)
+
+        min_date = None
+        if state is not None and state["last_date"] is not None:
+            min_date = datetime.datetime.strptime(state["last_date"], "%Y-%m-%d").date() - self._overlap
+
+        try:
+            fetched = self._client.plays(name=name, game_id=game_id, min_date=min_date, subtype=self._subtype)
+        except BGGItemNotFoundError:
+            if state is None:
+                raise
+            # the API reports "no plays" as an error
+            fetched = []
+
+        if state is None:
+            state = {"version": self.FILE_VERSION,
+                     "username": fetched.user if name else None,
+                     "user_id": fetched.user_id if name else None,
+                     "game_id": None if name else int(game_id),
+                     "last_date": None,
+                     "plays": []}
+
+        known_ids = set(play["id"] for play in state["plays"])
+        new_plays = []
+        for play in fetched:
+            if play.id in known_ids:
+                continue
+            known_ids.add(play.id)
+
+            data = dict(play.data())
+            if data["date"] is not None:
+                data["date"] = data["date"].date().isoformat()
+                if state["last_date"] is None or data["date"] > state["last_date"]:
+                    state["last_date"] = data["date"]
+            new_plays.append(data)
+
+        # newest plays first, as returned by the API
+        state["plays"] = new_plays + state["plays"]
+        _save_store(path, state)
+
+        return PlaysSyncResult(self._create_plays(state), [play["id"] for play in new_plays])
+
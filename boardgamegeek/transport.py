@@ -0,0 +1,354 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.transport` - HTTP requests to the BGG API
+=============================================================
+
+.. module:: boardgamegeek.transport
+   :platform: Unix, Windows
+   :synopsis: HTTP requests to the BGG API
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+
+"""
+from __future__ import unicode_literals
+import logging
+import threading
+import time
+from collections import namedtuple
+import xml.etree.ElementTree as ET
+from xml.etree.ElementTree import ParseError as ETParseError
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .exceptions import BGGApiError, BGGApiRetryError, BGGApiTimeoutError, BGGItemNotFoundError, BGGValueError
+from .utils import DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_CONCURRENT_REQUESTS
+
+try:
+    import urllib.parse as urlparse
+except ImportError:
+    import urlparse
+
+log = logging.getLogger("boardgamegeek.transport")
+
+# number of hosts for which to keep a connection pool
+DEFAULT_POOL_CONNECTIONS = 2
+# number of connections kept open to a host, enough for the concurrent requests
+DEFAULT_POOL_MAXSIZE = DEFAULT_CONCURRENT_REQUESTS
+# wait for a connection of the pool to be free, instead of opening (and then discarding) an extra one
+DEFAULT_POOL_BLOCK = True
+
+# headers sent with every request: keep the connections open and get compressed replies
+DEFAULT_HEADERS = {"Accept-Encoding": "gzip, deflate",
+                   "Connection": "keep-alive"}
+
+# size of the (decompressed) chunks fed to the XML parser while the response is received
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class EndpointTransferStats(namedtuple("EndpointTransferStats", ["requests", "cached", "wire_bytes",
+                                                                 "decoded_bytes"])):
+    """
+    Data transferred for an endpoint: number of responses (``cached`` of which came from the cache), bytes received
+    from the network (compressed, none for the cached responses) and bytes once decompressed
+    """
+    __slots__ = ()
+
+    @property
+    def compression_ratio(self):
+        """
+        :return: decoded bytes per byte received from the network
+        :rtype: float
+        :return: ``None`` if nothing was received
+        """
+        if not self.wire_bytes:
+            return None
+        return self.decoded_bytes / float(self.wire_bytes)
+
+
+class TransferStats(object):
+    """
+    Counts the data received from the API, per endpoint (``thing``, ``collection``, ...). Can be shared by several
+    threads.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    @staticmethod
+    def endpoint_name(url):
+        """
+        :param str url: URL of a request to the API
+        :return: the name of the endpoint, e.g. ``thing`` for ``https://www.boardgamegeek.com/xmlapi2/thing``
+        :rtype: str
+        """
+        parts = urlparse.urlparse(url).path.strip("/").split("/")
+        return parts[1] if len(parts) > 1 else parts[0]
+
+    def add(self, url, wire_bytes, decoded_bytes, cached=False):
+        """
+        Records a response
+
+        :param str url: URL of the request
+        :param int wire_bytes: bytes received from the network
+        :param int decoded_bytes: bytes once decompressed
+        :param bool cached: if the response came from the cache
+        """
+        name = self.endpoint_name(url)
+        with self._lock:
+            stats = self._endpoints.get(name, EndpointTransferStats(0, 0, 0, 0))
+            self._endpoints[name] = EndpointTransferStats(stats.requests + 1,
+                                                          stats.cached + int(bool(cached)),
+                                                          stats.wire_bytes + wire_bytes,
+                                                          stats.decoded_bytes + decoded_bytes)
+
+    def endpoints(self):
+        """
+        :return: the names of the endpoints for which responses were received
+        :rtype: list of str
+        """
+        with self._lock:
+            return sorted(self._endpoints)
+
+    def endpoint(self, name):
+        """
+        :param str name: name of the endpoint
+        :return: the data transferred for this endpoint
+        :rtype: :py:class:`EndpointTransferStats`
+        """
+        with self._lock:
+            return self._endpoints.get(name, EndpointTransferStats(0, 0, 0, 0))
+
+    def total(self):
+        """
+        :return: the data transferred for all the endpoints
+        :rtype: :py:class:`EndpointTransferStats`
+        """
+        with self._lock:
+            return EndpointTransferStats(*[sum(values) for values in zip((0, 0, 0, 0), *self._endpoints.values())])
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+
+class RateLimitingAdapter(HTTPAdapter):
+    """
+    Adapter for the Requests library which makes sure there's a delay between consecutive requests to the BGG site
+    so that we don't get throttled
+    """
+
+    __last_request_timestamp = None     # time when the last request was made
+    __time_between_requests = 0         # interval to wait between requests in order to match the expected number of
+                                        # requests per second
+
+    __rate_limit_lock = threading.Lock()
+
+    def __init__(self, rpm=DEFAULT_REQUESTS_PER_MINUTE, **kw):
+        """
+
+        :param rpm: how many requests per minute to allow
+        :param kw: passed to :py:class:`requests.adapters.HTTPAdapter` (``pool_connections``, ``pool_maxsize``,
+                   ``pool_block``, ...)
+        :return:
+        """
+        if rpm <= 0:
+            log.warning("invalid requests per minute value ({}), falling back to default".format(rpm))
+            rpm = DEFAULT_REQUESTS_PER_MINUTE
+
+        RateLimitingAdapter.__time_between_requests = 60.0 / float(rpm)
+
+        super(RateLimitingAdapter, self).__init__(**kw)
+
+    def send(self, request, **kw):
+        log.debug("acquiring rate limiting lock")
+        with RateLimitingAdapter.__rate_limit_lock:
+
+            log.debug("time between requests:{}, last request timestamp: {}".format(RateLimitingAdapter.__time_between_requests,
+                                                                                    RateLimitingAdapter.__last_request_timestamp))
+
+            # determine if we need to sleep in order to enforce the maximum requested amount of requests per minute
+            if RateLimitingAdapter.__last_request_timestamp is not None:
+                time_delta = time.time() - RateLimitingAdapter.__last_request_timestamp
+                need_to_wait = RateLimitingAdapter.__time_between_requests - time_delta
+
+                log.debug("time since last request: {}, need to wait: {}".format(time_delta, need_to_wait))
+
+                if need_to_wait > 0:
+                    time.sleep(need_to_wait)
+
+            RateLimitingAdapter.__last_request_timestamp = time.time()
+            log.debug("releasing rate limiting lock")
+
+        log.debug("sending request: {}".format(request))
+        return super(RateLimitingAdapter, self).send(request, **kw)
+
+
+
+def configure_session(session, url, rpm=DEFAULT_REQUESTS_PER_MINUTE, pool_connections=DEFAULT_POOL_CONNECTIONS,
+                      pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=DEFAULT_POOL_BLOCK):
+    """
+    Prepares a session for sending requests to the BGG API: mounts a :py:class:`RateLimitingAdapter` with a
+    connection pool sized for the concurrent requests, and sets the :py:data:`DEFAULT_HEADERS`.
+
+    :param session: A Session of the ``requests`` library
+    :param str url: prefix of the URLs for which the adapter is used
+    :param int rpm: how many requests per minute to allow
+    :param int pool_connections: number of hosts for which to keep a connection pool
+    :param int pool_maxsize: number of connections to keep open to a host
+    :param bool pool_block: if ``True``, wait for a free connection when all of them are in use, instead of opening a
+                            connection which isn't kept afterwards
+    :return: the session
+    :raises: :py:class:`BGGValueError` in case of invalid pool parameters
+    """
+    try:
+        pool_connections = int(pool_connections)
+        pool_maxsize = int(pool_maxsize)
+    except (TypeError, ValueError):
+        raise BGGValueError("invalid connection pool parameters")
+
+    if pool_connections < 1 or pool_maxsize < 1:
+        raise BGGValueError("invalid connection pool parameters")
+
+    session.mount(url, RateLimitingAdapter(rpm=rpm,
+                                           pool_connections=pool_connections,
+                                           pool_maxsize=pool_maxsize,
+                                           pool_block=bool(pool_block)))
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+def _wire_bytes(response, default):
+    """
+    :return: the number of bytes of the response's body received from the network
+    """
+    if getattr(response, "from_cache", False):
+        return 0
+    try:
+        return response.raw.tell()
+    except AttributeError:
+        return default
+
+
+def _read_xml(response, parse, url, stats):
+    """
+    Reads the body of a response and parses it, see :py:func:`request_and_parse_xml`
+    """
+    decoded_bytes = 0
+    try:
+        if parse is None:
+            # parse as the (decompressed) data arrives, there's no copy of the whole document
+            parser = ET.XMLParser()
+            for chunk in response.iter_content(chunk_size=READ_CHUNK_SIZE):
+                decoded_bytes += len(chunk)
+                parser.feed(chunk)
+            root = parser.close()
+        else:
+            content = response.content
+            decoded_bytes = len(content)
+            root = parse(content)
+    finally:
+        # gives the connection back to the pool
+        response.close()
+
+    if stats is not None:
+        stats.add(url, _wire_bytes(response, decoded_bytes), decoded_bytes, cached=getattr(response, "from_cache", False))
+
+    return root
+
+
+def request_and_parse_xml(requests_session, url, params=None, timeout=15, retries=3, retry_delay=5, parse=None,
+                          stats=None):
+    """
+    Downloads an XML from the specified url, parses it and returns the xml ElementTree.
+
+    :param requests_session: A Session of the ``requests`` library, used to fetch the url
+    :param url: the address where to get the XML from
+    :param params: dictionary containing the parameters which should be sent with the request
+    :param timeout: number of seconds after which the request times out
+    :param retries: number of retries to perform in case of timeout
+    :param retry_delay: the amount of seconds to sleep when retrying an API call that returned 202
+    :param callable parse: function creating the element tree out of the XML document (bytes), e.g. for parsing only
+                           a part of it. If ``None``, the response is parsed while it's received.
+    :param stats: if not ``None``, the size of the response is added to it
+    :type stats: :py:class:`TransferStats`
+    :return: :py:func:`xml.etree.ElementTree` corresponding to the XML
+    :raises: :py:class:`BGGApiRetryError` if this request should be retried after a short delay
+    :raises: :py:class:`BGGApiError` if the response was invalid or couldn't be parsed
+    :raises: :py:class:`BGGApiTimeoutError` if there was a timeout
+    """
+
+    retr = retries
+
+    # retry loop
+    while retr >= 0:
+        retr -= 1
+        try:
+            r = requests_session.get(url, params=params, timeout=timeout, stream=True)
+
+            if r.status_code != 200:
+                # the body isn't needed, give the connection back to the pool
+                r.close()
+
+            if r.status_code == 202:
+                if retries == 0:
+                    # no retries have been requested, therefore raise exception to signal the application that it
+                    # needs to retry
+                    # (BoardGameGeek API says that on status code 202 the call should be retried after a delay)
+                    raise BGGApiRetryError
+                elif retr == 0:
+                    # retries were requested, but we reached 0. Signal the application that it needs to retry itself.
+                    raise BGGApiRetryError("failed to retrieve data after {} retries".format(retries))
+                else:
+                    # sleep for the specified delay and retry
+                    log.debug("API call will be retried in {} seconds ({} more retries)".format(retry_delay, retr))
+                    if retr >= 0:
+                        time.sleep(retry_delay)
+                        retry_delay *= 1.5
+                    continue
+            elif r.status_code == 404:
+                # Legacy API returns a 404 when geeklist is not found
+                log.warning("API returned 404, aborting")
+                raise BGGItemNotFoundError("data not found")
+            elif r.status_code == 503:
+                # it seems they added some sort of protection which triggers when too many requests are made, in which
+                # case we get back a 503. Try to delay and retry
+                log.warning("API returned 503, retrying")
+                if retr >= 0:
+                    time.sleep(retry_delay)
+                    retry_delay *= 3
+                continue
+
+            if not r.headers.get("content-type").lower().startswith("text/xml"):
+                r.close()
+                raise BGGApiError("non-XML reply")
+
+            try:
+                return _read_xml(r, parse, url, stats)
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+                # the body is streamed, so it's read after get() returned: a timeout while reading it is reported as
+                # a ConnectionError, and a connection dropped midway as a ChunkedEncodingError. Retry them as
+                # timeouts, as when the body was read by get().
+                raise requests.exceptions.ReadTimeout(e)
+
+        except requests.exceptions.Timeout:
+            if retries == 0:
+                raise BGGApiTimeoutError
+            elif retr == 0:
+                # ... reached 0 retries
+                raise BGGApiTimeoutError("failed to retrieve data after {} retries".format(retries))
+            else:
+                log.debug("API request timeout, retrying {} more times w/timeout {}".format(retr, timeout))
+                timeout *= 2.5
+                continue
+
+        except ETParseError as e:
+            raise BGGApiError("error decoding BGG API response: {}".format(e))
+
+        except (BGGApiError, BGGApiRetryError, BGGApiTimeoutError, BGGItemNotFoundError):
+            raise
+
+        except Exception as e:
+            raise BGGApiError("error fetching BGG API response: {}".format(e))
+
+    raise BGGApiError("couldn't fetch data within the configured number of retries")
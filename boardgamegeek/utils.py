@@ -11,14 +11,11 @@
 
 """
 from __future__ import unicode_literals
+import datetime
 import sys
 import xml.etree.ElementTree as ET
-from xml.etree.ElementTree import ParseError as ETParseError
-import requests
 import logging
-import time
 import threading
-from requests.adapters import HTTPAdapter
 
 
 try:
@@ -26,73 +23,47 @@ try:
 except:
     import urlparse
 
-# Compatibility shim which gives us a working "unescape HTML" function on all Python versions
 try:
-    import html
-    html_unescape = html.unescape # Python 3.4+
-except AttributeError: # Python 3.0 - 3.3
-    import html.parser
-    html_unescape = html.parser.HTMLParser().unescape
-except ImportError: # Python 2
-    import HTMLParser
-    html_unescape = HTMLParser.HTMLParser().unescape
+    from sys import intern as _intern
+except ImportError:  # Python 2
+    _intern = intern
 
-from .exceptions import BGGApiError, BGGApiRetryError, BGGError, BGGApiTimeoutError, BGGItemNotFoundError
 
-log = logging.getLogger("boardgamegeek.utils")
+def _load_html_unescape():
+    # Compatibility shim which gives us a working "unescape HTML" function on all Python versions
+    try:
+        import html
+        return html.unescape # Python 3.4+
+    except AttributeError: # Python 3.0 - 3.3
+        import html.parser
+        return html.parser.HTMLParser().unescape
+    except ImportError: # Python 2
+        import HTMLParser
+        return HTMLParser.HTMLParser().unescape
 
-DEFAULT_REQUESTS_PER_MINUTE = 30
+_html_unescape = None
 
 
-class RateLimitingAdapter(HTTPAdapter):
+def html_unescape(text):
     """
-    Adapter for the Requests library which makes sure there's a delay between consecutive requests to the BGG site
-    so that we don't get throttled
-    """
-
-    __last_request_timestamp = None     # time when the last request was made
-    __time_between_requests = 0         # interval to wait between requests in order to match the expected number of
-                                        # requests per second
-
-    __rate_limit_lock = threading.Lock()
-
-    def __init__(self, rpm=DEFAULT_REQUESTS_PER_MINUTE, **kw):
-        """
-
-        :param rpm: how many requests per minute to allow
-        :param kw:
-        :return:
-        """
-        if rpm <= 0:
-            log.warning("invalid requests per minute value ({}), falling back to default".format(rpm))
-            rpm = DEFAULT_REQUESTS_PER_MINUTE
-
-        RateLimitingAdapter.__time_between_requests = 60.0 / float(rpm)
-
-        super(RateLimitingAdapter, self).__init__(**kw)
-
-    def send(self, request, **kw):
-        log.debug("acquiring rate limiting lock")
-        with RateLimitingAdapter.__rate_limit_lock:
-
-            log.debug("time between requests:{}, last request timestamp: {}".format(RateLimitingAdapter.__time_between_requests,
-                                                                                    RateLimitingAdapter.__last_request_timestamp))
+    Unescapes the HTML entities of a text. The unescaping module is only imported on first use.
 
-            # determine if we need to sleep in order to enforce the maximum requested amount of requests per minute
-            if RateLimitingAdapter.__last_request_timestamp is not None:
-                time_delta = time.time() - RateLimitingAdapter.__last_request_timestamp
-                need_to_wait = RateLimitingAdapter.__time_between_requests - time_delta
+    :param str text: the HTML-escaped text
+    :return: the unescaped text
+    :rtype: str
+    """
+    global _html_unescape
+    if _html_unescape is None:
+        _html_unescape = _load_html_unescape()
+    return _html_unescape(text)
 
-                log.debug("time since last request: {}, need to wait: {}".format(time_delta, need_to_wait))
 
-                if need_to_wait > 0:
-                    time.sleep(need_to_wait)
+log = logging.getLogger("boardgamegeek.utils")
 
-            RateLimitingAdapter.__last_request_timestamp = time.time()
-            log.debug("releasing rate limiting lock")
+DEFAULT_REQUESTS_PER_MINUTE = 30
 
-        log.debug("sending request: {}".format(request))
-        return super(RateLimitingAdapter, self).send(request, **kw)
+# how many requests to have in flight when making several of them at once
+DEFAULT_CONCURRENT_REQUESTS = 4
 
 
 class DictObject(object):
@@ -100,16 +71,56 @@ class DictObject(object):
     Just a fancy wrapper over a dictionary
     """
 
+    # Subclasses which are created in large numbers (play sessions, collection items, etc.) declare their own
+    # ``__slots__`` so that their instances don't carry a per-instance ``__dict__``.
+    __slots__ = ("_data",)
+
     def __init__(self, data):
         self._data = data
 
+    @classmethod
+    def _from_owned(cls, data):
+        """
+        Creates an object which takes ownership of ``data``. Unlike the constructor, which makes a defensive copy of
+        its argument, ``data`` is used (and possibly modified) as is, so this is meant for the loaders, which build
+        a fresh dictionary for every object. Only available for classes implementing ``_setup(data)``.
+
+        :param dict data: the object's data, not to be used by the caller afterwards
+        """
+        obj = cls.__new__(cls)
+        obj._setup(data)
+        return obj
+
     def __getattr__(self, item):
+        if item == "_data":
+            # not initialized yet (e.g. while unpickling), don't recurse looking for it
+            raise AttributeError(item)
         # allow accessing user's variables using .attribute
         try:
             return self._data[item]
         except:
             raise AttributeError
 
+    def __getstate__(self):
+        # gather the state from both the slots and the __dict__ (if any), so that objects using __slots__ can be
+        # pickled with any protocol
+        state = {}
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get("__slots__", ()):
+                try:
+                    state[name] = object.__getattribute__(self, name)
+                except AttributeError:
+                    pass
+        try:
+            state.update(object.__getattribute__(self, "__dict__"))
+        except AttributeError:
+            pass
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
     # TODO: remove this ? Turn to property ?
     def data(self):
         """
@@ -295,93 +306,51 @@ def xml_subelement_text(xml_elem, subelement, convert=None, default=None, quiet=
     return text
 
 
-def request_and_parse_xml(requests_session, url, params=None, timeout=15, retries=3, retry_delay=5):
+def parse_xml(xml):
     """
-    Downloads an XML from the specified url, parses it and returns the xml ElementTree.
-
-    :param requests_session: A Session of the ``requests`` library, used to fetch the url
-    :param url: the address where to get the XML from
-    :param params: dictionary containing the parameters which should be sent with the request
-    :param timeout: number of seconds after which the request times out
-    :param retries: number of retries to perform in case of timeout
-    :param retry_delay: the amount of seconds to sleep when retrying an API call that returned 202
-    :return: :py:func:`xml.etree.ElementTree` corresponding to the XML
-    :raises: :py:class:`BGGApiRetryError` if this request should be retried after a short delay
-    :raises: :py:class:`BGGApiError` if the response was invalid or couldn't be parsed
-    :raises: :py:class:`BGGApiTimeoutError` if there was a timeout
+    Parses an XML document
+
+    :param xml: the document (text, or bytes in the document's encoding)
+    :return: the root element
+    :rtype: :py:class:`xml.etree.ElementTree.Element`
     """
+    if isinstance(xml, bytes) or sys.version_info >= (3,):
+        return ET.fromstring(xml)
+    return ET.fromstring(xml.encode("utf-8"))
 
-    retr = retries
 
-    # retry loop
-    while retr >= 0:
-        retr -= 1
-        try:
-            r = requests_session.get(url, params=params, timeout=timeout)
-
-            if r.status_code == 202:
-                if retries == 0:
-                    # no retries have been requested, therefore raise exception to signal the application that it
-                    # needs to retry
-                    # (BoardGameGeek API says that on status code 202 the call should be retried after a delay)
-                    raise BGGApiRetryError
-                elif retr == 0:
-                    # retries were requested, but we reached 0. Signal the application that it needs to retry itself.
-                    raise BGGApiRetryError("failed to retrieve data after {} retries".format(retries))
-                else:
-                    # sleep for the specified delay and retry
-                    log.debug("API call will be retried in {} seconds ({} more retries)".format(retry_delay, retr))
-                    if retr >= 0:
-                        time.sleep(retry_delay)
-                        retry_delay *= 1.5
-                    continue
-            elif r.status_code == 404:
-                # Legacy API returns a 404 when geeklist is not found
-                log.warning("API returned 404, aborting")
-                raise BGGItemNotFoundError("data not found")
-            elif r.status_code == 503:
-                # it seems they added some sort of protection which triggers when too many requests are made, in which
-                # case we get back a 503. Try to delay and retry
-                log.warning("API returned 503, retrying")
-                if retr >= 0:
-                    time.sleep(retry_delay)
-                    retry_delay *= 3
-                continue
-
-            if not r.headers.get("content-type").lower().startswith("text/xml"):
-                raise BGGApiError("non-XML reply")
-
-            xml = r.text
-
-            if sys.version_info >= (3,):
-                root_elem = ET.fromstring(xml)
-            else:
-                utf8_xml = xml.encode("utf-8")
-                root_elem = ET.fromstring(utf8_xml)
-
-            return root_elem
-
-        except requests.exceptions.Timeout:
-            if retries == 0:
-                raise BGGApiTimeoutError
-            elif retr == 0:
-                # ... reached 0 retries
-                raise BGGApiTimeoutError("failed to retrieve data after {} retries".format(retries))
-            else:
-                log.debug("API request timeout, retrying {} more times w/timeout {}".format(retr, timeout))
-                timeout *= 2.5
-                continue
-
-        except ETParseError as e:
-            raise BGGApiError("error decoding BGG API response: {}".format(e))
-
-        except (BGGApiRetryError, BGGApiTimeoutError, BGGItemNotFoundError):
-            raise
-
-        except Exception as e:
-            raise BGGApiError("error fetching BGG API response: {}".format(e))
-
-    raise BGGApiError("couldn't fetch data within the configured number of retries")
+def intern_string(value):
+    """
+    Interns a string which is part of a small vocabulary (category names, rank names, etc.), so that all the objects
+    share a single copy of it
+
+    :param value: the string
+    :return: the interned string, or ``value`` if it can't be interned (e.g. ``None``, or an unicode string on
+             Python 2)
+    """
+    try:
+        return _intern(value)
+    except TypeError:
+        return value
+
+
+def lazy_unescape(data, key, default=None):
+    """
+    Returns the unescaped text stored in ``data`` under ``key``. The loaders store the HTML-escaped text under
+    ``<key>_escaped``, it's unescaped on first use and the result is stored under ``key`` for the next calls.
+
+    :param dict data: object's data
+    :param str key: key of the unescaped text
+    :param default: value to return if there's no text
+    :return: the unescaped text
+    """
+    if key not in data:
+        escaped_key = key + "_escaped"
+        if escaped_key not in data:
+            return default
+        escaped = data[escaped_key]
+        data[key] = html_unescape(escaped) if escaped is not None else None
+    return data[key]
 
 
 def fix_url(url):
@@ -397,6 +366,69 @@ def fix_url(url):
     return url
 
 
+def run_concurrently(func, items, workers=DEFAULT_CONCURRENT_REQUESTS):
+    """
+    Calls ``func`` for each of the ``items``, from a pool of threads. Meant for making several API requests at once;
+    they're still subject to the rate limiting.
+
+    :param callable func: function taking an item as argument
+    :param items: the items
+    :param int workers: maximum number of threads
+    :return: the results of the calls, in the order of the items
+    :rtype: list
+    :raises: the first exception raised by ``func``, in which case the items which weren't processed yet are skipped
+    """
+    items = list(items)
+    if workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    results = [None] * len(items)
+    errors = []
+    lock = threading.Lock()
+    pending = iter(range(len(items)))
+
+    def worker():
+        while True:
+            with lock:
+                if errors:
+                    return
+                i = next(pending, None)
+            if i is None:
+                return
+            try:
+                results[i] = func(items[i])
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(min(workers, len(items)))]
+    for t in threads:
+        t.daemon = True
+        t.start()
+    for t in threads:
+        t.join()
+
+    if errors:
+        raise errors[0]
+
+    return results
+
+
+def parse_date(value):
+    """
+    Parses a ``YYYY-MM-DD`` date. This is a lot faster than :py:func:`datetime.datetime.strptime`, which matters when
+    creating lots of objects (e.g. play sessions).
+
+    :param str value: the date to parse
+    :return: the parsed date
+    :rtype: datetime.datetime
+    :raises: `ValueError` if ``value`` is not a valid date
+    """
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
+        return datetime.datetime(int(value[:4]), int(value[5:7]), int(value[8:]))
+    return datetime.datetime.strptime(value, "%Y-%m-%d")
+
+
 def fix_unsigned_negative(value):
     # the BGG api seems to return negative years casted to unsigned ints (32 bit) in search results. This function
     # fixes the values so that they're negative again.
@@ -424,3 +456,17 @@ def get_board_game_version_from_element(xml_elem):
         data[item] = xml_subelement_attr(xml_elem, item, convert=float, quiet=True, default=0.0)
 
     return data
+
+
+# the HTTP functions live in boardgamegeek.transport, which imports ``requests`` (slow to import). They are still
+# available from here, but only loaded on first use.
+_TRANSPORT_NAMES = ("RateLimitingAdapter", "request_and_parse_xml")
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name in _TRANSPORT_NAMES:
+            from . import transport
+            return getattr(transport, name)
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+else:
+    from .transport import RateLimitingAdapter, request_and_parse_xml
@@ -94,9 +94,17 @@ class MockResponse:
         self.headers = {"content-type": "text/xml"}
         self.status_code = status_code
         self.text = text
+        self.content = text.encode("utf-8")
 
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
 
-def simulate_bgg(url, params, timeout):
+    def close(self):
+        pass
+
+
+def simulate_bgg(url, params, timeout, **kwargs):
     last_slash = url.rindex('/')
     fragment = url[last_slash + 1:]
 
@@ -110,7 +118,7 @@ def simulate_bgg(url, params, timeout):
 
     return MockResponse(response_text)
 
-def simulate_legacy_bgg(url, params, timeout):
+def simulate_legacy_bgg(url, params, timeout, **kwargs):
     fragment = re.search(r"(?:/)([^/]*/[^/]*)$", url).group(1).replace('/', '%25')
 
     if len(params)>0:
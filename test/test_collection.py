@@ -3,9 +3,10 @@ from __future__ import unicode_literals
 import pytest
 
 from _common import *
-from boardgamegeek import BGGError, BGGValueError, BGGItemNotFoundError
-from boardgamegeek.objects.collection import CollectionBoardGame, Collection
+from boardgamegeek import BGGError, BGGValueError, BGGItemNotFoundError, BGGCollectionStatus, BGGRestrictCollectionTo
+from boardgamegeek.objects.collection import CollectionBoardGame, Collection, CollectionColumns
 from boardgamegeek.objects.games import BoardGameVersion
+from boardgamegeek.sync import CollectionSync
 import time
 
 
@@ -109,3 +110,205 @@ def test_creating_collection_out_of_raw_data():
     with pytest.raises(BGGError):
         # raises exception on invalid game data
         c.add_game({"bla": "bla"})
+
+
+def test_collection_status_flags(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    collection = bgg.collection(TEST_VALID_USER, versions=False)
+
+    # (owned, for trade, want, wishlist, wishlist priority), as in the <status> of the items in the response
+    by_id = {g.id: g for g in collection}
+    expected = {147253: (True, False, False, False, None),
+                127060: (False, False, False, True, "4"),
+                141423: (False, False, False, True, "3"),
+                34219: (False, False, False, False, None)}
+    for game_id, status in expected.items():
+        g = by_id[game_id]
+        assert (g.owned, g.for_trade, g.want, g.wishlist, g.wishlist_priority) == status
+
+    assert by_id[147253].status == BGGCollectionStatus.OWN
+    assert by_id[127060].status == BGGCollectionStatus.WISHLIST
+    assert by_id[34219].status == 0
+    assert len([g for g in collection if g.owned]) == 26
+    assert sorted(g.id for g in collection if g.wishlist) == [72125, 127060, 141423, 164928, 182340]
+
+    kept = collection.filter_by_status(include=BGGCollectionStatus.OWN, exclude=BGGCollectionStatus.FOR_TRADE)
+    assert kept == [g for g in collection if g.owned and not g.for_trade]
+    assert collection.count_by_status(include=BGGCollectionStatus.OWN) == len([g for g in collection if g.owned])
+    assert collection.count_by_status() == len(collection)
+
+    # raw data, without the pre-decoded flags
+    game = CollectionBoardGame({"id": 1, "name": "game", "own": "1", "fortrade": "1", "wishlist": None,
+                                "stats": {"ranks": []}})
+    assert game.status == BGGCollectionStatus.OWN | BGGCollectionStatus.FOR_TRADE
+    assert game.owned and game.for_trade
+    assert not game.wishlist
+
+
+def test_collection_columns(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    collection = bgg.collection(TEST_VALID_USER, versions=False)
+    columns = collection.to_columns()
+
+    assert type(columns) == CollectionColumns
+    assert len(columns) == len(collection)
+    # computed once, until the collection changes
+    assert collection.to_columns() is columns
+
+    assert list(columns["ids"]) == [g.id for g in collection]
+    assert list(columns["owned"]) == [int(g.owned) for g in collection]
+    assert columns.count("owned") == len([g for g in collection if g.owned])
+    assert columns.count("for_trade") == len([g for g in collection if g.for_trade])
+
+    rated = [g.rating for g in collection if g.rating is not None]
+    assert sum(columns.rating_histogram()) == len(rated)
+
+    times = [g.playing_time for g in collection if g.playing_time]
+    assert sum(columns.playing_time_distribution()) == len(times)
+    assert columns.playing_time_distribution(bounds=[1000000]) == [len(times), 0]
+
+    ranks = sorted(g.bgg_rank for g in collection if g.bgg_rank)
+    assert columns.rank_percentiles([0, 100]) == [ranks[0], ranks[-1]]
+
+    with pytest.raises(BGGError):
+        columns["voodoo"]
+
+    with pytest.raises(BGGError):
+        columns.count("voodoo")
+
+    both = CollectionColumns.concatenate([columns, columns])
+    assert len(both) == 2 * len(columns)
+    assert both.count("owned") == 2 * columns.count("owned")
+
+    collection.add_game({"id": -1, "name": "new game", "stats": {"ranks": []}})
+    assert len(collection.to_columns()) == len(columns) + 1
+
+
+def test_collection_columns_statistics():
+    c = Collection({"owner": "me",
+                    "items": [{"id": i, "name": "game {}".format(i), "playingtime": 45 * i, "rating": rating,
+                               "stats": {"ranks": [{"id": "1", "name": "boardgame", "friendlyname": "Board Game Rank",
+                                                    "value": str(i * 100)}]}}
+                              for i, rating in [(1, 1.0), (2, 7.5), (3, 10.0), (4, None)]]})
+
+    columns = c.to_columns()
+    assert columns.rating_histogram() == [1, 0, 0, 0, 0, 0, 1, 0, 0, 1]
+    assert columns.playing_time_distribution(bounds=[60, 120]) == [1, 1, 2]
+    assert columns.rank_percentiles([25, 50, 75, 100]) == [100, 200, 300, 400]
+    assert Collection({"owner": "me"}).to_columns().rank_percentiles([50]) == [None]
+
+
+def test_collection_sync(bgg, mocker, tmpdir):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    removed = []
+
+    def simulate(url, params, timeout, **kwargs):
+        if removed and "modifiedsince" not in params:
+            params = dict(params, username=params["username"] + "-removed")
+        return simulate_bgg(url, params, timeout, **kwargs)
+
+    mock_get.side_effect = simulate
+
+    sync = CollectionSync(bgg, str(tmpdir.join("collections")))
+    assert sync.load("syncuser") is None
+
+    # first synchronization: everything is fetched
+    result = sync.sync("syncuser")
+    assert result.full
+    assert sorted(result.updated_ids) == [1001, 1002, 1003]
+    assert result.removed_ids == []
+
+    # next ones: only the items modified since the latest modification
+    result = sync.sync("syncuser")
+    assert not result.full
+    assert mock_get.call_args[1]["params"]["modifiedsince"] == "2020-01-02 10:00:00"
+    assert sorted(result.updated_ids) == [1002, 1004]
+    assert sorted(item.id for item in result.collection) == [1001, 1002, 1003, 1004]
+    assert [item.numplays for item in result.collection if item.id == 1002] == [5]
+
+    result = sync.sync("syncuser")
+    assert mock_get.call_args[1]["params"]["modifiedsince"] == "2020-01-03 09:00:00"
+    assert result.updated_ids == []
+
+    # the local copy is persisted
+    collection = CollectionSync(bgg, str(tmpdir.join("collections"))).load("SyncUser")
+    assert len(collection) == 4
+    assert collection.owner == "syncuser"
+    assert [item.owned for item in collection] == [True] * 4
+
+    # the removed items are found by a full synchronization
+    removed.append(True)
+    result = sync.sync("syncuser", full=True)
+    assert result.full
+    assert sorted(result.removed_ids) == [1001, 1003]
+    assert sorted(item.id for item in sync.load("syncuser")) == [1002, 1004]
+
+    # a full synchronization is done when the last one is too old
+    sync = CollectionSync(bgg, str(tmpdir.join("collections")), full_sync_interval=0)
+    assert sync.sync("syncuser").full
+
+    with pytest.raises(BGGValueError):
+        CollectionSync(bgg, str(tmpdir), subtype="invalid")
+
+    tmpdir.join("collections", "collection-boardgame-broken.json").write("{not json")
+    with pytest.raises(BGGError):
+        sync.load("broken")
+
+
+def test_get_collection_by_subtype(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    # BGG tags the expansions returned along with the board games as board games, so they're fetched on their own and
+    # excluded from the board games
+    collections = bgg.collection("subtypesuser", subtypes=[BGGRestrictCollectionTo.BOARD_GAME,
+                                                           BGGRestrictCollectionTo.BOARD_GAME_EXTENSION,
+                                                           BGGRestrictCollectionTo.BOARD_GAME_ACCESSORY])
+    assert mock_get.call_count == 3
+    assert sorted(collections) == ["boardgame", "boardgameaccessory", "boardgameexpansion"]
+    assert [item.id for item in collections["boardgame"]] == [2001, 2003]
+    assert [item.id for item in collections["boardgameexpansion"]] == [2002]
+    assert [item.id for item in collections["boardgameaccessory"]] == [2004]
+    assert all(collection.owner == "subtypesuser" for collection in collections.values())
+
+    # when they can't be excluded, the expansions are dropped from the board games
+    collections = bgg.collection("subtypesuser", subtypes=[BGGRestrictCollectionTo.BOARD_GAME,
+                                                           BGGRestrictCollectionTo.BOARD_GAME_EXTENSION],
+                                 exclude_subtype=BGGRestrictCollectionTo.BOARD_GAME_ACCESSORY)
+    assert [item.id for item in collections["boardgame"]] == [2001, 2003]
+    assert [item.id for item in collections["boardgameexpansion"]] == [2002]
+
+    # a single subtype gives the same items as collection(subtype=...)
+    collections = bgg.collection("subtypesuser", subtypes=[BGGRestrictCollectionTo.BOARD_GAME])
+    assert "excludesubtype" not in mock_get.call_args[1]["params"]
+    assert list(collections) == ["boardgame"]
+    assert [item.id for item in collections["boardgame"]] == [2001, 2002, 2003]
+    assert [item.id for item in bgg.collection("subtypesuser")] == [2001, 2002, 2003]
+
+    with pytest.raises(BGGValueError):
+        bgg.collection("subtypesuser", subtypes=["invalid"])
+
+    with pytest.raises(BGGValueError):
+        bgg.collection("subtypesuser", subtypes=[])
+
+    with pytest.raises(BGGValueError):
+        bgg.collection("subtypesuser", subtypes=[BGGRestrictCollectionTo.BOARD_GAME,
+                                                 BGGRestrictCollectionTo.BOARD_GAME_EXTENSION],
+                       exclude_subtype=BGGRestrictCollectionTo.BOARD_GAME_EXTENSION)
+
+
+def test_collection_items_are_tagged_with_the_requested_subtype(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    # in a real response, the expansions are tagged as board games
+    collection = bgg.collection("fagentu007", version=False)
+    names = [item.name for item in collection]
+    assert "Pandemic: On the Brink" in names
+
+    collections = bgg.collection("fagentu007", version=False, subtypes=[BGGRestrictCollectionTo.BOARD_GAME])
+    assert [item.name for item in collections["boardgame"]] == names
@@ -5,11 +5,13 @@ import requests
 import pytest
 import sys
 import time
+from xml.etree.ElementTree import ParseError
 
 from _common import *
-from boardgamegeek import BGGError, BGGItemNotFoundError, BGGValueError
+from boardgamegeek import BGGChoose, BGGError, BGGItemNotFoundError, BGGValueError, BGGApiTimeoutError, BGGApiError
 from boardgamegeek.objects.games import BoardGameVideo, BoardGameVersion, BoardGameRank
-from boardgamegeek.objects.games import PlayerSuggestion
+from boardgamegeek.objects.games import PlayerSuggestion, BoardGame, BoardGameCommentsCursor
+from boardgamegeek.loaders import parse_game_comments_xml
 
 
 def test_get_unknown_game_info(bgg, mocker):
@@ -44,6 +46,8 @@ def check_game(game):
     assert game.mechanics == ['Area Enclosure', 'Card Drafting',
                               'Hand Management', 'Variable Player Powers',
                               'Worker Placement']
+    assert game.links("mechanics")[:2] == [(2043, "Area Enclosure"), (2041, "Card Drafting")]
+    assert len(game.link_ids("categories")) == len(game.categories)
     assert game.min_players == 1
     assert game.max_players == 5
     assert game.thumbnail == "https://cf.geekdo-images.com/images/pic259085_t.jpg"
@@ -67,6 +71,10 @@ def check_game(game):
     assert u"아그리콜라" in game.alternative_names
 
     assert len(game.description) == 1985
+    # the escaped description stays available, the unescaped one is computed on first access
+    assert "&#10;" in game.description_escaped
+    assert "&#10;" not in game.description
+    assert game.description is game.description
 
     assert game.users_rated == 51439
     assert game.rating_average == 8.0345
@@ -141,6 +149,12 @@ def check_game(game):
     # should have found suggestions for all number of players
     assert not len(suggestions_not_found)
 
+    assert game.player_count_votes(2) == (304, 905, 149)
+    assert game.player_count_votes(6) == (9, 21, 603)
+    assert game.player_count_votes(42) == (0, 0, 0)
+    assert game.best_player_counts == {3, 4}
+    assert game.recommended_player_counts == {1, 2, 3, 4, 5}
+
     # make sure no exception gets thrown
     repr(game)
 
@@ -177,6 +191,51 @@ def test_get_known_game_info_by_id_list(bgg, mocker):
     check_game(game_list[0])
 
 
+def test_get_game_with_selected_fields(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    full = bgg.game(None, game_id=TEST_GAME_ID, videos=True, versions=True)
+    game = bgg.game(None, game_id=TEST_GAME_ID, videos=True, versions=True, fields=["year"])
+
+    assert game.id == full.id
+    assert game.name == full.name
+    assert game.year == full.year
+    assert game.bgg_rank == full.bgg_rank
+    assert game.rating_average == full.rating_average
+    assert game.rating_average_weight == full.rating_average_weight
+
+    # the fields which weren't requested are empty
+    assert full.description and game.description == ""
+    assert full.mechanics and game.mechanics == []
+    assert full.videos and game.videos == []
+    assert full.versions and game.versions == []
+    assert full.player_suggestions and game.player_suggestions == []
+    assert game.min_players is None
+
+    games = bgg.game_list([TEST_GAME_ID, TEST_GAME_ID_2], videos=True, versions=True, fields=["mechanics"])
+    assert games[0].mechanics == full.mechanics
+    assert games[0].year is None
+
+    with pytest.raises(BGGValueError):
+        bgg.game(None, game_id=TEST_GAME_ID, fields=["year", "voodoo"])
+
+    with pytest.raises(BGGValueError):
+        bgg.game_list([TEST_GAME_ID], fields=["voodoo"])
+
+
+def test_game_vocabulary_strings_are_interned(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    game = bgg.game(None, game_id=TEST_GAME_ID, videos=True, versions=True)
+    other = bgg.game(None, game_id=TEST_GAME_ID, videos=True, versions=True, fields=["categories"])
+
+    # the vocabulary strings are shared between games
+    assert other.categories[0] is game.categories[0]
+    assert other.ranks[0].name is game.ranks[0].name
+
+
 def test_game_id_with_invalid_params(bgg):
     with pytest.raises(BGGValueError):
         bgg.get_game_id(TEST_GAME_NAME, choose="voodoo")
@@ -214,6 +273,73 @@ def test_get_game_id_by_name(bgg, mocker):
     assert game_id == best_id
 
 
+def test_best_rank_is_chosen_with_a_single_thing_request(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    # one /search, one /thing request
+    game_id = bgg.get_game_id("eclipse", choose=BGGChoose.BEST_RANK)
+    assert mock_get.call_count == 2
+    assert game_id == 72125
+
+
+def test_get_game_ids(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    names = [TEST_GAME_NAME, "  agricola", "eclipse", TEST_INVALID_GAME_NAME]
+
+    game_ids = bgg.get_game_ids(names)
+    assert game_ids == {TEST_GAME_NAME: TEST_GAME_ID,
+                        "  agricola": TEST_GAME_ID,
+                        "eclipse": 11542,
+                        TEST_INVALID_GAME_NAME: None}
+    # the variants of a name are searched once
+    assert mock_get.call_count == 3
+
+    # the candidates of all the names are fetched together
+    mock_get.reset_mock()
+    game_ids = bgg.get_game_ids(names, choose=BGGChoose.BEST_RANK, workers=1)
+    assert game_ids["eclipse"] == 72125
+    assert game_ids["  agricola"] == TEST_GAME_ID
+    assert mock_get.call_count == 4
+
+    with pytest.raises(BGGValueError):
+        bgg.get_game_ids(names, choose="voodoo")
+
+
+def test_get_game_ids_with_failed_search(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+
+    def fail_on_eclipse(url, params, timeout, **kwargs):
+        if params.get("query") == "eclipse":
+            raise requests.exceptions.Timeout()
+        return simulate_bgg(url, params, timeout, **kwargs)
+
+    mock_get.side_effect = fail_on_eclipse
+
+    # the other names are still resolved, the failed one is reported
+    failures = {}
+    game_ids = bgg.get_game_ids([TEST_GAME_NAME, "eclipse", TEST_INVALID_GAME_NAME], failures=failures)
+    assert game_ids == {TEST_GAME_NAME: TEST_GAME_ID,
+                        "eclipse": None,
+                        TEST_INVALID_GAME_NAME: None}
+    assert list(failures) == ["eclipse"]
+    assert isinstance(failures["eclipse"], BGGApiTimeoutError)
+
+
+def test_game_list_is_fetched_in_chunks(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+    mocker.patch("boardgamegeek.api.THING_IDS_PER_REQUEST", 3)
+
+    ids = [11542, 23272, 72125, 824, 8148]
+    games = bgg.game_list(ids)
+
+    assert mock_get.call_count == 2
+    assert [g.id for g in games] == ids
+
+
 def test_get_games_by_name(bgg, mocker, null_logger):
     mock_get = mocker.patch("requests.sessions.Session.get")
     mock_get.side_effect = simulate_bgg
@@ -264,3 +390,138 @@ def test_get_accessory(bgg, mocker):
 
     assert game.id == TEST_GAME_ACCESSORY_ID
     assert game.accessory
+
+
+def test_game_sub_objects_are_created_on_access():
+    game = BoardGame({"id": 1,
+                      "name": "game",
+                      "expansions": [{"id": 2, "name": "exp"}, {"id": 2, "name": "exp"}],
+                      "versions": [{"id": 3, "name": "first edition"}],
+                      "videos": [{"id": 4, "name": "video", "uploader_id": "5"}],
+                      "suggested_players": {"results": {"2": {"best_rating": 5,
+                                                              "recommended_rating": 3,
+                                                              "not_recommended_rating": 1}}},
+                      "stats": {"ranks": [{"id": "1", "name": "boardgame", "value": "42"}]}})
+
+    assert game.bgg_rank == 42
+
+    assert len(game.expansions) == 1
+    assert game.expansions is game.expansions
+    game.add_expansion({"id": 6, "name": "another exp"})
+    assert [e.id for e in game.expansions] == [2, 6]
+
+    assert game.versions[0].name == "first edition"
+    assert game.videos[0].uploader_id == 5
+    assert game.player_suggestions[0].numeric_player_count == 2
+    assert game.ranks[0].value == "42"
+
+    # invalid data is only detected when the objects are created
+    game = BoardGame({"id": 1, "name": "game", "videos": [{"name": "no id"}], "stats": {}})
+    with pytest.raises(BGGError):
+        game.videos
+
+
+def test_game_links_with_invalid_field():
+    game = BoardGame({"id": 1, "name": "game", "mechanics": ["Dice Rolling"], "stats": {}})
+
+    # no ids in the raw data
+    assert game.links("mechanics") == []
+
+    with pytest.raises(BGGValueError):
+        game.links("voodoo")
+
+
+def test_get_game_comments_pages(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    progress = []
+    game = bgg.game(game_id=9999001, comments=True, progress=lambda current, total: progress.append(current))
+
+    assert game.name == "Commented Game"
+    assert len(game.comments) == 250
+    # the pages are fetched concurrently, but added in order
+    assert [c.commenter for c in game.comments] == ["user{}".format(i) for i in range(250)]
+    assert progress == [100, 200, 250]
+    assert mock_get.call_count == 3
+
+
+def test_parse_game_comments_xml():
+    xml = """<?xml version="1.0" encoding="utf-8"?><items><item type="boardgame" id="1">
+        <name type="primary" value="Game &amp; more" /><description>not parsed</description>
+        <comments page="2" totalitems="102">
+            <comment username="a" rating="N/A" value="first &amp; only" />
+            <comment username="b" rating="8" value="" />
+        </comments></item></items>"""
+
+    item = parse_game_comments_xml(xml)
+    assert item.find("name") is None
+    assert item.find("comments").attrib["totalitems"] == "102"
+    assert [c.attrib["value"] for c in item.findall("comments/comment")] == ["first & only", ""]
+
+    item = parse_game_comments_xml('<items><item id="1"><comments page="1" totalitems="0" /></item></items>')
+    assert item.find("comments").attrib["totalitems"] == "0"
+
+    item = parse_game_comments_xml('<items><item id="1"><name value="no comments" /></item></items>')
+    assert item.find("comments") is None
+
+    # error messages and truncated pages aren't mistaken for pages without comments
+    with pytest.raises(BGGApiError):
+        parse_game_comments_xml('<errors><error><message>Rate limit exceeded</message></error></errors>')
+
+    with pytest.raises(BGGApiError):
+        parse_game_comments_xml('<items termsofuse="https://boardgamegeek.com/xmlapi/termsofuse"></items>')
+
+    with pytest.raises(ParseError):
+        parse_game_comments_xml(xml[:xml.index("<comments")])
+
+
+def test_iter_game_comments(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    comments = bgg.iter_game_comments(9999001)
+    assert [c.commenter for c in comments] == ["user{}".format(i) for i in range(250)]
+    assert comments.cursor == BoardGameCommentsCursor(3, 250)
+    assert comments.total == 250
+
+    ratings = list(bgg.iter_game_comments(9999001, rating_only=True))
+    assert len(ratings) == 150
+    assert ratings[0].comment == ""
+    assert ratings[1].rating == "2"
+
+    with pytest.raises(BGGValueError):
+        bgg.iter_game_comments("not an id")
+
+    with pytest.raises(BGGValueError):
+        bgg.iter_game_comments(9999001, resume=BoardGameCommentsCursor(3, 10))
+
+
+def test_iter_game_comments_resume(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+
+    def fail_on_third_page(url, params, timeout, **kwargs):
+        if params["page"] == 3:
+            raise requests.exceptions.Timeout()
+        return simulate_bgg(url, params, timeout, **kwargs)
+
+    mock_get.side_effect = fail_on_third_page
+
+    read = []
+    comments = bgg.iter_game_comments(9999001)
+    with pytest.raises(BGGApiTimeoutError):
+        for comment in comments:
+            read.append(comment.commenter)
+
+    # the pages 2 and 3 were fetched together
+    assert comments.cursor == BoardGameCommentsCursor(2, 100)
+
+    mock_get.side_effect = simulate_bgg
+    for comment in bgg.iter_game_comments(9999001, resume=comments.cursor):
+        read.append(comment.commenter)
+
+    assert read == ["user{}".format(i) for i in range(250)]
+
+    # resume in the middle of a page
+    resumed = bgg.iter_game_comments(9999001, resume=BoardGameCommentsCursor(2, 150))
+    assert [c.commenter for c in resumed] == ["user{}".format(i) for i in range(150, 250)]
@@ -2,6 +2,7 @@ import time
 import pytest
 
 from boardgamegeek import BGGItemNotFoundError, BGGValueError
+from boardgamegeek.utils import html_unescape
 
 from _common import *
 
@@ -36,6 +37,8 @@ def test_get_valid_guild_info(bgg, mocker, null_logger):
     assert guild.id == TEST_GUILD_ID
     assert guild.name == "Geek Tools"
 
+    assert guild.description == html_unescape(guild.description_escaped)
+
     assert guild.addr1 is None
     assert guild.addr2 is None
     assert guild.address is None
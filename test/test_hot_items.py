@@ -1,8 +1,12 @@
+import threading
 import time
 import pytest
+import requests
 
 from boardgamegeek import BGGError, BGGValueError
 from boardgamegeek.objects.hotitems import HotItems, HotItem
+from boardgamegeek.api import HOT_ITEM_CHOICES
+from boardgamegeek.sync import HotItemsRefresher
 
 from _common import *
 
@@ -55,3 +59,126 @@ def test_hot_items_initial_data():
     assert h[0].id == 100
     assert h[0].name == "hotitem"
     assert h[0].rank == 10
+
+
+def test_hot_item_does_not_modify_input_data():
+    data = {"id": 100, "name": "hotitem", "rank": 10, "thumbnail": "//cf.geekdo-images.com/images/pic1.jpg"}
+    items = [data]
+
+    h = HotItems({"items": items})
+    h.add_hot_item({"id": 101, "name": "hotitem2", "rank": 11})
+
+    # the caller's data is left alone...
+    assert data["thumbnail"] == "//cf.geekdo-images.com/images/pic1.jpg"
+    assert len(items) == 1
+
+    # ...while the objects have fixed thumbnails
+    assert h[0].thumbnail == "http://cf.geekdo-images.com/images/pic1.jpg"
+    assert [i.id for i in h] == [100, 101]
+
+
+def test_get_hot_items_all(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    hot = bgg.hot_items_all()
+    assert sorted(hot) == sorted(HOT_ITEM_CHOICES)
+    assert hot["rpg"][0].name == "Dungeons & Dragons (5th Edition)"
+    assert hot["boardgameperson"][0].name == "Uwe Rosenberg"
+    assert mock_get.call_count == len(HOT_ITEM_CHOICES)
+
+    hot = bgg.hot_items_all(["rpg", "rpg", "videogame"])
+    assert sorted(hot) == ["rpg", "videogame"]
+
+    with pytest.raises(BGGValueError):
+        bgg.hot_items_all(["boardgame", "invalid type"])
+
+
+def test_hot_items_refresher(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    with pytest.raises(BGGValueError):
+        HotItemsRefresher(bgg, types=["invalid type"])
+
+    with pytest.raises(BGGValueError):
+        HotItemsRefresher(bgg, interval=0)
+
+    refresher = HotItemsRefresher(bgg, types=["boardgame", "rpg"], interval=0.01)
+
+    # fetched on first use
+    assert refresher.last_refresh is None
+    assert refresher.hot_items("rpg")[1].name == "Call of Cthulhu (7th Edition)"
+    assert sorted(refresher.all()) == ["boardgame", "rpg"]
+    assert mock_get.call_count == 2
+
+    with pytest.raises(BGGValueError):
+        refresher.hot_items("videogame")
+
+    # the previous items are kept when refreshing fails
+    mock_get.side_effect = requests.exceptions.ConnectionError("no network")
+    previous = refresher.hot_items("boardgame")
+
+    with refresher:
+        assert refresher.running
+        for _ in range(500):
+            if refresher.last_error is not None:
+                break
+            time.sleep(0.01)
+
+    assert not refresher.running
+    assert isinstance(refresher.last_error, BGGError)
+    assert refresher.hot_items("boardgame") is previous
+
+    mock_get.side_effect = simulate_bgg
+    refresher.start()
+    for _ in range(500):
+        if refresher.last_error is None:
+            break
+        time.sleep(0.01)
+    refresher.stop()
+
+    assert refresher.last_error is None
+    assert refresher.hot_items("boardgame") is not previous
+
+
+def test_hot_items_refresher_restart(bgg, mocker):
+    refresher = HotItemsRefresher(bgg, types=["boardgame"], interval=0.01)
+
+    # unexpected errors are reported, and don't stop the refresh
+    mocker.patch.object(bgg, "hot_items_all", side_effect=RuntimeError("unexpected"))
+    refresher.start()
+    for _ in range(500):
+        if refresher.last_error is not None:
+            break
+        time.sleep(0.01)
+
+    assert isinstance(refresher.last_error, RuntimeError)
+    assert refresher.running
+
+    # a thread still busy refreshing after being stopped isn't restarted along with the new one
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow_refresh(types):
+        started.set()
+        release.wait(5)
+        return {}
+
+    bgg.hot_items_all.side_effect = slow_refresh
+    started.wait(5)
+    refresher.stop(timeout=0.01)
+    assert not refresher.running
+    old_thread = refresher._thread
+
+    refresher.start()
+    assert refresher.running
+    assert refresher._thread is not old_thread
+
+    release.set()
+    old_thread.join(5)
+    assert not old_thread.is_alive()
+    assert refresher.running
+
+    refresher.stop()
+    assert not refresher.running
@@ -0,0 +1,221 @@
+from __future__ import unicode_literals
+
+import pytest
+
+from _common import *
+from boardgamegeek import BGGClient, BGGChoose, BGGError, BGGValueError, CacheBackendNone
+from boardgamegeek.index import LinkIndex, GameCatalog, NameIndex, normalize_name
+from boardgamegeek.objects.games import BoardGame
+
+
+def test_link_index(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    games = bgg.game_list([TEST_GAME_ID, TEST_GAME_ID_2], videos=True, versions=True)
+    index = LinkIndex(games)
+
+    assert len(index) == 2
+    assert TEST_GAME_ID in index
+
+    # Card Drafting
+    assert TEST_GAME_ID in index.games("mechanics", 2041)
+    assert index.name("mechanics", 2041) == "Card Drafting"
+    assert index.games("mechanics", -1) == frozenset()
+    assert index.name("mechanics", -1) is None
+
+    for game in games:
+        for link in game.links("designers"):
+            assert game.id in index.games("designers", link.id)
+    assert set(index.link_ids("designers")) == {link_id for g in games for link_id in g.link_ids("designers")}
+
+    # adding a game again replaces its links
+    index.add_game(games[0])
+    assert len(index) == 2
+    assert TEST_GAME_ID in index.games("mechanics", 2041)
+
+    index.remove_game(TEST_GAME_ID)
+    assert TEST_GAME_ID not in index
+    assert index.games("mechanics", 2041) == frozenset()
+
+    with pytest.raises(BGGValueError):
+        index.games("voodoo", 1)
+
+
+def make_game(game_id, year, min_players, max_players, mechanics, votes=None):
+    results = {count: {"best_rating": best, "recommended_rating": recommended, "not_recommended_rating": not_recommended}
+               for count, (best, recommended, not_recommended) in (votes or {}).items()}
+    return BoardGame({"id": game_id, "name": "game {}".format(game_id), "yearpublished": year,
+                      "suggested_players": {"results": results},
+                      "minplayers": min_players, "maxplayers": max_players,
+                      "mechanics": ["mechanic {}".format(m) for m in mechanics], "mechanics_ids": mechanics,
+                      "stats": {"ranks": [{"name": "boardgame", "value": str(game_id * 10)}]}})
+
+
+def test_game_catalog():
+    catalog = GameCatalog([make_game(1, 1995, 2, 4, [10, 11]),
+                           make_game(2, 2005, 1, 5, [11]),
+                           make_game(3, 2015, 3, 6, [10]),
+                           make_game(4, None, 2, 2, [])])
+
+    assert len(catalog) == 4
+    assert catalog[2].year == 2005
+
+    assert catalog.with_link("mechanics", 10) == {1, 3}
+    assert catalog.in_range("year", 2000, 2015) == {2, 3}
+    assert catalog.in_range("year", maximum=2005) == {1, 2}
+    assert catalog.in_range("bgg_rank", minimum=25) == {3, 4}
+    assert catalog.supporting_players(2) == {1, 2, 4}
+
+    assert catalog.select(mechanics=10, players=4) == {1, 3}
+    assert catalog.select(mechanics=[10, 11]) == {1}
+    assert catalog.select(mechanics=11, year=(2000, None)) == {2}
+    assert catalog.select(mechanics=12) == frozenset()
+    assert catalog.select() == {1, 2, 3, 4}
+    assert [g.id for g in catalog.games(catalog.select(players=2))] == [1, 2, 4]
+
+    # the range indexes are updated with the new games
+    catalog.add_game(make_game(5, 2010, 1, 1, [10]))
+    assert catalog.select(mechanics=10, year=(2000, 2015)) == {3, 5}
+
+    with pytest.raises(BGGValueError):
+        catalog.in_range("voodoo")
+
+    with pytest.raises(BGGValueError):
+        catalog.select(voodoo=1)
+
+    with pytest.raises(BGGValueError):
+        catalog.select(year=2000)
+
+
+def test_game_catalog_interleaved_adds_and_queries(mocker):
+    games = [make_game(i, 1990 + i % 7, 1 + i % 3, 2 + i % 5, [10 + i % 4], votes={"2": (i % 3, 5, 1), "3": (1, i % 4, 5)})
+             for i in range(1, 41)]
+    catalog = GameCatalog(games[:10])
+    catalog.select(year=(1992, 1995), best_at=2, recommended_at=3)
+    for field in GameCatalog.RANGE_FIELDS:
+        catalog.in_range(field)
+    build = mocker.spy(catalog, "_player_counts_index")
+
+    # the indexes already built are updated, not built again
+    for game in games[10:]:
+        catalog.add_game(game)
+        catalog.select(year=(1992, 1995), players=3, best_at=2)
+    # a game replaced by another one with the same id
+    catalog.add_game(make_game(7, 2020, 4, 4, [13], votes={"4": (10, 1, 1)}))
+    assert build.call_count == 0
+
+    expected = GameCatalog(games[:6] + [make_game(7, 2020, 4, 4, [13], votes={"4": (10, 1, 1)})] + games[7:])
+    for field in GameCatalog.RANGE_FIELDS:
+        assert catalog.in_range(field, 2, 1995) == expected.in_range(field, 2, 1995)
+    assert catalog.select(year=(1992, 1995), players=3, best_at=2) == \
+        expected.select(year=(1992, 1995), players=3, best_at=2)
+    assert catalog.recommended_at(3) == expected.recommended_at(3)
+    assert catalog.best_at(4) == expected.best_at(4) == {7}
+    assert catalog.in_range("year", 2020) == {7}
+
+
+def test_normalize_name():
+    assert normalize_name("Puerto Rico:  Deluxe!") == "puerto rico deluxe"
+    assert normalize_name("Agrícola") == "agricola"
+
+
+def test_name_index(tmpdir):
+    index = NameIndex()
+    index.add(1, "Puerto Rico", ["Puerto Rico: Deluxe"], year=2002, rank=20)
+    index.add(2, "Puerto Rico: Expansion I", year=2004, game_type="boardgameexpansion", rank=None)
+    index.add(3, "San Juan", ["Сан Хуан"], year=2004, rank=150)
+    index.add(4, "Puerto Rico", year=1990, rank=5)
+
+    assert len(index) == 4
+    assert [r.id for r in index.lookup("puerto rico")] == [4, 1]
+    assert [r.id for r in index.lookup("PUERTO RICO deluxe")] == [1]
+    assert index.lookup("puerto rico")[1].name == "Puerto Rico"
+    assert index.lookup("puerto rico")[1].year == 2002
+    assert index.lookup("unknown") == []
+
+    assert [r.id for r in index.prefix("puerto")] == [4, 1, 2]
+    assert [r.id for r in index.prefix("puerto", game_types=["boardgameexpansion"])] == [2]
+    assert [r.id for r in index.prefix("puerto", limit=1)] == [4]
+    assert [r.id for r in index.words("rico expansion")] == [2]
+    assert [r.id for r in index.fuzzy("porto rico")] == [4, 1]
+    assert index.rank(2) is None
+
+    # replacing a game removes its old names
+    index.add(4, "Santiago", year=2003)
+    assert [r.id for r in index.lookup("puerto rico")] == [1]
+
+    path = str(tmpdir.join("names.json"))
+    index.save(path)
+    loaded = NameIndex.load(path)
+    assert len(loaded) == len(index)
+    assert [r.id for r in loaded.lookup("сан хуан")] == [3]
+    assert loaded.rank(1) == 20
+
+    index.remove(3)
+    assert index.lookup("san juan") == []
+    assert 3 not in index
+
+    with open(path, "w") as f:
+        f.write("garbage")
+    with pytest.raises(BGGError):
+        NameIndex.load(path)
+
+
+def test_client_with_name_index(mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    bgg = BGGClient(cache=CacheBackendNone(), retries=2, retry_delay=1, name_index=NameIndex())
+    game = bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True)
+    assert TEST_GAME_ID in bgg.name_index
+
+    # the index is only used when asked for, its results can differ from BGG's
+    requests_made = mock_get.call_count
+    assert bgg.get_game_id(TEST_GAME_NAME) == TEST_GAME_ID
+    assert mock_get.call_count == requests_made + 1
+
+    requests_made = mock_get.call_count
+    assert bgg.get_game_id(TEST_GAME_NAME, exact_from_index=True) == TEST_GAME_ID
+    assert bgg.get_game_id(game.alternative_names[0], choose=BGGChoose.BEST_RANK, exact_from_index=True) == TEST_GAME_ID
+    assert [r.id for r in bgg.search(TEST_GAME_NAME.lower(), exact=True, exact_from_index=True)] == [TEST_GAME_ID]
+    assert bgg.get_game_ids([TEST_GAME_NAME], exact_from_index=True) == {TEST_GAME_NAME: TEST_GAME_ID}
+    assert mock_get.call_count == requests_made
+
+    # names which aren't indexed are searched with the API
+    bgg.search("Twilight Struggle", exact=True, exact_from_index=True)
+    assert mock_get.call_count == requests_made + 1
+
+
+def test_client_ignores_index_ranks_by_default(mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    # a stale index, in which another "Eclipse" is the best ranked
+    index = NameIndex()
+    index.add(11542, "Eclipse", year=2011, rank=1)
+    index.add(72125, "Eclipse", year=2011, rank=100000)
+    bgg = BGGClient(cache=CacheBackendNone(), retries=2, retry_delay=1, name_index=index)
+
+    assert bgg.get_game_id("eclipse", choose=BGGChoose.BEST_RANK) == 72125
+    assert bgg.get_game_ids(["eclipse"], choose=BGGChoose.BEST_RANK) == {"eclipse": 72125}
+
+    # unless asked for
+    assert bgg.get_game_id("eclipse", choose=BGGChoose.BEST_RANK, exact_from_index=True) == 11542
+
+
+def test_game_catalog_player_count_votes():
+    catalog = GameCatalog([make_game(1, 2000, 2, 4, [10], votes={"2": (10, 5, 1), "3": (2, 10, 1), "4+": (0, 1, 10)}),
+                           make_game(2, 2000, 2, 5, [11], votes={"2": (1, 2, 10), "3": (10, 2, 1)}),
+                           make_game(3, 2000, 2, 5, [10])])
+
+    assert catalog[1].best_player_counts == {2}
+    assert catalog[1].recommended_player_counts == {2, 3}
+    assert catalog[1].player_count_votes(5) == (0, 1, 10)
+
+    assert catalog.best_at(2) == {1}
+    assert catalog.best_at(3) == {2}
+    assert catalog.recommended_at(3) == {1, 2}
+    assert catalog.recommended_at(5) == frozenset()
+    assert catalog.select(recommended_at=3, mechanics=10) == {1}
+    assert catalog.select(best_at=3, players=5) == {2}
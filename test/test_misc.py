@@ -1,15 +1,31 @@
 import os
+import subprocess
+import sys
 import tempfile
 import time
 import pytest
+import requests_cache
 
 from _common import *
 from boardgamegeek import BGGValueError, CacheBackendNone, CacheBackendSqlite
+from boardgamegeek.utils import DEFAULT_CONCURRENT_REQUESTS
 
 
 #
 # Test caches
 #
+def test_default_cache_is_not_shared():
+    first = BGGClient()
+    second = BGGClient()
+    legacy = BGGClientLegacy()
+
+    assert isinstance(first.requests_session, requests_cache.CachedSession)
+    assert first.requests_session is not second.requests_session
+    assert legacy.requests_session is not first.requests_session
+
+    assert not isinstance(BGGClient(cache=None).requests_session, requests_cache.CachedSession)
+
+
 def test_no_caching(mocker):
     mock_get = mocker.patch("requests.sessions.Session.get")
     mock_get.side_effect = simulate_bgg
@@ -62,3 +78,55 @@ def test_invalid_parameter_values_for_bggclient():
 
     with pytest.raises(BGGValueError):
         BGGClient(timeout="asd")
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="lazy imports need PEP 562")
+def test_lazy_import():
+    # using only the objects doesn't import the clients and requests
+    check = ("import sys, boardgamegeek; from boardgamegeek.objects.games import BoardGame; "
+             "assert 'requests' not in sys.modules and 'boardgamegeek.api' not in sys.modules; "
+             "from boardgamegeek import BGGClient; assert 'boardgamegeek.api' in sys.modules")
+    subprocess.check_call([sys.executable, "-c", check],
+                          cwd=os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+    import boardgamegeek
+    assert "BGGClient" in dir(boardgamegeek)
+    with pytest.raises(AttributeError):
+        boardgamegeek.NoSuchThing
+
+
+def test_connection_pool_settings():
+    bgg = BGGClient(cache=None, pool_maxsize=8, pool_block=False)
+
+    adapter = bgg.requests_session.get_adapter("https://www.boardgamegeek.com/xmlapi2/thing")
+    assert adapter._pool_maxsize == 8
+    assert adapter._pool_block is False
+    assert bgg.requests_session.headers["Connection"] == "keep-alive"
+    assert "gzip" in bgg.requests_session.headers["Accept-Encoding"]
+
+    # the default pool has room for the concurrent requests
+    adapter = BGGClient().requests_session.get_adapter("https://www.boardgamegeek.com/xmlapi2/thing")
+    assert adapter._pool_maxsize >= DEFAULT_CONCURRENT_REQUESTS
+    assert adapter._pool_block is True
+
+    with pytest.raises(BGGValueError):
+        BGGClient(pool_maxsize=0)
+
+    with pytest.raises(BGGValueError):
+        BGGClientLegacy(pool_connections="many")
+
+
+def test_transfer_stats(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    bgg.game(game_id=TEST_GAME_ID, versions=True, videos=True)
+    bgg.game(game_id=9999001, comments=True)
+
+    # the responses are read as they're received
+    assert mock_get.call_args[1]["stream"] is True
+
+    stats = bgg.transfer_stats.endpoint("thing")
+    assert stats.requests == 4
+    assert stats.decoded_bytes > 0
+    assert bgg.transfer_stats.endpoints() == ["thing"]
@@ -1,10 +1,12 @@
 import datetime
+import pickle
 import time
 import pytest
 
 from _common import *
 from boardgamegeek import BGGError, BGGValueError, BGGItemNotFoundError
-from boardgamegeek.objects.plays import UserPlays, GamePlays, PlaySession, Plays
+from boardgamegeek.objects.plays import UserPlays, GamePlays, PlaySession, Plays, PlaysTable
+from boardgamegeek.sync import PlaysSync
 
 
 progress_called = False
@@ -143,3 +145,150 @@ def test_create_plays_with_initial_data():
     p = Plays({"plays": [{"id": 10, "user_id": 102, "date": now}]})
 
     assert p[0].date == now
+
+
+def test_play_sessions_are_compact():
+    p = PlaySession({"id": 10, "user_id": 102, "date": "2014-01-02", "players": [{"name": "me", "win": "1"}]})
+
+    # high volume objects don't carry a __dict__
+    assert not hasattr(p, "__dict__")
+    assert not hasattr(p.players[0], "__dict__")
+
+    # ...but can still be pickled, with any protocol
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        u = pickle.loads(pickle.dumps(p, protocol=protocol))
+        assert u.id == 10
+        assert u.date == datetime.datetime(2014, 1, 2)
+        assert u.players[0].name == "me"
+        assert u.players[0].win == "1"
+
+
+def test_user_plays_copy_added_data():
+    plays = UserPlays({"username": "me", "user_id": 102})
+    data = {"id": 10, "user_id": -1, "date": "2014-01-02"}
+
+    plays.add_play(data)
+
+    assert plays[0].user_id == 102
+    assert plays[0].date == datetime.datetime(2014, 1, 2)
+    # the caller's dictionary wasn't modified
+    assert data == {"id": 10, "user_id": -1, "date": "2014-01-02"}
+
+
+def test_get_plays_of_user_as_table(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    plays = bgg.plays(name=TEST_VALID_USER)
+    table = bgg.plays(name=TEST_VALID_USER, columnar=True)
+
+    assert type(table) == PlaysTable
+    assert table.user == TEST_VALID_USER
+    assert table.user_id == TEST_VALID_USER_ID
+    assert table.plays_count == plays.plays_count
+    assert len(table) == len(plays)
+
+    assert list(table.ids) == [p.id for p in plays]
+    assert set(table.user_ids) == {TEST_VALID_USER_ID}
+
+    # play sessions can be materialized from the table
+    for p, t in zip(plays, table):
+        assert type(t) == PlaySession
+        assert t.id == p.id
+        assert t.date == p.date
+        assert t.game_id == p.game_id
+        assert t.game_name == p.game_name
+        assert t.quantity == p.quantity
+        assert t.duration == p.duration
+        assert t.incomplete == p.incomplete
+        assert t.comment == p.comment
+        assert [pl.name for pl in t.players] == [pl.name for pl in p.players]
+        assert [pl.win for pl in t.players] == [str(int(pl.win or 0)) for pl in p.players]
+
+    assert table[-1].id == plays[-1].id
+
+    # aggregations
+    per_game = {}
+    duration = {}
+    for p in plays:
+        per_game[p.game_id] = per_game.get(p.game_id, 0) + p.quantity
+        duration[p.game_id] = duration.get(p.game_id, 0) + p.duration
+
+    assert table.plays_per_game() == per_game
+    assert table.duration_per_game() == duration
+    assert table.total_duration() == sum(p.duration for p in plays)
+
+    played = {}
+    won = {}
+    for p in plays:
+        for pl in p.players:
+            played[pl.name] = played.get(pl.name, 0) + 1
+            won[pl.name] = won.get(pl.name, 0) + int(pl.win or 0)
+
+    rates = table.win_rates()
+    assert rates == {name: won[name] / float(played[name]) for name in played}
+
+    with pytest.raises(BGGError):
+        table.win_rates(key="voodoo")
+
+
+def test_create_plays_table_with_initial_data():
+    with pytest.raises(BGGError):
+        PlaysTable({"plays": [{"user_id": 10}]})
+
+    t = PlaysTable({"game_id": 1, "plays": [{"id": 10, "user_id": 102, "game_id": 1, "date": "2014-01-02",
+                                             "quantity": 2, "players": [{"name": "me", "win": "1"}]},
+                                            {"id": 11, "user_id": 103, "game_id": 1, "date": "invalid"}]})
+
+    assert len(t) == 2
+    assert list(t.user_ids) == [102, 103]
+    assert t.dates[0] == datetime.date(2014, 1, 2).toordinal()
+    assert t.dates[1] == 0
+    assert t[1].date is None
+    assert t.plays_per_game() == {1: 2}
+    assert t.win_rates() == {"me": 1.0}
+
+
+def test_plays_sync(bgg, mocker, tmpdir):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    sync = PlaysSync(bgg, str(tmpdir.join("plays")))
+    assert sync.load(name="playsyncuser") is None
+
+    # first synchronization: everything is fetched
+    result = sync.sync(name="playsyncuser")
+    assert "mindate" not in mock_get.call_args[1]["params"]
+    assert sorted(result.new_ids) == [1, 2, 3]
+    assert result.plays.user == "playsyncuser"
+    assert result.plays.user_id == 4242
+
+    # next ones: only the plays of the last days, the ones already known are skipped
+    result = sync.sync(name="playsyncuser")
+    assert mock_get.call_args[1]["params"]["mindate"] == "2020-01-03"
+    assert result.new_ids == [4]
+    assert [play.id for play in result.plays] == [4, 3, 2, 1]
+
+    result = sync.sync(name="playsyncuser")
+    assert mock_get.call_args[1]["params"]["mindate"] == "2020-01-05"
+    assert result.new_ids == []
+    assert len(result.plays) == 4
+
+    # the local copy is persisted
+    plays = PlaysSync(bgg, str(tmpdir.join("plays"))).load(name="PlaySyncUser")
+    assert [play.id for play in plays] == [4, 3, 2, 1]
+    assert plays[1].date == datetime.datetime(2020, 1, 10)
+    assert plays[1].game_id == 31260
+    assert [player.username for player in plays[1].players] == ["playsyncuser", "friend"]
+
+    with pytest.raises(BGGValueError):
+        sync.sync()
+
+    with pytest.raises(BGGValueError):
+        sync.sync(name="playsyncuser", game_id=31260)
+
+    with pytest.raises(BGGValueError):
+        PlaysSync(bgg, str(tmpdir), overlap_days=-1)
+
+    with pytest.raises(BGGValueError):
+        PlaysSync(bgg, str(tmpdir), subtype="invalid")
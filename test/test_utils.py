@@ -1,11 +1,15 @@
+import datetime
 import pickle
 import threading
 import time
 import pytest
+import requests
 
 import boardgamegeek.utils as bggutil
+from boardgamegeek import BGGApiTimeoutError
 from _common import *
 from boardgamegeek.objects.things import Thing
+from boardgamegeek.transport import TransferStats, request_and_parse_xml
 
 def test_get_xml_subelement_attr(xml):
 
@@ -108,6 +112,35 @@ def test_get_xml_subelement_text(xml):
     assert node == "asd"
 
 
+def test_parse_date():
+    assert bggutil.parse_date("2014-01-02") == datetime.datetime(2014, 1, 2)
+    assert bggutil.parse_date("2014-1-2") == datetime.datetime(2014, 1, 2)
+
+    for invalid in ["0000-00-00", "2014-13-01", "yesterday"]:
+        with pytest.raises(ValueError):
+            bggutil.parse_date(invalid)
+
+
+def test_run_concurrently():
+    assert bggutil.run_concurrently(lambda x: x * 2, range(10), workers=3) == [x * 2 for x in range(10)]
+    assert bggutil.run_concurrently(lambda x: x, [], workers=3) == []
+
+    def fail(x):
+        if x == 5:
+            raise ValueError("failed")
+        return x
+
+    with pytest.raises(ValueError):
+        bggutil.run_concurrently(fail, range(10), workers=3)
+
+
+def test_intern_string():
+    a = "".join(["Card", " Game"])
+    b = "".join(["Card", " Game"])
+    assert bggutil.intern_string(a) is bggutil.intern_string(b)
+    assert bggutil.intern_string(None) is None
+
+
 @pytest.mark.serialize
 def test_serialization():
     dummy_plays = Thing({"id": "10", "name": "fubar"})
@@ -175,3 +208,45 @@ def test_html_unescape_function():
     unescaped = bggutil.html_unescape(escaped)
 
     assert unescaped == "<tag>"
+
+
+def test_transfer_stats():
+    stats = TransferStats()
+    assert stats.total() == (0, 0, 0, 0)
+    assert stats.endpoint("thing").compression_ratio is None
+
+    stats.add("https://www.boardgamegeek.com/xmlapi2/thing", 100, 900)
+    stats.add("https://www.boardgamegeek.com/xmlapi2/thing", 0, 900, cached=True)
+    stats.add("http://www.boardgamegeek.com/xmlapi/geeklist/1", 10, 20)
+
+    assert stats.endpoints() == ["geeklist", "thing"]
+    assert stats.endpoint("thing") == (2, 1, 100, 1800)
+    assert stats.endpoint("thing").compression_ratio == 18
+    assert stats.total() == (3, 1, 110, 1820)
+
+    stats.reset()
+    assert stats.endpoints() == []
+
+
+@pytest.mark.parametrize("error", [requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError])
+def test_body_read_errors_are_retried(mocker, error):
+    class BrokenResponse(MockResponse):
+        def iter_content(self, chunk_size=1):
+            yield self.content[:10]
+            raise error("read timed out")
+
+    xml = '<?xml version="1.0" encoding="utf-8"?><items><item id="1" /></items>'
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = [BrokenResponse(xml), MockResponse(xml)]
+
+    root = request_and_parse_xml(requests.Session(), "https://www.boardgamegeek.com/xmlapi2/thing", params={"id": 1},
+                                 timeout=1, retries=2, retry_delay=0)
+    assert root.find("item").attrib["id"] == "1"
+    assert mock_get.call_count == 2
+    # retried as a timeout, with a longer one
+    assert mock_get.call_args[1]["timeout"] == 2.5
+
+    mock_get.side_effect = [BrokenResponse(xml), BrokenResponse(xml)]
+    with pytest.raises(BGGApiTimeoutError):
+        request_and_parse_xml(requests.Session(), "https://www.boardgamegeek.com/xmlapi2/thing", params={"id": 1},
+                              timeout=1, retries=1, retry_delay=0)